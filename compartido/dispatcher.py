@@ -0,0 +1,132 @@
+"""Llamadas al backend fuera del hilo de Tk.
+
+Las funciones se ejecutan en un pool de hilos y sus resultados vuelven al
+hilo de Tk por una cola que se vacia con `root.after`, de modo que los
+callbacks pueden tocar widgets y la ventana sigue repintando mientras la
+llamada esta en curso.
+
+- Dos `submit` con la misma clave mientras la primera sigue en curso
+  comparten una sola ejecucion y ambos callbacks reciben el resultado.
+- `new_generation()` (al empezar una partida nueva) descarta los resultados
+  pendientes de la partida anterior y cancela los que aun no empezaron.
+- Con `serial=True` las llamadas se ejecutan de a una y en orden, para
+  backends que guardan el estado de la partida en un solo archivo.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import tkinter as tk
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor(workers):
+    # Un solo pool para todas las pantallas: volver al menu no deja hilos huerfanos
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backend")
+        return _executor
+
+
+class _Pending:
+    def __init__(self, generation):
+        self.generation = generation
+        self.future = None
+        self.callbacks = []
+
+
+class Dispatcher:
+    def __init__(self, root, workers=4, poll_ms=15, serial=False):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self._private = serial
+        self._closed = False
+        if serial:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backend-serial")
+        else:
+            self._executor = _shared_executor(workers)
+        self._done = queue.Queue()
+        self._in_flight = {}
+        self._polling = False
+
+    def submit(self, key, fn, *args, on_done=None, on_error=None, **kwargs):
+        """Ejecuta fn(*args, **kwargs) en segundo plano.
+
+        `on_done(resultado)` u `on_error(excepcion)` se llaman en el hilo de Tk,
+        salvo que mientras tanto haya empezado una nueva generacion.
+        Devuelve False si la llamada se sumo a otra identica ya en curso o si
+        el dispatcher ya se cerro.
+        """
+        if self._closed:
+            return False
+        pending = self._in_flight.get(key)
+        joined = pending is not None
+        if not joined:
+            pending = self._in_flight[key] = _Pending(self.generation)
+            pending.future = self._executor.submit(fn, *args, **kwargs)
+            pending.future.add_done_callback(lambda f: self._done.put((key, pending, f)))
+        pending.callbacks.append((on_done, on_error))
+        self._ensure_polling()
+        return not joined
+
+    def in_flight(self, key):
+        return key in self._in_flight
+
+    def new_generation(self):
+        self.generation += 1
+        for pending in self._in_flight.values():
+            pending.future.cancel()
+        # Las llamadas viejas ya no se comparten con las nuevas aunque tengan la misma clave
+        self._in_flight.clear()
+
+    def close(self):
+        """Descarta todo lo pendiente; los callbacks ya no se llamaran."""
+        self.new_generation()
+        self._closed = True
+        if self._private:
+            self._executor.shutdown(wait=False)
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self._schedule()
+
+    def _schedule(self):
+        try:
+            self.root.after(self.poll_ms, self._poll)
+        except (tk.TclError, RuntimeError):
+            # La ventana ya no existe
+            self._polling = False
+
+    def _poll(self):
+        try:
+            self._deliver()
+        finally:
+            # Un callback que falla no debe dejar de entregar los siguientes
+            if self._in_flight or not self._done.empty():
+                self._schedule()
+            else:
+                self._polling = False
+
+    def _deliver(self):
+        while True:
+            try:
+                key, pending, future = self._done.get_nowait()
+            except queue.Empty:
+                return
+            if self._in_flight.get(key) is pending:
+                del self._in_flight[key]
+            if pending.generation != self.generation or future.cancelled():
+                continue
+            error = future.exception()
+            for on_done, on_error in pending.callbacks:
+                if error is None:
+                    if on_done:
+                        on_done(future.result())
+                elif on_error:
+                    on_error(error)
@@ -0,0 +1,156 @@
+"""Lanzador de los backends F# ya compilados.
+
+En vez de pasar por `dotnet run` (que invoca MSBuild en cada arranque) se
+ejecuta directamente el .dll de bin/. Para saber si ese .dll corresponde al
+codigo actual se calcula una huella de los .fs y .fsproj de entrada: si la
+huella coincide con la guardada en el cache en disco no se compila nada; si
+cambio, se ejecuta `dotnet build` una sola vez y se actualiza el cache.
+
+El cache guarda por archivo (mtime, tamano, sha1), asi que solo se vuelven a
+leer los archivos cuyo mtime o tamano cambiaron.
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+import threading
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CACHE_PATH = os.path.join(ROOT, ".launcher_cache.json")
+BUILD_TIMEOUT = 300
+
+
+class Backend:
+    """Proyecto F# ejecutable: su .fsproj y los directorios cuyos fuentes lo afectan."""
+
+    def __init__(self, name, project, sources):
+        self.name = name
+        self.project = project
+        self.sources = sources
+
+    @property
+    def project_dir(self):
+        return os.path.dirname(self.project)
+
+    @property
+    def dll(self):
+        # bin/Debug/<TargetFramework>/<nombre del proyecto>.dll, como lo deja `dotnet build`
+        with open(self.project, encoding="utf-8-sig") as f:
+            match = re.search(r"<TargetFramework>\s*([^<\s]+)\s*</TargetFramework>", f.read())
+        framework = match.group(1) if match else ""
+        name = os.path.splitext(os.path.basename(self.project))[0] + ".dll"
+        return os.path.join(self.project_dir, "bin", "Debug", framework, name)
+
+
+AHORCADO = Backend(
+    "ahorcado",
+    os.path.join(ROOT, "juego-ahorcado", "backend", "game-logic-fsharp.fsproj"),
+    [os.path.join(ROOT, "juego-ahorcado", "backend")],
+)
+
+SOPA = Backend(
+    "sopa",
+    os.path.join(ROOT, "juego-sopa-letras", "backend", "Sopa.Cli", "Sopa.Cli.fsproj"),
+    [os.path.join(ROOT, "juego-sopa-letras", "backend", "Sopa.Cli"),
+     os.path.join(ROOT, "juego-sopa-letras", "backend", "Sopa.Core")],
+)
+
+
+def _inputs(backend):
+    for top in backend.sources:
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = sorted(d for d in dirnames if d not in ("bin", "obj"))
+            for name in sorted(filenames):
+                if name.endswith((".fs", ".fsproj")):
+                    yield os.path.join(dirpath, name)
+
+
+def _sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def fingerprint(backend, known=None):
+    """Devuelve (huella, archivos) de las entradas del backend.
+
+    `known` son los archivos de una huella anterior; los que conservan mtime y
+    tamano reutilizan su hash sin releerse.
+    """
+    known = known or {}
+    files = {}
+    for path in _inputs(backend):
+        st = os.stat(path)
+        rel = os.path.relpath(path, ROOT).replace(os.sep, "/")
+        previous = known.get(rel)
+        if previous and previous[0] == st.st_mtime_ns and previous[1] == st.st_size:
+            digest = previous[2]
+        else:
+            digest = _sha1(path)
+        files[rel] = [st.st_mtime_ns, st.st_size, digest]
+    total = hashlib.sha1()
+    for rel in sorted(files):
+        total.update(f"{rel}\0{files[rel][2]}\n".encode("utf-8"))
+    return total.hexdigest(), files
+
+
+_lock = threading.Lock()
+
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(cache):
+    tmp = CACHE_PATH + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+        os.replace(tmp, CACHE_PATH)
+    except OSError:
+        # Sin cache en disco solo se pierde el atajo del proximo arranque
+        pass
+
+
+def _build(backend):
+    result = subprocess.run(
+        ["dotnet", "build", backend.project],
+        capture_output=True, text=True, cwd=backend.project_dir, timeout=BUILD_TIMEOUT
+    )
+    if result.returncode != 0:
+        tail = "\n".join(result.stdout.strip().splitlines()[-10:])
+        raise RuntimeError(f"dotnet build fallo para {backend.name}:\n{tail}")
+
+
+def ensure_built(backend):
+    """Devuelve la ruta del .dll del backend, compilandolo solo si sus fuentes cambiaron."""
+    with _lock:
+        cache = _load_cache()
+        entry = cache.get(backend.name, {})
+        digest, files = fingerprint(backend, entry.get("files"))
+        dll = backend.dll
+        if entry.get("fingerprint") == digest and os.path.exists(dll):
+            if entry.get("files") != files:
+                # Solo cambiaron mtimes (checkout, touch): se guardan para no rehashear
+                entry["files"] = files
+                _save_cache(cache)
+            return dll
+        try:
+            _build(backend)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise RuntimeError(f"No se pudo compilar {backend.name}: {e}") from e
+        if not os.path.exists(dll):
+            raise RuntimeError(f"dotnet build no genero {dll}")
+        cache[backend.name] = {"fingerprint": digest, "files": files, "dll": dll}
+        _save_cache(cache)
+        return dll
+
+
+def command(backend, *args):
+    """Linea de comandos para ejecutar el backend ya compilado con los argumentos dados."""
+    return ["dotnet", ensure_built(backend), *args]
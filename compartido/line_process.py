@@ -0,0 +1,102 @@
+"""Proceso de backend de larga vida que atiende peticiones JSON, una por linea.
+
+Lo usan los dos juegos (`Sopa.Cli serve` y el `serve` del ahorcado): cada
+peticion lleva un "id" y se espera la linea de respuesta con el mismo id.
+Las lineas que no son JSON (p. ej. avisos del runtime de dotnet) se ignoran.
+Si el proceso no arranca o muere se relanza de forma transparente y se
+reintenta una vez; si vuelve a fallar se lanza RuntimeError con las ultimas
+lineas de stderr.
+"""
+
+import itertools
+import json
+import subprocess
+import threading
+from collections import deque
+
+
+class LineProcess:
+    def __init__(self, command_factory, cwd=None, name="El backend", error_prefix="Backend error"):
+        """`command_factory()` devuelve la linea de comandos a lanzar en cada arranque."""
+        self._command_factory = command_factory
+        self._cwd = cwd
+        self._name = name
+        self._error_prefix = error_prefix
+        self._proc = None
+        self._stderr_tail = deque(maxlen=20)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def _start(self):
+        self._stderr_tail.clear()
+        self._proc = subprocess.Popen(
+            self._command_factory(),
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            text=True, encoding="utf-8", bufsize=1, cwd=self._cwd
+        )
+        # Drenar stderr en segundo plano para que el proceso nunca se bloquee al escribir
+        threading.Thread(target=self._drain_stderr, args=(self._proc,), daemon=True).start()
+        self._started()
+
+    def _started(self):
+        """Se llama con el proceso recien lanzado, antes de enviarle la peticion."""
+
+    def _drain_stderr(self, proc):
+        for line in proc.stderr:
+            self._stderr_tail.append(line.rstrip())
+
+    def _alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _roundtrip(self, request_id, line):
+        self._proc.stdin.write(line + "\n")
+        self._proc.stdin.flush()
+        while True:
+            raw = self._proc.stdout.readline()
+            if not raw:
+                raise BrokenPipeError(f"{self._name} terminó inesperadamente")
+            try:
+                msg = json.loads(raw)
+            except ValueError:
+                continue
+            if isinstance(msg, dict) and msg.get("id") == request_id:
+                return msg, raw
+
+    def exchange(self, build_line):
+        """Envia `build_line(request_id)` y devuelve (respuesta, linea recibida).
+
+        La linea se arma en cada intento, despues de arrancar el proceso si
+        hacia falta, por si depende de algo negociado al arrancar.
+        """
+        with self._lock:
+            request_id = next(self._ids)
+            for attempt in range(2):
+                try:
+                    # Arrancar tambien puede fallar: se reintenta igual que el envio
+                    if not self._alive():
+                        self._start()
+                    return self._roundtrip(request_id, build_line(request_id))
+                except (BrokenPipeError, OSError) as e:
+                    self._kill()
+                    if attempt == 1:
+                        raise RuntimeError(f"{self._error_prefix}: {' | '.join(self._stderr_tail) or e}")
+
+    def _kill(self):
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._proc = None
+
+    def close(self):
+        # Al cerrar stdin el backend termina lo pendiente antes de salir
+        with self._lock:
+            if self._alive():
+                try:
+                    self._proc.stdin.close()
+                    self._proc.wait(timeout=5)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._kill()
@@ -12,37 +12,32 @@ open Hangman.GameState
 //si la letra es incorrecta, se incrementa el contador de intentos incorrectos
 //si el contador de intentos incorrectos es igual a la cantidad de intentos maximos, se retorna un mensaje de perdida
 //si la letra es correcta, se retorna un mensaje de que se ha ganado el jeugo 
+//si la partida ya termino, el intento se ignora
 let makeGuess guess gameState =
-    let guessUpper = System.Char.ToUpper(guess)
+    let guessUpper = System.Char.ToUpperInvariant(guess)
     
-    if List.contains guessUpper gameState.GuessedLetters then
+    if isGameOver gameState then
+        gameState, "La partida ya terminó"
+    elif letterIndex guessUpper < 0 then
+        gameState, "Ingresa solo una letra"
+    elif isGuessed guessUpper gameState then
         gameState, "Ya intentaste esta letra"
     else
-        let newGuessedLetters = guessUpper :: gameState.GuessedLetters
-        let isInWord = gameState.Word.Contains(string guessUpper)
-        
-        let newIncorrectGuesses = 
-            if isInWord then gameState.IncorrectGuesses 
-            else gameState.IncorrectGuesses + 1
+        let guessed = withGuess guessUpper gameState
+        let isInWord = guessed.IncorrectGuesses = gameState.IncorrectGuesses
         
         let won = 
             not (System.String.IsNullOrEmpty(gameState.Word)) &&
-            gameState.Word 
-            |> Seq.forall (fun c -> List.contains c newGuessedLetters)
+            guessed.Unrevealed = 0
         
-        let lost = newIncorrectGuesses >= gameState.MaxAttempts
+        let lost = guessed.IncorrectGuesses >= gameState.MaxAttempts
         
         let newStatus =
             if won then Won
             elif lost then Lost
             else Playing
         
-        let newGameState = {
-            gameState with
-                GuessedLetters = newGuessedLetters
-                IncorrectGuesses = newIncorrectGuesses
-                Status = newStatus
-        }
+        let newGameState = { guessed with Status = newStatus }
         
         let message =
             if won then "¡Ganaste! La palabra era: " + gameState.Word
@@ -55,10 +50,4 @@ let makeGuess guess gameState =
 //obtiene el estado actual del juego; la palabra oculta, la cantidad de intentos restantes, 
 //las letras incorrectas
 let getGameInfo gameState =
-    let maskedWord = getMaskedWord gameState
-    let remaining = getRemainingAttempts gameState
-    let incorrectLetters = 
-        gameState.GuessedLetters 
-        |> List.filter (fun c -> not (gameState.Word.Contains(string c)))
-    
-    maskedWord, remaining, incorrectLetters
\ No newline at end of file
+    getMaskedWord gameState, getRemainingAttempts gameState, gameState.Incorrect
\ No newline at end of file
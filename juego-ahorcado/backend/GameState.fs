@@ -1,38 +1,119 @@
 //Maneja el estado del juego; la palabra, las letras adivinadas, los intentos incorrectos, etc.
-//se define un type que contiene la palabra, las letras adivinadas, los intentos incorrectos, etc, 
+//se define un type que contiene la palabra, las letras adivinadas, los intentos incorrectos, etc,
 //la cantidad de intentos maximos y si aun se esta jugando
+//las letras intentadas se guardan como bits sobre el alfabeto y las posiciones de cada letra en
+//la palabra se calculan una sola vez, asi un intento solo visita las apariciones de esa letra
 
 module Hangman.GameState
 
-type GameStatus = 
+open System
+
+type GameStatus =
     | Playing
     | Won
     | Lost
 
+//letras que se pueden adivinar; el resto de los caracteres (espacios, guiones) se muestran siempre
+let alphabet = "ABCDEFGHIJKLMNÑOPQRSTUVWXYZÁÉÍÓÚÜ"
+
+let private indices =
+    let tabla = Array.create 256 -1
+    alphabet |> String.iteri (fun i c -> tabla.[int c] <- i)
+    tabla
+
+//posicion de la letra en el alfabeto, o -1 si no se puede adivinar
+let letterIndex (c: char) =
+    let upper = Char.ToUpperInvariant c
+    if int upper < indices.Length then indices.[int upper] else -1
+
+let letterBit (c: char) =
+    let i = letterIndex c
+    if i < 0 then 0UL else 1UL <<< i
+
+//separa las posiciones de la palabra oculta que se muestra; no puede aparecer en una palabra,
+//asi un espacio de una frase no se confunde con la separacion entre letras
+let maskSeparator = '\u2002'
+
+//una palabra se puede jugar si tiene alguna letra para adivinar y no contiene el separador
+let isPlayableWord (word: string) =
+    word.IndexOf maskSeparator < 0 && word |> Seq.exists (fun c -> letterIndex c >= 0)
+
 type GameState = {
     Word: string
+    //historial de intentos, el mas reciente primero
     GuessedLetters: char list
+    //un bit por letra del alfabeto ya intentada
+    Guessed: uint64
+    //posiciones en la palabra de cada letra del alfabeto
+    Positions: int[][]
+    //un caracter por posicion de la palabra, '_' si esta oculta: "G__O"
+    Masked: string
+    //letras de la palabra que faltan descubrir
+    Unrevealed: int
+    //letras intentadas que no estan en la palabra, la mas reciente primero
+    Incorrect: char list
     IncorrectGuesses: int
     MaxAttempts: int
     Status: GameStatus
 }
 
-//crea el estado inicial del juego 
-let initialGameState (word: string) (maxAttempts: int) = {
-    Word = word.ToUpper()
-    GuessedLetters = []
-    IncorrectGuesses = 0
-    MaxAttempts = maxAttempts
-    Status = Playing
-}
+//crea el estado inicial del juego
+let initialGameState (word: string) (maxAttempts: int) =
+    let palabra = word.ToUpperInvariant()
+    let posiciones = Array.init alphabet.Length (fun _ -> ResizeArray<int>())
+    let masked = palabra.ToCharArray()
+    let mutable ocultas = 0
+    palabra |> String.iteri (fun i c ->
+        let letra = letterIndex c
+        if letra >= 0 then
+            posiciones.[letra].Add i
+            masked.[i] <- '_'
+            ocultas <- ocultas + 1)
+    { Word = palabra
+      GuessedLetters = []
+      Guessed = 0UL
+      Positions = posiciones |> Array.map (fun p -> p.ToArray())
+      Masked = String(masked)
+      Unrevealed = ocultas
+      Incorrect = []
+      IncorrectGuesses = 0
+      MaxAttempts = maxAttempts
+      Status = Playing }
+
+let isGuessed (c: char) gameState = gameState.Guessed &&& letterBit c <> 0UL
+
+//registra una letra nueva del alfabeto: descubre sus apariciones o la cuenta como error;
+//el estado del juego (Playing/Won/Lost) lo decide GameLogic
+let withGuess (letter: char) gameState =
+    let letra = letterIndex letter
+    let upper = Char.ToUpperInvariant letter
+    let apariciones = gameState.Positions.[letra]
+    let siguiente =
+        { gameState with
+            GuessedLetters = upper :: gameState.GuessedLetters
+            Guessed = gameState.Guessed ||| (1UL <<< letra) }
+    if apariciones.Length = 0 then
+        { siguiente with
+            Incorrect = upper :: gameState.Incorrect
+            IncorrectGuesses = gameState.IncorrectGuesses + 1 }
+    else
+        let masked = gameState.Masked.ToCharArray()
+        for i in apariciones do masked.[i] <- upper
+        { siguiente with
+            Masked = String(masked)
+            Unrevealed = gameState.Unrevealed - apariciones.Length }
+
+//reconstruye una partida guardada a partir de sus intentos, del mas antiguo al mas reciente
+let restoreGameState (word: string) (guesses: char seq) (maxAttempts: int) (status: GameStatus) =
+    let inicial = initialGameState word maxAttempts
+    let state =
+        guesses
+        |> Seq.fold (fun s c -> if letterIndex c < 0 || isGuessed c s then s else withGuess c s) inicial
+    { state with Status = status }
 
-//obtiene la palabra oculta; si la letra esta en la lista de letras adivinadas, se muestra, 
-//sino, se muestra un guion bajo
-let getMaskedWord gameState =
-    gameState.Word
-    |> Seq.map (fun c -> 
-        if List.contains c gameState.GuessedLetters then string c else "_")
-    |> String.concat " "
+//obtiene la palabra oculta; si la letra esta en la lista de letras adivinadas, se muestra,
+//sino, se muestra un guion bajo; las posiciones van separadas por maskSeparator: "G _ _ O"
+let getMaskedWord gameState = String.Join(string maskSeparator, gameState.Masked.ToCharArray())
 
 //obtiene la cantidad de intentos restantes
 let getRemainingAttempts gameState =
@@ -42,4 +123,4 @@ let getRemainingAttempts gameState =
 let isGameOver gameState =
     match gameState.Status with
     | Playing -> false
-    | _ -> true
\ No newline at end of file
+    | _ -> true
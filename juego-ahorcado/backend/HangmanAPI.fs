@@ -6,8 +6,10 @@ module Hangman.API
 open Hangman.GameState
 open Hangman.GameLogic
 open Hangman.WordManager
-open System.Collections.Generic
-open System.IO
+open Hangman.Journal
+open Hangman.Hints
+open System.Text.Json
+open System.Text.Json.Serialization
 
 //crea el juego
 type HangmanGame() =
@@ -58,98 +60,140 @@ type HangmanGame() =
     member this.IsGameOver() =
         isGameOver currentState
 
-//obtiene el archivo de estado del juego
-let getStateFilePath gameId = sprintf "game_%s.state" gameId
+//lee las opciones de "start <id> --length N --min N --max N --category C"
+let parseWordFilter (opciones: string[]) =
+    let rec leer filtro i =
+        if i + 1 >= opciones.Length then Some filtro
+        else
+            let valor = opciones.[i + 1]
+            match opciones.[i], System.Int32.TryParse valor with
+            | "--length", (true, n) -> leer { filtro with MinLength = Some n; MaxLength = Some n } (i + 2)
+            | "--min", (true, n) -> leer { filtro with MinLength = Some n } (i + 2)
+            | "--max", (true, n) -> leer { filtro with MaxLength = Some n } (i + 2)
+            | "--category", _ -> leer { filtro with Category = Some valor } (i + 2)
+            | _ -> None
+    if opciones.Length % 2 = 0 then leer noFilter 0 else None
 
-//guarda el estado del juego
-let saveGameState gameId (gameState: GameState) =
-    let filePath = getStateFilePath gameId
-    let content = sprintf "%s|%s|%d|%d|%s" 
-                    gameState.Word 
-                    (String.concat "," (List.map string gameState.GuessedLetters))
-                    gameState.IncorrectGuesses
-                    gameState.MaxAttempts
-                    (match gameState.Status with | Playing -> "playing" | Won -> "won" | Lost -> "lost")
-    File.WriteAllText(filePath, content)
+//donde viven las partidas: el diario en disco o las sesiones del modo servidor
+type GameStore = {
+    Load: string -> GameState option
+    Save: string -> GameState -> unit
+    Delete: string -> unit
+}
 
-//carga el estado del juego
-let loadGameState gameId =
-    let filePath = getStateFilePath gameId
-    if File.Exists(filePath) then
-        try
-            let content = File.ReadAllText(filePath)
-            let parts = content.Split('|')
-            if parts.Length >= 5 then
-                let word = parts.[0]
-                let guessedLetters = 
-                    if System.String.IsNullOrEmpty(parts.[1]) then []
-                    else parts.[1].Split(',') |> Array.map (fun s -> s.[0]) |> Array.toList
-                let incorrectGuesses = int parts.[2]
-                let maxAttempts = int parts.[3]
-                let status = match parts.[4] with
-                             | "won" -> Won
-                             | "lost" -> Lost
-                             | _ -> Playing
-                Some {
-                    Word = word
-                    GuessedLetters = guessedLetters
-                    IncorrectGuesses = incorrectGuesses
-                    MaxAttempts = maxAttempts
-                    Status = status
-                }
-            else None
-        with
-        | _ -> None
-    else None
+let journalStore (journal: JournalStore) =
+    { Load = journal.Load; Save = journal.Save; Delete = journal.Delete }
 
-//elimina el estado del juego
-let deleteGameState gameId =
-    let filePath = getStateFilePath gameId
-    if File.Exists(filePath) then
-        File.Delete(filePath)
+//version del formato de respuesta; cambia si se quitan o renombran campos o cambia su formato
+//(2: las posiciones de masked van separadas por maskSeparator en lugar de un espacio)
+let protocolVersion = 2
 
-//ejecuta el comando que se le paso como argumeto 
-let executeCommand args =
-    match args with
-    | [| "start" |] ->
-        let gameId = "default"
-        deleteGameState gameId
-        let game = HangmanGame()
-        let masked, remaining, message = game.StartNewGame()
-        saveGameState gameId (game.GetRawState())
-        sprintf "%s|%d|%s" masked remaining message
-    | [| "start"; gameId |] ->
-        deleteGameState gameId
-        let game = HangmanGame()
-        let masked, remaining, message = game.StartNewGame()
-        saveGameState gameId (game.GetRawState())
-        sprintf "%s|%d|%s" masked remaining message
-    | [| "start"; gameId; word |] ->
-        deleteGameState gameId
+//respuesta de todos los comandos: el estado completo de la partida mas un mensaje,
+//asi cada accion del jugador se resuelve con una sola llamada
+type Response = {
+    V: int
+    Masked: string
+    Remaining: int
+    Incorrect: string list
+    Status: string
+    Message: string
+    //solo cuando la partida termino o con getword
+    Word: string option
+    //solo con hint: la letra sugerida
+    Hint: string option
+}
+
+let statusText status =
+    match status with
+    | Playing -> "playing"
+    | Won -> "won"
+    | Lost -> "lost"
+
+let stateResponse (state: GameState) message =
+    let masked, remaining, incorrect = getGameInfo state
+    { V = protocolVersion
+      Masked = masked
+      Remaining = remaining
+      Incorrect = incorrect |> List.rev |> List.map string
+      Status = statusText state.Status
+      Message = message
+      Word = if isGameOver state then Some state.Word else None
+      Hint = None }
+
+let errorResponse message =
+    { V = protocolVersion; Masked = ""; Remaining = 0; Incorrect = []
+      Status = "error"; Message = message; Word = None; Hint = None }
+
+let jsonOptions =
+    JsonSerializerOptions(
+        PropertyNamingPolicy = JsonNamingPolicy.CamelCase,
+        DefaultIgnoreCondition = JsonIgnoreCondition.WhenWritingNull)
+
+let serializeResponse (response: Response) = JsonSerializer.Serialize(response, jsonOptions)
+
+//ejecuta el comando sobre las partidas del almacen indicado
+let executeWith (store: GameStore) (args: string[]) =
+    let iniciar gameId word =
         let game = HangmanGame()
-        let masked, remaining, message = game.StartNewGame(word = word)
-        saveGameState gameId (game.GetRawState())
-        sprintf "%s|%d|%s" masked remaining message
+        let _, _, message = game.StartNewGame(?word = word)
+        store.Save gameId (game.GetRawState())
+        stateResponse (game.GetRawState()) message
+    match args with
+    //se rechaza antes de tocar el almacen: no se podria guardar en el diario
+    | _ when args.Length > 1 && not (isValidGameId args.[1]) ->
+        errorResponse "Identificador de partida no válido"
+    | [| "start"; _; word |] when not (isValidWord word) ->
+        errorResponse "La palabra no puede contener '|' ni saltos de línea"
+    | _ when args.Length > 2 && args.[0] = "start" && args.[2].StartsWith "--" ->
+        match parseWordFilter args.[2..] with
+        | None -> errorResponse "Opciones no válidas"
+        | Some filtro ->
+            match getRandomWordWith filtro with
+            | None -> errorResponse "No hay palabras con esos criterios"
+            | Some word -> iniciar args.[1] (Some word)
+    //sin letras para adivinar la partida se ganaria sola en el primer intento
+    | [| "start"; _; word |] when not (isPlayableWord word) ->
+        if word.IndexOf maskSeparator >= 0 then errorResponse "La palabra no puede contener el carácter U+2002"
+        else errorResponse "La palabra debe tener al menos una letra para adivinar"
+    | [| "start" |] -> iniciar "default" None
+    | [| "start"; gameId |] -> iniciar gameId None
+    | [| "start"; gameId; word |] -> iniciar gameId (Some word)
     | [| "guess"; gameId; letter |] ->
-        match loadGameState gameId with
+        match store.Load gameId with
         | Some state ->
             let game = HangmanGame()
             game.LoadState(state)
-            let masked, remaining, message = game.MakeGuess(letter)
-            saveGameState gameId (game.GetRawState())
-            sprintf "%s|%d|%s" masked remaining message
-        | None -> "ERROR|0|No hay juego activo. Usa 'start' primero"
+            let _, _, message = game.MakeGuess(letter)
+            store.Save gameId (game.GetRawState())
+            stateResponse (game.GetRawState()) message
+        | None -> errorResponse "No hay juego activo. Usa 'start' primero"
+    | [| "hint"; gameId |] ->
+        match store.Load gameId with
+        | Some state when isGameOver state -> stateResponse state "La partida ya terminó"
+        | Some state ->
+            let pista = getHint state
+            match pista.Letter with
+            | Some letra ->
+                let message =
+                    match pista.Candidates with
+                    | 0 -> sprintf "Pista: prueba con la %c" letra
+                    | 1 -> sprintf "Pista: prueba con la %c (1 palabra posible)" letra
+                    | n -> sprintf "Pista: prueba con la %c (%d palabras posibles)" letra n
+                { stateResponse state message with Hint = Some (string letra) }
+            | None -> stateResponse state "No hay pistas disponibles"
+        | None -> errorResponse "No hay juego activo"
     | [| "getword"; gameId |] ->
-        match loadGameState gameId with
-        | Some state -> sprintf "%s|0|palabra actual" state.Word
-        | None -> "ERROR|0|No hay juego activo"
+        match store.Load gameId with
+        | Some state -> { stateResponse state "palabra actual" with Word = Some state.Word }
+        | None -> errorResponse "No hay juego activo"
     | [| "status"; gameId |] ->
-        match loadGameState gameId with
-        | Some state ->
-            let masked = getMaskedWord state
-            let remaining = getRemainingAttempts state
-            let incorrect = state.GuessedLetters |> List.filter (fun c -> not (state.Word.Contains(string c)))
-            let status = match state.Status with | Playing -> "playing" | Won -> "won" | Lost -> "lost"
-            sprintf "%s|%d|%s|%s|%s" masked remaining (String.concat "," (List.map string incorrect)) status state.Word
-        | None -> "ERROR|0|No hay juego activo"
-    | _ -> "ERROR|0|Comando no válido"
\ No newline at end of file
+        match store.Load gameId with
+        | Some state -> stateResponse state ""
+        | None -> errorResponse "No hay juego activo"
+    | _ -> errorResponse "Comando no válido"
+
+//ejecuta el comando que se le paso como argumeto 
+//cada llamada abre el diario y lee solo la partida pedida a traves de su indice
+let executeCommand (args: string[]) =
+    try executeWith (journalStore (JournalStore())) args
+    with :? System.IO.IOException as e -> errorResponse (sprintf "No se pudo usar el diario de partidas: %s" e.Message)
@@ -0,0 +1,164 @@
+//Pistas: sugiere la letra que mejor divide las palabras del diccionario que todavia
+//coinciden con la palabra oculta y las letras incorrectas
+//cada palabra del diccionario tiene precalculada su mascara de letras presentes (un bit por
+//letra del alfabeto), asi la mayoria de las candidatas se descartan con una operacion de bits;
+//las candidatas salen del grupo de palabras de la misma longitud y se guardan segun lo que se ve
+//de la partida (palabra oculta + letras intentadas): el siguiente intento filtra solo las que
+//quedaron, y partidas distintas en la misma situacion reutilizan el resultado
+
+module Hangman.Hints
+
+open Hangman.GameState
+open Hangman.WordManager
+open System
+open System.Collections.Generic
+
+//letras mas frecuentes en espanol, para cuando la palabra no esta en el diccionario
+let fallbackOrder = "EAOSRNIDLCTUMPBGVYQHFZJÑXKWÁÉÍÓÚÜ"
+
+type Hint = {
+    Letter: char option
+    Candidates: int
+}
+
+type HintIndex = {
+    Store: WordStore
+    //letras presentes en cada palabra del almacen
+    Presence: uint64[]
+    //por (palabra oculta, letras intentadas)
+    CandidateCache: Dictionary<struct (string * uint64), int[]>
+    HintCache: Dictionary<struct (string * uint64), Hint>
+}
+
+let private maxCache = 10000
+
+let buildIndex (store: WordStore) =
+    let presencia =
+        Array.init (count store) (fun i ->
+            let inicio = store.Offsets.[i]
+            let mutable bits = 0UL
+            for k in inicio .. inicio + store.WordLengths.[i] - 1 do
+                bits <- bits ||| letterBit store.Text.[k]
+            bits)
+    { Store = store
+      Presence = presencia
+      CandidateCache = Dictionary()
+      HintCache = Dictionary() }
+
+let private guardar (cache: Dictionary<'K, 'V>) clave valor =
+    if cache.Count >= maxCache then cache.Clear()
+    cache.[clave] <- valor
+
+let private clave (state: GameState) = struct (state.Masked, state.Guessed)
+
+//lo que se veia antes del ultimo intento: si fue correcto se vuelven a ocultar sus letras
+let private claveAnterior (state: GameState) =
+    match state.GuessedLetters with
+    | ultima :: _ ->
+        let masked =
+            match state.Incorrect with
+            | c :: _ when c = ultima -> state.Masked
+            | _ ->
+                let letras = state.Masked.ToCharArray()
+                for i in state.Positions.[letterIndex ultima] do letras.[i] <- '_'
+                String(letras)
+        Some (struct (masked, state.Guessed &&& ~~~(letterBit ultima)))
+    | [] -> None
+
+//la palabra del almacen coincide con lo que se ve de la partida: mismas letras descubiertas,
+//y en las posiciones ocultas solo letras que todavia no se intentaron
+let private matches (index: HintIndex) (state: GameState) (i: int) =
+    let texto = index.Store.Text
+    let inicio = index.Store.Offsets.[i]
+    let mutable ok = true
+    let mutable k = 0
+    while ok && k < state.Word.Length do
+        let visible = state.Masked.[k]
+        let c = texto.[inicio + k]
+        ok <-
+            if visible = '_' then letterIndex c >= 0 && not (isGuessed c state)
+            else c = visible
+        k <- k + 1
+    ok
+
+//candidatas: se parte de las de la situacion anterior si estan guardadas
+let candidates (index: HintIndex) (state: GameState) =
+    let incorrectas = state.Incorrect |> List.fold (fun bits c -> bits ||| letterBit c) 0UL
+    let filtrar (desde: int[]) =
+        desde |> Array.filter (fun i ->
+            index.Presence.[i] &&& incorrectas = 0UL && matches index state i)
+    let cache = index.CandidateCache
+    lock cache (fun () ->
+        match cache.TryGetValue(clave state) with
+        | true, lista -> lista
+        | _ ->
+            let previas =
+                match claveAnterior state with
+                | Some anterior ->
+                    match cache.TryGetValue anterior with
+                    | true, previas -> Some previas
+                    | _ -> None
+                | None -> None
+            let lista =
+                match previas with
+                | Some previas -> filtrar previas
+                | None ->
+                    let grupo = Array.BinarySearch(index.Store.All.Lengths, state.Word.Length)
+                    if grupo < 0 then [||] else filtrar index.Store.All.Words.[grupo]
+            guardar cache (clave state) lista
+            lista)
+
+//entropia (en bits) de como responde el juego a cada letra: las candidatas se agrupan por
+//las posiciones en que aparece la letra, y la mejor letra es la que deja grupos mas parejos
+let bestLetter (index: HintIndex) (state: GameState) (lista: int[]) =
+    let grupos = Array.init alphabet.Length (fun _ -> Dictionary<uint64, int>())
+    let patron = Array.zeroCreate<uint64> alphabet.Length
+    for i in lista do
+        Array.Clear patron
+        let inicio = index.Store.Offsets.[i]
+        for k in 0 .. state.Word.Length - 1 do
+            let letra = letterIndex index.Store.Text.[inicio + k]
+            if letra >= 0 then
+                //las palabras de mas de 64 letras comparten bits, lo que solo aproxima el patron
+                patron.[letra] <- patron.[letra] ||| (1UL <<< (k % 64))
+        for letra in 0 .. alphabet.Length - 1 do
+            if patron.[letra] <> 0UL then
+                let g = grupos.[letra]
+                match g.TryGetValue patron.[letra] with
+                | true, n -> g.[patron.[letra]] <- n + 1
+                | _ -> g.[patron.[letra]] <- 1
+    let total = float lista.Length
+    let entropia (g: Dictionary<uint64, int>) =
+        let ausentes = lista.Length - Seq.sum g.Values
+        seq { yield ausentes; yield! g.Values }
+        |> Seq.filter (fun n -> n > 0)
+        |> Seq.sumBy (fun n -> let p = float n / total in -p * Math.Log2 p)
+    seq { 0 .. alphabet.Length - 1 }
+    |> Seq.filter (fun letra -> state.Guessed &&& (1UL <<< letra) = 0UL && grupos.[letra].Count > 0)
+    |> Seq.map (fun letra -> alphabet.[letra], entropia grupos.[letra], Seq.sum grupos.[letra].Values)
+    //a igual entropia se prefiere la letra que esta en mas candidatas
+    |> Seq.sortByDescending (fun (_, h, presentes) -> h, presentes)
+    |> Seq.tryHead
+
+let suggest (index: HintIndex) (state: GameState) =
+    match lock index.HintCache (fun () -> index.HintCache.TryGetValue(clave state)) with
+    | true, pista -> pista
+    | _ ->
+        let lista = candidates index state
+        let pista =
+            match bestLetter index state lista with
+            | Some (letra, _, _) -> { Letter = Some letra; Candidates = lista.Length }
+            | None ->
+                let letra = fallbackOrder |> Seq.tryFind (fun c -> not (isGuessed c state))
+                { Letter = letra; Candidates = lista.Length }
+        lock index.HintCache (fun () -> guardar index.HintCache (clave state) pista)
+        pista
+
+let private indice = lazy (defaultStore () |> Option.map buildIndex)
+
+//pista sobre el diccionario por defecto (words.txt)
+let getHint (state: GameState) =
+    match indice.Value with
+    | Some index -> suggest index state
+    | None ->
+        { Letter = fallbackOrder |> Seq.tryFind (fun c -> not (isGuessed c state)); Candidates = 0 }
@@ -0,0 +1,561 @@
+//Guarda todas las partidas en un solo diario (sessions.journal) al que solo se le agregan lineas:
+//  H|<generacion>                                  cabecera; cambia con cada compactacion
+//  S|<id>|PALABRA|letras|errores|max|estado        foto completa de una partida
+//  G|<id>|<letra>|<anterior>                       un intento aplicado sobre la linea anterior de
+//                                                  la partida, que empieza en el byte <anterior>
+//  D|<id>                                          partida borrada
+//un intento cuesta una linea de tamano constante. Junto al diario, sessions.journal.idx es una
+//tabla hash en disco de gameId -> byte donde empieza la ultima linea de la partida: leer una
+//partida es buscar su casilla y seguir la cadena de intentos hasta su foto, sin recorrer el
+//diario. El indice recuerda hasta que byte del diario cubre; las lineas que otro proceso agrego
+//despues (si murio antes de actualizarlo) se incorporan al abrirlo. Todo se hace con el candado
+//sessions.journal.lock tomado. Si el indice falta o no corresponde al diario, o cuando el diario
+//tiene muchas mas lineas que partidas vivas, se lee el diario entero y se reescribe con una foto
+//por partida.
+
+module Hangman.Journal
+
+open Hangman.GameState
+open Hangman.GameLogic
+open System
+open System.Buffers.Binary
+open System.Collections.Generic
+open System.IO
+open System.Text
+open System.Threading
+
+//formato de una partida, el mismo de los antiguos game_<id>.state
+let formatState (state: GameState) =
+    sprintf "%s|%s|%d|%d|%s"
+        state.Word
+        (String.concat "," (List.map string state.GuessedLetters))
+        state.IncorrectGuesses
+        state.MaxAttempts
+        (match state.Status with | Playing -> "playing" | Won -> "won" | Lost -> "lost")
+
+let parseState (parts: string[]) : Result<GameState, string> =
+    if parts.Length < 5 then Error "faltan campos"
+    else
+        let letras = if String.IsNullOrEmpty parts.[1] then [||] else parts.[1].Split(',')
+        //los errores se vuelven a contar a partir de los intentos
+        match Int32.TryParse parts.[2], Int32.TryParse parts.[3] with
+        | (true, _), (true, maximo) when letras |> Array.forall (fun l -> l.Length = 1) ->
+            match parts.[4] with
+            | "playing" | "won" | "lost" as estado ->
+                let status = match estado with | "won" -> Won | "lost" -> Lost | _ -> Playing
+                //el historial se guarda del intento mas reciente al mas antiguo
+                Ok (restoreGameState parts.[0] (letras |> Array.rev |> Array.map (fun l -> l.[0])) maximo status)
+            | otro -> Error (sprintf "estado desconocido '%s'" otro)
+        | _ -> Error "numeros o letras invalidos"
+
+//el nuevo estado es el anterior mas un intento: se guarda solo la letra
+let private isNextGuess (anterior: GameState) (nuevo: GameState) =
+    match nuevo.GuessedLetters with
+    | letra :: resto when resto = anterior.GuessedLetters -> fst (makeGuess letra anterior) = nuevo
+    | _ -> false
+
+
+//los identificadores y las palabras van entre '|' en una linea del diario
+let private separadores = [| '|'; '\n'; '\r' |]
+
+//lo que cabe de un identificador en una casilla del indice
+let MaxGameIdBytes = 54
+
+let isValidGameId (gameId: string) =
+    not (String.IsNullOrEmpty gameId) && gameId.IndexOfAny separadores < 0
+    && Encoding.UTF8.GetByteCount gameId <= MaxGameIdBytes
+
+let isValidWord (word: string) = word.IndexOfAny separadores < 0
+
+//compacta cuando hay mas de MinCompact lineas y mas de CompactRatio lineas por partida viva
+let MinCompact = 1024
+let CompactRatio = 4
+
+//indice: cabecera de 64 bytes y casillas de 64 bytes
+//  cabecera: "HJIX0001", generacion del diario (32), byte hasta el que lo cubre (int64),
+//            lineas, partidas vivas, casillas y casillas usadas (int32)
+//  casilla:  estado (0 libre, 1 ocupada, 2 borrada), largo del id, id en UTF-8 (54) y
+//            byte de la ultima linea de la partida (int64)
+type private Cabecera =
+    { Generacion: string
+      Fin: int64
+      Lineas: int
+      Vivas: int
+      Casillas: int
+      Usadas: int }
+
+let private magia = "HJIX0001"B
+let private tamCabecera = 64
+let private tamCasilla = 64
+let private libre, ocupada, borrada = 0uy, 1uy, 2uy
+
+//lee hasta llenar el buffer o llegar al final; devuelve cuantos bytes leyo
+let private leerEn (datos: Stream) (pos: int64) (buffer: byte[]) =
+    datos.Seek(pos, SeekOrigin.Begin) |> ignore
+    let mutable n = 0
+    let mutable fin = false
+    while not fin && n < buffer.Length do
+        let leidos = datos.Read(buffer, n, buffer.Length - n)
+        if leidos = 0 then fin <- true else n <- n + leidos
+    n
+
+let private escribirEn (datos: Stream) (pos: int64) (buffer: byte[]) =
+    datos.Seek(pos, SeekOrigin.Begin) |> ignore
+    datos.Write(buffer, 0, buffer.Length)
+
+let private codificar (c: Cabecera) =
+    let b = Array.zeroCreate<byte> tamCabecera
+    Array.blit magia 0 b 0 magia.Length
+    Encoding.ASCII.GetBytes(c.Generacion, 0, 32, b, 8) |> ignore
+    BinaryPrimitives.WriteInt64LittleEndian(Span<byte>(b, 40, 8), c.Fin)
+    BinaryPrimitives.WriteInt32LittleEndian(Span<byte>(b, 48, 4), c.Lineas)
+    BinaryPrimitives.WriteInt32LittleEndian(Span<byte>(b, 52, 4), c.Vivas)
+    BinaryPrimitives.WriteInt32LittleEndian(Span<byte>(b, 56, 4), c.Casillas)
+    BinaryPrimitives.WriteInt32LittleEndian(Span<byte>(b, 60, 4), c.Usadas)
+    b
+
+let private decodificar (b: byte[]) =
+    if Seq.forall2 (=) magia b.[.. magia.Length - 1] then
+        let entero pos = BinaryPrimitives.ReadInt32LittleEndian(ReadOnlySpan<byte>(b, pos, 4))
+        Some { Generacion = Encoding.ASCII.GetString(b, 8, 32)
+               Fin = BinaryPrimitives.ReadInt64LittleEndian(ReadOnlySpan<byte>(b, 40, 8))
+               Lineas = entero 48
+               Vivas = entero 52
+               Casillas = entero 56
+               Usadas = entero 60 }
+    else None
+
+//FNV-1a: el mismo hash en todos los procesos, a diferencia de String.GetHashCode
+let private hashId (id: byte[]) =
+    let mutable h = 2166136261u
+    for b in id do
+        h <- (h ^^^ uint32 b) * 16777619u
+    h
+
+//casillas para n partidas dejando la tabla a lo sumo a la mitad
+let private casillasPara n =
+    let mutable casillas = 1024
+    while n * 2 > casillas do
+        casillas <- casillas * 2
+    casillas
+
+//tabla hash de gameId -> byte de la ultima linea de la partida, con sondeo lineal, sobre el
+//archivo .idx o sobre un MemoryStream al armar uno nuevo
+type private Indice(datos: Stream, inicial: Cabecera) =
+    let mutable cabecera = inicial
+    let casilla = Array.zeroCreate<byte> tamCasilla
+    let posicion i = int64 tamCabecera + int64 i * int64 tamCasilla
+
+    let mismoId (id: byte[]) =
+        int casilla.[1] = id.Length && Seq.forall2 (=) id casilla.[2 .. id.Length + 1]
+
+    let lineaDeCasilla () = BinaryPrimitives.ReadInt64LittleEndian(ReadOnlySpan<byte>(casilla, 56, 8))
+
+    //devuelve la casilla del id (ocupada) o donde iria (libre o borrada)
+    let buscar (id: byte[]) =
+        let n = cabecera.Casillas
+        let rec probar i vistas hueco =
+            if vistas = n then
+                match hueco with
+                | Some h -> struct (h, borrada)
+                | None -> raise (InvalidDataException "el indice de partidas esta lleno")
+            else
+                leerEn datos (posicion i) casilla |> ignore
+                match casilla.[0] with
+                | 0uy ->
+                    match hueco with
+                    | Some h -> struct (h, borrada)
+                    | None -> struct (i, libre)
+                | 2uy -> probar ((i + 1) % n) (vistas + 1) (if hueco.IsNone then Some i else hueco)
+                | _ when mismoId id -> struct (i, ocupada)
+                | _ -> probar ((i + 1) % n) (vistas + 1) hueco
+        probar (int (hashId id % uint32 n)) 0 None
+
+    let bytesId (gameId: string) =
+        let id = Encoding.UTF8.GetBytes gameId
+        if id.Length > MaxGameIdBytes then
+            invalidArg "gameId" (sprintf "Identificador de partida demasiado largo: '%s'" gameId)
+        id
+
+    //arma una tabla vacia de n casillas en `datos`
+    static member Crear(datos: Stream, generacion: string, casillas: int) =
+        let cabecera = { Generacion = generacion; Fin = 0L; Lineas = 0; Vivas = 0; Casillas = casillas; Usadas = 0 }
+        datos.SetLength 0L
+        datos.SetLength(int64 tamCabecera + int64 casillas * int64 tamCasilla)
+        escribirEn datos 0L (codificar cabecera)
+        Indice(datos, cabecera)
+
+    member _.Cabecera
+        with get () = cabecera
+        and set valor = cabecera <- valor
+
+    member _.Buscar(gameId: string) =
+        let id = Encoding.UTF8.GetBytes gameId
+        if id.Length > MaxGameIdBytes then None
+        else
+            match buscar id with
+            | struct (_, 1uy) -> Some (lineaDeCasilla ())
+            | _ -> None
+
+    member this.Poner(gameId: string, linea: int64) =
+        let id = bytesId gameId
+        let struct (i, estado) = buscar id
+        let nueva = Array.zeroCreate<byte> tamCasilla
+        nueva.[0] <- ocupada
+        nueva.[1] <- byte id.Length
+        Array.blit id 0 nueva 2 id.Length
+        BinaryPrimitives.WriteInt64LittleEndian(Span<byte>(nueva, 56, 8), linea)
+        escribirEn datos (posicion i) nueva
+        if estado <> ocupada then
+            cabecera <- { cabecera with
+                            Vivas = cabecera.Vivas + 1
+                            Usadas = if estado = libre then cabecera.Usadas + 1 else cabecera.Usadas }
+        //las casillas borradas tambien alargan las busquedas: se rehace antes de llenarse
+        if cabecera.Usadas * 3 > cabecera.Casillas * 2 then this.Rehacer()
+
+    member _.Quitar(gameId: string) =
+        match buscar (bytesId gameId) with
+        | struct (i, 1uy) ->
+            escribirEn datos (posicion i) [| borrada |]
+            cabecera <- { cabecera with Vivas = cabecera.Vivas - 1 }
+        | _ -> ()
+
+    //(gameId, linea) de las partidas vivas
+    member _.Partidas() =
+        let tabla = Array.zeroCreate<byte> (cabecera.Casillas * tamCasilla)
+        leerEn datos (posicion 0) tabla |> ignore
+        [ for i in 0 .. cabecera.Casillas - 1 do
+            let base' = i * tamCasilla
+            if tabla.[base'] = ocupada then
+                yield Encoding.UTF8.GetString(tabla, base' + 2, int tabla.[base' + 1]),
+                      BinaryPrimitives.ReadInt64LittleEndian(ReadOnlySpan<byte>(tabla, base' + 56, 8)) ]
+
+    //vuelve a insertar las partidas vivas en una tabla del tamano justo, sin casillas borradas;
+    //mientras tanto la cabecera queda invalida, asi que si el proceso muere a mitad el indice
+    //se reconstruye desde el diario
+    member this.Rehacer() =
+        let partidas = this.Partidas()
+        escribirEn datos 0L (Array.zeroCreate magia.Length)
+        datos.Flush()
+        let casillas = casillasPara partidas.Length
+        datos.SetLength(int64 tamCabecera)
+        datos.SetLength(posicion casillas)
+        cabecera <- { cabecera with Vivas = 0; Casillas = casillas; Usadas = 0 }
+        for gameId, linea in partidas do
+            this.Poner(gameId, linea)
+        this.Guardar()
+        datos.Flush()
+
+    member _.Guardar() = escribirEn datos 0L (codificar cabecera)
+
+    member _.Sincronizar() =
+        match datos with
+        | :? FileStream as fs -> fs.Flush(true)
+        | _ -> datos.Flush()
+
+type JournalStore(path: string) =
+    let rutaIndice = path + ".idx"
+    //ultimo estado leido o escrito de cada partida y el byte de su linea; vale mientras la casilla
+    //del indice siga apuntando a esa linea en la misma generacion del diario
+    let cache = Dictionary<string, struct (int64 * GameState)>()
+    let mutable generacionCache = ""
+    let maxCache = 10000
+    let gate = obj ()
+
+    let conCandado f =
+        let rutaCandado = path + ".lock"
+        //FileShare.None funciona como candado entre procesos; se reintenta hasta ~10 s
+        let abrir () =
+            try Some (new FileStream(rutaCandado, FileMode.OpenOrCreate, FileAccess.ReadWrite, FileShare.None))
+            with :? IOException -> None
+        let mutable candado = abrir ()
+        let mutable intentos = 2000
+        while candado.IsNone && intentos > 0 do
+            Thread.Sleep 5
+            intentos <- intentos - 1
+            candado <- abrir ()
+        match candado with
+        | Some candado ->
+            use _candado = candado
+            f ()
+        | None -> raise (IOException(sprintf "%s esta ocupado por otro proceso" path))
+
+    let escribirSincronizado (destino: string) (bytes: byte[]) =
+        use fs = new FileStream(destino, FileMode.Create, FileAccess.Write, FileShare.ReadWrite)
+        fs.Write(bytes, 0, bytes.Length)
+        fs.Flush(true)
+
+    let recordar gameId (linea: int64) state =
+        if cache.Count >= maxCache then cache.Clear()
+        cache.[gameId] <- struct (linea, state)
+
+    //las partidas de los antiguos game_<id>.state del mismo directorio pasan al diario nuevo
+    let importarEstados () =
+        let dir = Path.GetDirectoryName(Path.GetFullPath path)
+        [ for archivo in Directory.EnumerateFiles(dir, "game_*.state") do
+            let gameId = Path.GetFileNameWithoutExtension(archivo).Substring("game_".Length)
+            match parseState (File.ReadAllText(archivo).Trim().Split('|')) with
+            | Ok state -> yield gameId, state
+            | Error motivo -> eprintfn "%s: no se importa (%s)" archivo motivo ]
+
+    //lee el diario completo, aceptando tambien los intentos sin <anterior> del formato previo
+    let releerTodo () =
+        let partidas = Dictionary<string, GameState>()
+        let bytes = File.ReadAllBytes path
+        //una linea sin '\n' final quedo a medio escribir
+        let fin = Array.LastIndexOf(bytes, byte '\n') + 1
+        Encoding.UTF8.GetString(bytes, 0, fin).Split('\n')
+        |> Array.iteri (fun i linea ->
+            let parts = linea.Split('|')
+            let invalida motivo = eprintfn "%s:%d: linea ignorada (%s)" path (i + 1) motivo
+            match parts.[0] with
+            | "" | "H" -> ()
+            | "S" when parts.Length >= 2 ->
+                match parseState parts.[2..] with
+                | Ok state -> partidas.[parts.[1]] <- state
+                | Error motivo -> invalida motivo
+            | "G" when (parts.Length = 3 || parts.Length = 4) && parts.[2].Length = 1 ->
+                match partidas.TryGetValue parts.[1] with
+                | true, state -> partidas.[parts.[1]] <- fst (makeGuess parts.[2].[0] state)
+                | _ -> invalida "intento sobre una partida desconocida"
+            | "D" when parts.Length = 2 -> partidas.Remove parts.[1] |> ignore
+            | _ -> invalida "registro desconocido")
+        [ for KeyValue (gameId, state) in partidas -> gameId, state ]
+
+    //reescribe el diario con una foto por partida y arma su indice
+    let escribirCompacto (partidas: (string * GameState) list) =
+        let generacion = Guid.NewGuid().ToString("N")
+        use texto = new MemoryStream()
+        let escribirLinea (linea: string) =
+            let bytes = Encoding.UTF8.GetBytes linea
+            texto.Write(bytes, 0, bytes.Length)
+        escribirLinea (sprintf "H|%s\n" generacion)
+        use tabla = new MemoryStream()
+        let indice = Indice.Crear(tabla, generacion, casillasPara partidas.Length)
+        for gameId, state in partidas do
+            if isValidGameId gameId then
+                indice.Poner(gameId, texto.Position)
+                escribirLinea (sprintf "S|%s|%s\n" gameId (formatState state))
+            else eprintfn "%s: partida '%s' descartada (identificador no valido)" path gameId
+        indice.Cabecera <- { indice.Cabecera with Fin = texto.Length; Lineas = indice.Cabecera.Vivas + 1 }
+        indice.Guardar()
+        escribirSincronizado (path + ".tmp") (texto.ToArray())
+        escribirSincronizado (rutaIndice + ".tmp") (tabla.ToArray())
+        //si el proceso muere entre los dos cambios de nombre las generaciones no coinciden y el
+        //indice se vuelve a armar
+        File.Move(path + ".tmp", path, true)
+        File.Move(rutaIndice + ".tmp", rutaIndice, true)
+        cache.Clear()
+        generacionCache <- generacion
+
+    let reconstruir () =
+        escribirCompacto (if File.Exists path then releerTodo () else importarEstados ())
+
+    let leerGeneracion (diario: FileStream) =
+        let buffer = Array.zeroCreate<byte> 64
+        let n = leerEn diario 0L buffer
+        let primera = Encoding.UTF8.GetString(buffer, 0, n).Split('\n').[0]
+        if primera.StartsWith "H|" then primera.Substring 2 else ""
+
+    //linea del diario que empieza en `pos`, sin el '\n'
+    let leerLinea (diario: FileStream) (pos: int64) =
+        let linea = new MemoryStream()
+        let buffer = Array.zeroCreate<byte> 256
+        let rec leer desde =
+            let n = leerEn diario desde buffer
+            match Array.IndexOf(buffer, byte '\n', 0, n) with
+            | -1 when n < buffer.Length -> raise (InvalidDataException(sprintf "%s: linea incompleta en el byte %d" path pos))
+            | -1 ->
+                linea.Write(buffer, 0, n)
+                leer (desde + int64 n)
+            | corte -> linea.Write(buffer, 0, corte)
+        leer pos
+        Encoding.UTF8.GetString(linea.ToArray())
+
+    //estado de la partida cuya ultima linea empieza en `pos`: se siguen los intentos hacia atras
+    //hasta la foto y se vuelven a aplicar
+    let estadoEn (diario: FileStream) (gameId: string) (pos: int64) =
+        let rec estado (pos: int64) =
+            let parts = (leerLinea diario pos).Split('|')
+            let invalida () = InvalidDataException(sprintf "%s: el byte %d no es una linea de '%s'" path pos gameId)
+            if parts.Length < 2 || parts.[1] <> gameId then raise (invalida ())
+            match parts.[0] with
+            | "S" ->
+                match parseState parts.[2..] with
+                | Ok state -> state
+                | Error _ -> raise (invalida ())
+            | "G" when parts.Length = 4 && parts.[2].Length = 1 ->
+                match Int64.TryParse parts.[3] with
+                | true, anterior when anterior >= 0L && anterior < pos -> fst (makeGuess parts.[2].[0] (estado anterior))
+                | _ -> raise (invalida ())
+            | _ -> raise (invalida ())
+        match cache.TryGetValue gameId with
+        | true, struct (linea, state) when linea = pos -> state
+        | _ ->
+            let state = estado pos
+            recordar gameId pos state
+            state
+
+    //incorpora al indice las lineas completas que otro proceso agrego despues de `Fin` sin llegar
+    //a actualizarlo
+    let ponerAlDia (diario: FileStream) (indice: Indice) =
+        let desde = indice.Cabecera.Fin
+        let nuevos = Array.zeroCreate<byte> (int (diario.Length - desde))
+        leerEn diario desde nuevos |> ignore
+        let fin = Array.LastIndexOf(nuevos, byte '\n') + 1
+        let mutable inicio = 0
+        let mutable lineas = 0
+        while inicio < fin do
+            let corte = Array.IndexOf(nuevos, byte '\n', inicio)
+            let pos = desde + int64 inicio
+            match Encoding.UTF8.GetString(nuevos, inicio, corte - inicio).Split('|') with
+            | [| "S"; gameId; _; _; _; _; _ |]
+            | [| "G"; gameId; _; _ |] -> indice.Poner(gameId, pos)
+            | [| "D"; gameId |] -> indice.Quitar gameId
+            //un intento sin <anterior> es del formato previo: hay que releer el diario entero
+            | [| "G"; _; _ |] -> raise (InvalidDataException(sprintf "%s: diario con el formato anterior" path))
+            | _ -> eprintfn "%s: linea ignorada en el byte %d (registro desconocido)" path pos
+            lineas <- lineas + 1
+            inicio <- corte + 1
+        indice.Cabecera <- { indice.Cabecera with Fin = desde + int64 fin; Lineas = indice.Cabecera.Lineas + lineas }
+        indice.Guardar()
+
+    //el indice del diario, al dia; None si falta o es de otra generacion del diario
+    let abrirIndice (diario: FileStream) (datos: FileStream) =
+        let buffer = Array.zeroCreate<byte> tamCabecera
+        let cabecera = if leerEn datos 0L buffer = tamCabecera then decodificar buffer else None
+        match cabecera with
+        | Some c when c.Casillas > 0
+                      && c.Generacion = leerGeneracion diario
+                      && c.Fin <= diario.Length
+                      && datos.Length >= int64 tamCabecera + int64 c.Casillas * int64 tamCasilla ->
+            if c.Generacion <> generacionCache then
+                cache.Clear()
+                generacionCache <- c.Generacion
+            let indice = Indice(datos, c)
+            if diario.Length > c.Fin then
+                ponerAlDia diario indice
+                indice.Sincronizar()
+            Some indice
+        | _ -> None
+
+    //ejecuta `f` con el diario y su indice abiertos; si el indice falta o no coincide con el
+    //diario se rearma leyendo el diario entero y se vuelve a intentar una vez
+    let rec conIndice reintentar f =
+        let resultado =
+            try
+                if not (File.Exists path) then reconstruir ()
+                use diario = new FileStream(path, FileMode.Open, FileAccess.ReadWrite, FileShare.ReadWrite)
+                use datos = new FileStream(rutaIndice, FileMode.OpenOrCreate, FileAccess.ReadWrite, FileShare.ReadWrite)
+                abrirIndice diario datos |> Option.map (f diario)
+            with :? InvalidDataException as e when reintentar ->
+                eprintfn "%s; se rearma el indice" e.Message
+                None
+        match resultado with
+        | Some r -> r
+        | None when reintentar ->
+            reconstruir ()
+            conIndice false f
+        | None -> raise (InvalidDataException(sprintf "%s: no se pudo armar el indice" path))
+
+    //agrega las lineas al final de lo que cubre el indice; si un proceso murio a mitad de una
+    //linea, esa linea incompleta se descarta para no pegarle la siguiente
+    let agregar (diario: FileStream) (desde: int64) (bytes: byte[]) =
+        if diario.Length > desde then diario.SetLength desde
+        escribirEn diario desde bytes
+        diario.Flush(true)
+
+    let validarId (gameId: string) =
+        if not (isValidGameId gameId) then
+            invalidArg "gameId" (sprintf "Identificador de partida no valido: '%s'" gameId)
+
+    new() =
+        let ruta = Environment.GetEnvironmentVariable "HANGMAN_JOURNAL"
+        JournalStore(if String.IsNullOrEmpty ruta then "sessions.journal" else ruta)
+
+    member _.Path = path
+
+    member _.Load(gameId: string) =
+        if not (isValidGameId gameId) then None
+        else
+            lock gate (fun () ->
+                conCandado (fun () ->
+                    conIndice true (fun diario indice ->
+                        indice.Buscar gameId |> Option.map (estadoEn diario gameId))))
+
+    //escribe varios cambios (Some = guardar, None = borrar) con un solo fsync del diario
+    member _.Write(cambios: (string * GameState option) list) =
+        cambios |> List.iter (fst >> validarId)
+        lock gate (fun () ->
+            conCandado (fun () ->
+                let compactar =
+                    conIndice true (fun diario indice ->
+                        let desde = indice.Cabecera.Fin
+                        //estado y linea de cada partida tocada; todas las lecturas se hacen antes
+                        //de escribir, asi un indice inconsistente se rearma sin haber escrito nada
+                        let actuales = Dictionary<string, struct (int64 * GameState) voption>()
+                        let actual gameId =
+                            match actuales.TryGetValue gameId with
+                            | true, v -> v
+                            | _ ->
+                                let v =
+                                    match indice.Buscar gameId with
+                                    | Some pos -> ValueSome (struct (pos, estadoEn diario gameId pos))
+                                    | None -> ValueNone
+                                actuales.[gameId] <- v
+                                v
+                        use texto = new MemoryStream()
+                        let mutable lineas = 0
+                        for gameId, cambio in cambios do
+                            let pos = desde + texto.Length
+                            let linea =
+                                match cambio, actual gameId with
+                                | None, ValueNone -> None
+                                | None, ValueSome _ -> Some (sprintf "D|%s\n" gameId)
+                                | Some state, ValueSome (struct (_, anterior)) when anterior = state -> None
+                                | Some state, ValueSome (struct (previa, anterior)) when isNextGuess anterior state ->
+                                    Some (sprintf "G|%s|%c|%d\n" gameId state.GuessedLetters.Head previa)
+                                | Some state, _ -> Some (sprintf "S|%s|%s\n" gameId (formatState state))
+                            match linea with
+                            | Some linea ->
+                                let bytes = Encoding.UTF8.GetBytes linea
+                                texto.Write(bytes, 0, bytes.Length)
+                                lineas <- lineas + 1
+                                actuales.[gameId] <-
+                                    match cambio with
+                                    | Some state -> ValueSome (struct (pos, state))
+                                    | None -> ValueNone
+                            | None -> ()
+                        if lineas = 0 then false
+                        else
+                            agregar diario desde (texto.ToArray())
+                            for KeyValue (gameId, actual) in actuales do
+                                match actual with
+                                | ValueSome (struct (pos, state)) when pos >= desde ->
+                                    indice.Poner(gameId, pos)
+                                    recordar gameId pos state
+                                | ValueSome _ -> ()
+                                | ValueNone ->
+                                    indice.Quitar gameId
+                                    cache.Remove gameId |> ignore
+                            indice.Cabecera <- { indice.Cabecera with
+                                                    Fin = desde + texto.Length
+                                                    Lineas = indice.Cabecera.Lineas + lineas }
+                            indice.Guardar()
+                            indice.Sincronizar()
+                            let c = indice.Cabecera
+                            c.Lineas > MinCompact && c.Lineas > CompactRatio * (c.Vivas + 1))
+                if compactar then
+                    conIndice true (fun diario indice ->
+                        [ for gameId, pos in indice.Partidas() -> gameId, estadoEn diario gameId pos ])
+                    |> escribirCompacto))
+
+    member this.Save gameId state = this.Write [ gameId, Some state ]
+
+    member this.Delete gameId = this.Write [ gameId, None ]
+
+    //identificadores de las partidas guardadas
+    member _.Sessions() =
+        lock gate (fun () ->
+            conCandado (fun () ->
+                conIndice true (fun _ indice -> indice.Partidas() |> List.map fst |> List.sort)))
@@ -0,0 +1,149 @@
+//Modo servidor: un solo proceso mantiene muchas partidas en memoria y atiende sus comandos
+//peticion:  {"id":1,"args":["guess","g1","a"]}  (una por linea)
+//respuesta: {"id":1,"ok":true,"result":{"v":2,"masked":"G _ _ _",...}}  con la misma respuesta que el modo por comando
+//las partidas se guardan en el diario (Journal.fs) en segundo plano
+
+module Hangman.Server
+
+open Hangman.GameState
+open Hangman.API
+open Hangman.Journal
+open System
+open System.Collections.Concurrent
+open System.Collections.Generic
+open System.IO
+open System.Net
+open System.Net.Sockets
+open System.Text
+open System.Text.Json
+open System.Threading.Tasks
+
+type PersistMsg =
+    | Save of string * GameState
+    | Delete of string
+    | Flush of AsyncReplyChannel<unit>
+
+//escribe a disco en segundo plano; si una partida cambia varias veces antes de que se
+//escriba, solo se guarda su ultimo estado, y cada tanda se escribe con un solo fsync
+let startPersister (journal: JournalStore) =
+    MailboxProcessor.Start(fun inbox ->
+        let pendientes = Dictionary<string, GameState option>()
+        let mutable respuestas = []
+        let agregar msg =
+            match msg with
+            | Save (gameId, state) -> pendientes.[gameId] <- Some state
+            | Delete gameId -> pendientes.[gameId] <- None
+            | Flush canal -> respuestas <- canal :: respuestas
+        let rec loop () = async {
+            let! msg = inbox.Receive()
+            agregar msg
+            while inbox.CurrentQueueLength > 0 do
+                let! siguiente = inbox.Receive()
+                agregar siguiente
+            if pendientes.Count > 0 then
+                let tanda = [ for KeyValue (gameId, state) in pendientes -> gameId, state ]
+                try journal.Write tanda
+                with _ ->
+                    //si la tanda falla se guarda cada partida por separado, para que una
+                    //sola que no se puede escribir no se lleve a las demas
+                    for cambio in tanda do
+                        try journal.Write [ cambio ]
+                        with ex -> eprintfn "No se pudo guardar la partida '%s': %s" (fst cambio) ex.Message
+            pendientes.Clear()
+            for canal in respuestas do canal.Reply()
+            respuestas <- []
+            return! loop () }
+        loop ())
+
+//partidas en memoria por gameId; las que no estan se buscan una vez en el diario
+type Sessions(journal: JournalStore) =
+    let persister = startPersister journal
+    let partidas = ConcurrentDictionary<string, GameState>()
+    let candados = ConcurrentDictionary<string, obj>()
+
+    let store = {
+        Load = fun gameId ->
+            match partidas.TryGetValue gameId with
+            | true, state -> Some state
+            | _ ->
+                match journal.Load gameId with
+                | Some state -> Some (partidas.GetOrAdd(gameId, state))
+                | None -> None
+        Save = fun gameId state ->
+            partidas.[gameId] <- state
+            persister.Post(Save (gameId, state))
+        Delete = fun gameId ->
+            partidas.TryRemove gameId |> ignore
+            persister.Post(Delete gameId)
+    }
+
+    member _.Count = partidas.Count
+
+    //los comandos de una misma partida se ejecutan de a uno; partidas distintas en paralelo
+    //["release", id] guarda la partida en el diario y la quita de memoria, para que otro
+    //proceso pueda atenderla sin que este conserve una copia vieja
+    member this.Execute(args: string[]) =
+        let gameId = if args.Length > 1 then args.[1] else "default"
+        lock (candados.GetOrAdd(gameId, fun _ -> obj ())) (fun () ->
+            match args with
+            | [| "release"; _ |] ->
+                match partidas.TryRemove gameId with
+                | true, state ->
+                    this.Flush()
+                    stateResponse state "partida liberada"
+                | _ -> errorResponse "No hay juego activo"
+            | _ -> executeWith store args)
+
+    member _.Flush() = persister.PostAndReply(Flush, 10000)
+
+let private responder (sesiones: Sessions) (line: string) =
+    let mutable id = JsonSerializer.SerializeToElement(null)
+    try
+        use doc = JsonDocument.Parse(line)
+        match doc.RootElement.TryGetProperty("id") with
+        | true, v -> id <- v.Clone()
+        | _ -> ()
+        let args =
+            doc.RootElement.GetProperty("args").EnumerateArray()
+            |> Seq.map (fun a -> a.GetString())
+            |> Seq.toArray
+        JsonSerializer.Serialize({| id = id; ok = true; result = sesiones.Execute args |}, jsonOptions)
+    with ex ->
+        JsonSerializer.Serialize({| id = id; ok = false; error = ex.Message |}, jsonOptions)
+
+//atiende una conexion (stdin/stdout o un socket) hasta que se cierra
+let private atender (sesiones: Sessions) (reader: TextReader) (writer: TextWriter) =
+    let mutable line = reader.ReadLine()
+    while not (isNull line) do
+        if not (String.IsNullOrWhiteSpace line) then
+            writer.WriteLine(responder sesiones line)
+            writer.Flush()
+        line <- reader.ReadLine()
+
+//serve            -> peticiones por stdin/stdout
+//serve --port N   -> peticiones por TCP en 127.0.0.1:N (0 = puerto libre)
+let serve (argv: string[]) =
+    Console.InputEncoding <- UTF8Encoding(false)
+    Console.OutputEncoding <- UTF8Encoding(false)
+    let sesiones = Sessions(JournalStore())
+    AppDomain.CurrentDomain.ProcessExit.Add(fun _ -> sesiones.Flush())
+    match Array.tryFindIndex ((=) "--port") argv with
+    | Some i when i + 1 < argv.Length ->
+        let listener = new TcpListener(IPAddress.Loopback, int argv.[i + 1])
+        listener.Start()
+        eprintfn "Escuchando en %O" listener.LocalEndpoint
+        while true do
+            let cliente = listener.AcceptTcpClient()
+            Task.Run(fun () ->
+                use cliente = cliente
+                use stream = cliente.GetStream()
+                use reader = new StreamReader(stream, UTF8Encoding(false))
+                use writer = new StreamWriter(stream, UTF8Encoding(false))
+                try atender sesiones reader writer
+                with ex -> eprintfn "Conexion cerrada: %s" ex.Message)
+            |> ignore
+        0
+    | _ ->
+        atender sesiones Console.In Console.Out
+        sesiones.Flush()
+        0
@@ -1,28 +1,158 @@
-//Extrae la palabra del archivo words.txt
+//Extrae las palabras del archivo words.txt
+//el archivo se lee una sola vez: todas las palabras quedan en un unico string y cada una
+//se ubica por su offset, con indices por longitud y por categoria para elegir en O(1)
 
 module Hangman.WordManager
 
 open System
+open System.Collections.Generic
 open System.IO
+open System.Text
 
 let randomGenerator = Random()
 
-//obtiene la palabra del archivo words.txt que sera utilizada para el juergo
-let getWord (rutaArchivo: string) : string option =
-    let palabras =
-        try
-            File.ReadAllLines(rutaArchivo)
-            |> Array.toList
-        with
-        | _ -> []
-
-    match palabras with
-    | [] -> None
-    | lista ->
-        let indice = randomGenerator.Next(List.length lista)
-        Some (List.item indice lista)
+//criterios para elegir una palabra; None = sin restriccion
+type WordFilter = {
+    MinLength: int option
+    MaxLength: int option
+    Category: string option
+}
+
+let noFilter = { MinLength = None; MaxLength = None; Category = None }
+
+//indices de las palabras de un grupo (todas o una categoria), separados por longitud
+type LengthIndex = {
+    Lengths: int[]
+    Words: int[][]
+}
+
+type WordStore = {
+    Text: string
+    Offsets: int[]
+    WordLengths: int[]
+    Categories: string[]
+    All: LengthIndex
+    ByCategory: Dictionary<string, LengthIndex>
+}
+
+let private buildLengthIndex (indices: seq<int>) (wordLengths: int[]) =
+    let grupos = SortedDictionary<int, ResizeArray<int>>()
+    for i in indices do
+        let len = wordLengths.[i]
+        match grupos.TryGetValue len with
+        | true, g -> g.Add i
+        | _ -> grupos.[len] <- ResizeArray [ i ]
+    { Lengths = Seq.toArray grupos.Keys
+      Words = grupos.Values |> Seq.map (fun g -> g.ToArray()) |> Seq.toArray }
+
+//normaliza una linea "palabra" o "palabra|categoria"; None si no es una palabra valida
+let parseLine (line: string) =
+    let limpia = line.Trim()
+    if limpia.Length = 0 || limpia.StartsWith "#" then None
+    else
+        let partes = limpia.Split('|')
+        let palabra = partes.[0].Trim().ToUpperInvariant()
+        let categoria = if partes.Length > 1 then partes.[1].Trim().ToLowerInvariant() else ""
+        //tambien se aceptan frases: letras separadas por espacios o guiones
+        let valido c = Char.IsLetter c || c = ' ' || c = '-'
+        if Seq.exists Char.IsLetter palabra && Seq.forall valido palabra then Some (palabra, categoria)
+        else None
+
+//lee el archivo en streaming; sirve para archivos de millones de lineas
+let loadStore (rutaArchivo: string) : WordStore =
+    let texto = StringBuilder()
+    let offsets = ResizeArray<int>()
+    let longitudes = ResizeArray<int>()
+    let categoriaDe = ResizeArray<string>()
+    for line in File.ReadLines(rutaArchivo) do
+        match parseLine line with
+        | Some (palabra, categoria) ->
+            offsets.Add texto.Length
+            longitudes.Add palabra.Length
+            categoriaDe.Add(String.Intern categoria)
+            texto.Append(palabra) |> ignore
+        | None -> ()
+    let wordLengths = longitudes.ToArray()
+    let categorias = categoriaDe.ToArray()
+    let miembros = Dictionary<string, ResizeArray<int>>()
+    categorias |> Array.iteri (fun i c ->
+        if c <> "" then
+            match miembros.TryGetValue c with
+            | true, m -> m.Add i
+            | _ -> miembros.[c] <- ResizeArray [ i ])
+    let porCategoria = Dictionary<string, LengthIndex>()
+    for KeyValue (c, m) in miembros do
+        porCategoria.[c] <- buildLengthIndex m wordLengths
+    { Text = texto.ToString()
+      Offsets = offsets.ToArray()
+      WordLengths = wordLengths
+      Categories = categorias
+      All = buildLengthIndex (seq { 0 .. wordLengths.Length - 1 }) wordLengths
+      ByCategory = porCategoria }
+
+let count (store: WordStore) = store.Offsets.Length
+
+let wordAt (store: WordStore) (i: int) =
+    store.Text.Substring(store.Offsets.[i], store.WordLengths.[i])
+
+let categories (store: WordStore) = store.ByCategory.Keys |> Seq.sort |> Seq.toList
+
+//elige una palabra al azar que cumpla el filtro; el costo depende de la cantidad de
+//longitudes distintas, no de la cantidad de palabras
+let randomWordWith (store: WordStore) (filtro: WordFilter) : string option =
+    let indice =
+        match filtro.Category with
+        | None -> Some store.All
+        | Some c ->
+            match store.ByCategory.TryGetValue(c.Trim().ToLowerInvariant()) with
+            | true, idx -> Some idx
+            | _ -> None
+    match indice with
+    | None -> None
+    | Some idx ->
+        let minLen = defaultArg filtro.MinLength 0
+        let maxLen = defaultArg filtro.MaxLength Int32.MaxValue
+        let grupos =
+            Array.zip idx.Lengths idx.Words
+            |> Array.filter (fun (len, _) -> len >= minLen && len <= maxLen)
+        let total = grupos |> Array.sumBy (fun (_, ws) -> ws.Length)
+        if total = 0 then None
+        else
+            let mutable k = randomGenerator.Next total
+            let mutable g = 0
+            while k >= (snd grupos.[g]).Length do
+                k <- k - (snd grupos.[g]).Length
+                g <- g + 1
+            Some (wordAt store (snd grupos.[g]).[k])
+
+//busca words.txt: HANGMAN_WORDS, el directorio actual o el proyecto junto al ejecutable
+let findWordsFile () =
+    let candidatos =
+        [ yield Environment.GetEnvironmentVariable "HANGMAN_WORDS"
+          yield "words.txt"
+          let mutable dir = DirectoryInfo(AppContext.BaseDirectory)
+          for _ in 1 .. 5 do
+              if not (isNull dir) then
+                  yield Path.Combine(dir.FullName, "words.txt")
+                  dir <- dir.Parent ]
+    candidatos |> List.tryFind (fun ruta -> not (String.IsNullOrEmpty ruta) && File.Exists ruta)
+
+//el almacen se carga la primera vez que se pide y se reutiliza en el resto del proceso
+let private almacen =
+    lazy (
+        match findWordsFile () with
+        | Some ruta ->
+            try Some (loadStore ruta) with _ -> None
+        | None -> None)
+
+let defaultStore () = almacen.Value
+
+let getRandomWordWith (filtro: WordFilter) =
+    match defaultStore () with
+    | Some store -> randomWordWith store filtro
+    | None -> None
 
 let getRandomWord () =
-    match getWord "words.txt" with
-    | Some palabra -> palabra.ToUpper()
-    | None -> "PROGRAMACION" 
\ No newline at end of file
+    match getRandomWordWith noFilter with
+    | Some palabra -> palabra
+    | None -> "PROGRAMACION"
@@ -8,7 +8,10 @@ open Hangman.API
 
 [<EntryPoint>]
 let main argv =
-    if argv.Length > 0 then
-        let result = executeCommand argv
-        printfn "%s" result
-    0
\ No newline at end of file
+    if argv.Length > 0 && argv.[0] = "serve" then
+        Hangman.Server.serve argv
+    else
+        if argv.Length > 0 then
+            let result = executeCommand argv
+            printfn "%s" (serializeResponse result)
+        0
\ No newline at end of file
@@ -1,114 +1,19 @@
-import subprocess
 import os
+import sys
 import tkinter as tk
 from tkinter import messagebox
 
-class HangmanClient:
-    def __init__(self, backend_path):
-        self.backend_path = backend_path
-        self.game_id = "default"
-        self.backend_available = self._check_backend()
-    
-    def _check_backend(self):
-        if not self.backend_path or not os.path.exists(self.backend_path):
-            return False
-        
-        try:
-            result = subprocess.run(
-                ["dotnet", "build"],
-                capture_output=True,
-                text=True,
-                cwd=self.backend_path,
-                timeout=10
-            )
-            return result.returncode == 0
-        except:
-            return False
-    
-    def run_fsharp_command(self, args):
-        if not self.backend_available:
-            return None
-            
-        command = ["dotnet", "run", "--"] + args
-        
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self.backend_path,
-                check=True,
-                timeout=5
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            print(f"Error ejecutando F#: {e}")
-            print(f"Stderr: {e.stderr}")
-            return None
-        except Exception as e:
-            print(f"Error general: {e}")
-            return None
-    
-    def start_game(self, word=None):
-        if not self.backend_available:
-            return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Backend no disponible"
-
-        
-        if word:
-            result = self.run_fsharp_command(["start", self.game_id, word])
-        else:
-            result = self.run_fsharp_command(["start", self.game_id])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 3:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                message = parts[2]
-                return masked_word, remaining_attempts, message
-        
-        return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Error comunicándose con el backend"
-    
-    def make_guess(self, letter):
-        
-        if not self.backend_available:
-            return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Backend F# no disponible"
-        
-        letter = letter.upper()
-        
-        if len(letter) != 1 or not letter.isalpha():
-            return self.get_current_state()[0], self.get_current_state()[1], "Ingresa una sola letra"
-        
-        result = self.run_fsharp_command(["guess", self.game_id, letter])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 3:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                message = parts[2]
-                return masked_word, remaining_attempts, message
-        
-        return self.get_current_state()[0], self.get_current_state()[1], " Error comunicándose con el backend"
-    
-    def get_current_state(self):
-        result = self.run_fsharp_command(["state", self.game_id])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 3:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                message = parts[2]
-                return masked_word, remaining_attempts, message
-        
-        return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Error obteniendo el estado del juego"
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from compartido.dispatcher import Dispatcher
+from hangman_client import HangmanClient
 
 class AhorcadoScreen:
     def __init__(self, root, volver_callback):
         self.root = root
         self.volver_callback = volver_callback
         self.client = None
+        # Los comandos de la partida van de a uno y en orden
+        self.dispatcher = Dispatcher(root, serial=True)
         self.root.title("Juego del Ahorcado - Proyecto Lenguajes")
         self.root.geometry("650x750")
         self.root.configure(bg='#2c3e50')
@@ -178,6 +83,12 @@ class AhorcadoScreen:
                                         activebackground='#d35400', cursor='hand2', width=12)
         self.new_game_button.pack(side=tk.LEFT, padx=5)
 
+        self.hint_button = tk.Button(button_frame, text="PISTA", 
+                                    command=self.ask_hint,
+                                    font=self.button_font, bg='#8e44ad', fg='white',
+                                    activebackground='#71368a', cursor='hand2', width=12)
+        self.hint_button.pack(side=tk.LEFT, padx=5)
+
         self.message_label = tk.Label(self.root, text="", font=self.message_font, 
                                     bg='#2c3e50', fg='#f39c12', wraplength=500, justify='center')
         self.message_label.pack(pady=15)
@@ -189,39 +100,56 @@ class AhorcadoScreen:
         backend_path = os.path.join(os.path.dirname(__file__), "..", "backend")
         
         if os.path.exists(backend_path):
-            self.client = HangmanClient(backend_path)
-            if self.client.backend_available:
-                self.new_game()
-                self.message_label.config(text="Backend F# conectado correctamente. ¡Comienza a jugar!", fg='#27ae60')
-            else:
-                self.message_label.config(text="⚠️ Backend F# no disponible. Compilando...", fg='#f39c12')
-                self.root.after(2000, self.retry_backend)
+            self.message_label.config(text="Conectando con el backend F#...", fg='#f39c12')
+            self.dispatcher.submit("connect", HangmanClient,
+                                   on_done=self._on_client_ready, on_error=self._on_backend_error)
         else:
             self.message_label.config(text="❌ No se encontró el backend F#", fg='#e74c3c')
 
+    def _on_client_ready(self, client):
+        self.client = client
+        if self.client.backend_available:
+            self.new_game()
+            self.message_label.config(text="Backend F# conectado correctamente. ¡Comienza a jugar!", fg='#27ae60')
+        else:
+            self.message_label.config(text="⚠️ Backend F# no disponible. Compilando...", fg='#f39c12')
+            self.root.after(2000, self.retry_backend)
+
     def retry_backend(self):
         if self.client:
-            self.client.backend_available = self.client._check_backend()
-            if self.client.backend_available:
-                self.new_game()
-                self.message_label.config(text="✅ Backend F# ahora disponible. ¡Comienza a jugar!", fg='#27ae60')
-            else:
-                self.message_label.config(text="❌ Backend F# aún no disponible", fg='#e74c3c')
+            self.dispatcher.submit("connect", self.client._check_backend,
+                                   on_done=self._on_retry_done, on_error=self._on_backend_error)
+
+    def _on_retry_done(self, available):
+        self.client.backend_available = available
+        if self.client.backend_available:
+            self.new_game()
+            self.message_label.config(text="✅ Backend F# ahora disponible. ¡Comienza a jugar!", fg='#27ae60')
+        else:
+            self.message_label.config(text="❌ Backend F# aún no disponible", fg='#e74c3c')
+
+    def _on_backend_error(self, error):
+        self.message_label.config(text=f"Error comunicándose con el backend: {error}", fg='#e74c3c')
 
     def new_game(self):
         if not self.client or not self.client.backend_available:
             self.message_label.config(text="❌ Backend no disponible", fg='#e74c3c')
             return
 
-        try:
-            masked_word, attempts, message = self.client.start_game()
-            self.update_display(masked_word, attempts, message.strip())
-            self.letter_entry.config(state='normal')
-            self.guess_button.config(state='normal')
-            self.letter_entry.focus()
-            
-        except Exception as e:
-            self.message_label.config(text=f"Error iniciando juego: {str(e)}", fg='#e74c3c')
+        # Los intentos que sigan en curso pertenecen a la partida anterior
+        self.dispatcher.new_generation()
+        self.dispatcher.submit("start", self.client.start_game,
+                               on_done=self._on_game_started, on_error=self._on_start_error)
+
+    def _on_game_started(self, view):
+        self.update_display(view)
+        self.letter_entry.config(state='normal')
+        self.guess_button.config(state='normal')
+        self.hint_button.config(state='normal')
+        self.letter_entry.focus()
+
+    def _on_start_error(self, error):
+        self.message_label.config(text=f"Error iniciando juego: {str(error)}", fg='#e74c3c')
 
     def make_guess(self):
         if not self.client or not self.client.backend_available:
@@ -239,35 +167,57 @@ class AhorcadoScreen:
             self.letter_entry.delete(0, tk.END)
             return
 
-        try:
-            masked_word, attempts, message = self.client.make_guess(letter)
-            self.update_display(masked_word, attempts, message.strip())
-            self.letter_entry.delete(0, tk.END)
-            
-            if "ganaste" in message.lower() or "perdiste" in message.lower():
-                self.letter_entry.config(state='disabled')
-                self.guess_button.config(state='disabled')
-                
-        except Exception as e:
-            self.message_label.config(text=f"Error procesando intento: {str(e)}", fg='#e74c3c')
-
-    def update_display(self, masked_word, attempts, message):
-        self.word_label.config(text=masked_word)
-        self.attempts_label.config(text=f"Intentos restantes: {attempts}")
+        # La entrada se libera enseguida; repetir la misma letra mientras viaja no la reenvia
+        self.letter_entry.delete(0, tk.END)
+        self.dispatcher.submit(("guess", letter), self.client.make_guess, letter,
+                               on_done=self._on_guess_done, on_error=self._on_guess_error)
+
+    def _on_guess_done(self, view):
+        self.update_display(view)
+        
+        if view.over:
+            # Descarta los intentos que siguen en cola de la partida terminada
+            self.dispatcher.new_generation()
+            self.letter_entry.config(state='disabled')
+            self.guess_button.config(state='disabled')
+            self.hint_button.config(state='disabled')
+
+    def _on_guess_error(self, error):
+        self.message_label.config(text=f"Error procesando intento: {str(error)}", fg='#e74c3c')
+
+    def ask_hint(self):
+        if not self.client or not self.client.backend_available:
+            self.message_label.config(text="❌ Backend no disponible", fg='#e74c3c')
+            return
+
+        self.dispatcher.submit("hint", self.client.hint,
+                               on_done=self._on_hint_done, on_error=self._on_hint_error)
+
+    def _on_hint_done(self, view):
+        self.update_display(view)
+        if view.hint:
+            self.message_label.config(text=f"💡 {view.message.strip()}", fg='#9b59b6')
+
+    def _on_hint_error(self, error):
+        self.message_label.config(text=f"Error pidiendo pista: {str(error)}", fg='#e74c3c')
+
+    def update_display(self, view):
+        self.word_label.config(text=view.masked)
+        self.attempts_label.config(text=f"Intentos restantes: {view.remaining}")
         
-        if "ganaste" in message.lower():
+        message = view.message.strip()
+        if view.status == "won":
             self.message_label.config(text=f"🎉 {message}", fg='#27ae60')
-        elif "perdiste" in message.lower():
+        elif view.status == "lost":
             self.message_label.config(text=f"💀 {message}", fg='#e74c3c')
-        elif "incorrecto" in message.lower() or "incorrecta" in message.lower():
+        elif view.status == "error" or "incorrecta" in message.lower():
             self.message_label.config(text=f"❌ {message}", fg='#e74c3c')
         elif "correcto" in message.lower() or "correcta" in message.lower():
             self.message_label.config(text=f"✅ {message}", fg='#27ae60')
         else:
             self.message_label.config(text=message, fg='#f39c12')
         
-        wrong_attempts = 6 - attempts
-        self.draw_hangman(wrong_attempts)
+        self.draw_hangman(view.wrong_attempts)
 
     def draw_hangman(self, wrong_attempts):
         self.hangman_canvas.delete("all")
@@ -304,5 +254,6 @@ class AhorcadoScreen:
             self.hangman_canvas.create_arc(172, 95, 188, 105, start=0, extent=180, width=2, outline='#e74c3c')
 
     def volver_al_menu(self):
+        self.dispatcher.close()
         if self.volver_callback:
             self.volver_callback()
\ No newline at end of file
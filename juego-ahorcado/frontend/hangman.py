@@ -1,126 +1,7 @@
-import subprocess
-import os
 import tkinter as tk
 from tkinter import messagebox
 
-class HangmanClient:
-    def __init__(self, backend_path):
-        self.backend_path = backend_path
-        self.game_id = "default"
-        self.backend_available = self._check_backend()
-    
-    def _check_backend(self):
-        """Verifica si el backend F# está disponible"""
-        if not self.backend_path or not os.path.exists(self.backend_path):
-            return False
-        
-        try:
-            # Intentar compilar el proyecto
-            result = subprocess.run(
-                ["dotnet", "build"],
-                capture_output=True,
-                text=True,
-                cwd=self.backend_path,
-                timeout=10
-            )
-            return result.returncode == 0
-        except:
-            return False
-    
-    def run_fsharp_command(self, args):
-        """Ejecuta un comando en F# y retorna el resultado"""
-        if not self.backend_available:
-            return None
-            
-        command = ["dotnet", "run", "--"] + args
-        
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=self.backend_path,
-                check=True,
-                timeout=5
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            print(f"Error ejecutando F#: {e}")
-            print(f"Stderr: {e.stderr}")
-            return None
-        except Exception as e:
-            print(f"Error general: {e}")
-            return None
-    
-    def start_game(self, word=None):
-        """Inicia un nuevo juego"""
-        if not self.backend_available:
-            return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Backend no disponible"
-
-        
-        if word:
-            result = self.run_fsharp_command(["start", self.game_id, word])
-        else:
-            result = self.run_fsharp_command(["start", self.game_id])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 3:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                message = parts[2]
-                return masked_word, remaining_attempts, message
-        
-        return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Error comunicándose con el backend"
-    
-    def make_guess(self, letter):
-        """Realiza un intento de adivinar una letra usando F#"""
-        
-        if not self.backend_available:
-            return "_ _ _ _ _ _ _ _ _ _ _ _", 6, " Backend F# no disponible"
-        
-        letter = letter.upper()
-        
-        if len(letter) != 1 or not letter.isalpha():
-            return self.get_current_state()[0], self.get_current_state()[1], "Ingresa una sola letra"
-        
-        # Usar el comando "guess" de F# con el gameId correcto
-        result = self.run_fsharp_command(["guess", self.game_id, letter])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 3:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                message = parts[2]
-                return masked_word, remaining_attempts, message
-        
-        return self.get_current_state()[0], self.get_current_state()[1], " Error comunicándose con el backend"
-    
-    def get_current_state(self):
-        """Obtiene el estado actual del juego desde el backend"""
-        if not self.backend_available:
-            return "_ _ _ _ _ _ _ _ _ _ _ _", 6, []
-        
-        result = self.run_fsharp_command(["status", self.game_id])
-        
-        if result and "|" in result:
-            parts = result.split("|")
-            if len(parts) >= 5:
-                masked_word = parts[0]
-                remaining_attempts = int(parts[1])
-                incorrect_letters = parts[2].split(",") if parts[2] else []
-                return masked_word, remaining_attempts, incorrect_letters
-        
-        return "_ _ _ _ _ _ _ _ _ _ _ _", 6, []
-    
-    def get_guessed_letters_text(self):
-        """Retorna las letras adivinadas para mostrar"""
-        if not self.backend_available:
-            return "Backend no disponible"
-        
-        _, _, incorrect_letters = self.get_current_state()
-        return ", ".join(sorted(incorrect_letters)) if incorrect_letters else "Ninguna"
+from hangman_client import HangmanClient
 
 class HangmanGame:
     def __init__(self, window):
@@ -205,9 +86,7 @@ class HangmanGame:
     
     def initialize_game(self):
         """Inicializa el juego"""
-        backend_path = r"juego-ahorcado\backend"
-        
-        self.client = HangmanClient(backend_path)
+        self.client = HangmanClient()
 
         if self.client.backend_available:
             self.backend_status.config(text="Backend F# fucnionao", fg='#27ae60')
@@ -219,9 +98,9 @@ class HangmanGame:
     def reset_game(self):
         """Reinicia el juego"""
         if self.client:
-            masked_word, remaining_attempts, message = self.client.start_game()
-            self.update_display(masked_word, remaining_attempts, message)
+            self.update_display(self.client.start_game())
             self.letter_entry.config(state='normal')
+            self.guess_button.config(state='normal')
             self.letter_entry.delete(0, tk.END)
             self.letter_entry.focus()
     
@@ -239,32 +118,33 @@ class HangmanGame:
             self.letter_entry.delete(0, tk.END)
             return
         
-        masked_word, remaining_attempts, message = self.client.make_guess(letter)
-        self.update_display(masked_word, remaining_attempts, message)
+        view = self.client.make_guess(letter)
+        self.update_display(view)
         self.letter_entry.delete(0, tk.END)
 
-        if "Ganaste" in message or "Perdiste" in message:
-            if "Ganaste" in message:
-                messagebox.showinfo("¡Felicidades!", message)
-            else:
-                messagebox.showwarning("Game Over", message)
+        if view.over:
+            self.letter_entry.config(state='disabled')
+            self.guess_button.config(state='disabled')
+
+        if view.status == "won":
+            messagebox.showinfo("¡Felicidades!", view.message)
+        elif view.status == "lost":
+            messagebox.showwarning("Game Over", view.message)
     
-    def update_display(self, masked_word, remaining_attempts, message):
-        """Actualiza toda la interfaz"""
+    def update_display(self, view):
+        """Actualiza toda la interfaz con el estado devuelto por el backend"""
         
-        self.word_label.config(text=masked_word)
+        self.word_label.config(text=view.masked)
 
-        self.attempts_label.config(text=f"Intentos restantes: {remaining_attempts}")
+        self.attempts_label.config(text=f"Intentos restantes: {view.remaining}")
 
+        message = view.message
         color = '#27ae60' if "Bien" in message or "Ganaste" in message else '#e74c3c' if "incorrecta" in message.lower() or "Perdiste" in message else '#f39c12'
         self.message_label.config(text=message, fg=color)
 
-        if self.client:
-            guessed_text = self.client.get_guessed_letters_text()
-            self.guessed_label.config(text=f"Letras incorrectas: {guessed_text}")
+        self.guessed_label.config(text=f"Letras incorrectas: {view.incorrect_text()}")
 
-        wrong_attempts = 6 - remaining_attempts
-        self.draw_hangman(wrong_attempts)
+        self.draw_hangman(view.wrong_attempts)
     
     def draw_hangman(self, wrong_attempts):
         """Dibuja el estado del ahorcado"""
@@ -0,0 +1,128 @@
+"""Cliente del backend F# del ahorcado, compartido por la pantalla del menu y la version standalone.
+
+Todos los comandos responden con el estado completo de la partida:
+
+    {"v": 2, "masked": "G _ _ _", "remaining": 5, "incorrect": ["X"],
+     "status": "playing", "message": "...", "word": "GATO"}
+
+("word" solo llega cuando la partida termino; "hint" solo en la respuesta de
+`hint`), asi que cada accion del jugador
+cuesta exactamente una llamada al backend. En "masked" las posiciones van
+separadas por MASK_SEPARATOR (U+2002), asi un espacio de una frase se
+distingue de la separacion entre letras.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from compartido import launcher
+import hangman_server
+
+PROTOCOL_VERSION = 2
+MAX_ATTEMPTS = 6
+MASK_SEPARATOR = "\u2002"
+UNKNOWN_WORD = MASK_SEPARATOR.join("_" * 12)
+
+
+class GameView:
+    """Estado de la partida tal como lo devuelve el backend."""
+
+    __slots__ = ("masked", "remaining", "incorrect", "status", "message", "word", "hint")
+
+    def __init__(self, masked=UNKNOWN_WORD, remaining=MAX_ATTEMPTS, incorrect=(),
+                 status="playing", message="", word=None, hint=None):
+        self.masked = masked
+        self.remaining = remaining
+        self.incorrect = list(incorrect)
+        self.status = status
+        self.message = message
+        self.word = word
+        self.hint = hint
+
+    @classmethod
+    def from_response(cls, msg):
+        return cls(msg["masked"], msg["remaining"], msg.get("incorrect", ()),
+                   msg["status"], msg.get("message", ""), msg.get("word"), msg.get("hint"))
+
+    @classmethod
+    def error(cls, message, previous=None):
+        # Ante un error se conserva lo ultimo que se mostro
+        view = previous.with_message(message) if previous else cls(message=message)
+        view.status = "error"
+        return view
+
+    def with_message(self, message):
+        return GameView(self.masked, self.remaining, self.incorrect, self.status, message, self.word,
+                        self.hint)
+
+    @property
+    def over(self):
+        return self.status in ("won", "lost")
+
+    @property
+    def wrong_attempts(self):
+        return MAX_ATTEMPTS - self.remaining
+
+    def incorrect_text(self):
+        return ", ".join(sorted(self.incorrect)) if self.incorrect else "Ninguna"
+
+
+class HangmanClient:
+    def __init__(self, game_id="default", server=None):
+        """`server` es cualquier objeto con `request(args)`; por defecto el proceso compartido."""
+        self.game_id = game_id
+        self._server = server
+        self.state = GameView()
+        self.backend_available = self._check_backend()
+
+    def _check_backend(self):
+        """Verifica si el backend F# está disponible"""
+        # Usa el .dll ya compilado; solo se compila si cambiaron los fuentes F#
+        try:
+            launcher.ensure_built(launcher.AHORCADO)
+            # Un solo proceso `serve` atiende todos los comandos de la partida
+            if self._server is None:
+                self._server = hangman_server.shared()
+            return True
+        except RuntimeError as e:
+            print(f"Backend F# no disponible: {e}")
+            return False
+
+    def _call(self, *args):
+        if not self.backend_available:
+            return GameView.error("Backend F# no disponible", self.state)
+        try:
+            msg = self._server.request(args)
+        except (RuntimeError, OSError) as e:
+            return GameView.error(f"Error comunicándose con el backend: {e}", self.state)
+        if not isinstance(msg, dict) or msg.get("v") != PROTOCOL_VERSION:
+            return GameView.error("Versión del backend no soportada", self.state)
+        view = GameView.from_response(msg)
+        if view.status != "error":
+            self.state = view
+        return view
+
+    def start_game(self, word=None):
+        """Inicia un nuevo juego"""
+        if word:
+            return self._call("start", self.game_id, word)
+        return self._call("start", self.game_id)
+
+    def make_guess(self, letter):
+        """Realiza un intento de adivinar una letra"""
+        # Intentos que quedaron en cola cuando la partida ya habia terminado
+        if self.state.over:
+            return self.state.with_message("La partida ya terminó")
+        letter = letter.strip().upper()
+        if len(letter) != 1 or not letter.isalpha():
+            return self.state.with_message("Ingresa una sola letra")
+        return self._call("guess", self.game_id, letter)
+
+    def get_current_state(self):
+        """Obtiene el estado actual del juego desde el backend"""
+        return self._call("status", self.game_id)
+
+    def hint(self):
+        """Pide una letra sugerida; no gasta intentos"""
+        return self._call("hint", self.game_id)
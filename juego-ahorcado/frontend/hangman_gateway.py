@@ -0,0 +1,235 @@
+"""Varios procesos `serve` del ahorcado repartidos entre los nucleos.
+
+Cada partida se atiende siempre en el mismo worker, elegido por hashing
+consistente sobre su gameId: cada worker ocupa varios puntos de un anillo y la
+partida va al primer punto que sigue a su hash. Al agregar o quitar un worker
+solo cambian de dueno las partidas de los tramos afectados; el worker anterior
+las libera (`release`: las guarda en el diario y las olvida) y el nuevo las lee
+del diario en su primer comando.
+
+`HangmanGateway.request(args)` tiene el mismo contrato que
+`HangmanServer.request`, asi que se puede pasar a `HangmanClient(server=...)`.
+"""
+
+import bisect
+import hashlib
+import itertools
+import os
+import threading
+import time
+
+import hangman_server
+
+
+def _hash(key):
+    return int.from_bytes(hashlib.sha1(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    def __init__(self, nodes=(), replicas=64):
+        self.replicas = replicas
+        self._points = []
+        self._owners = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            at = bisect.bisect(self._points, point)
+            self._points.insert(at, point)
+            self._owners.insert(at, node)
+
+    def remove(self, node):
+        keep = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in keep]
+        self._owners = [o for _, o in keep]
+
+    def owner(self, key):
+        if not self._points:
+            raise LookupError("No hay workers en el anillo")
+        at = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[at]
+
+    def __len__(self):
+        return len(set(self._owners))
+
+
+class Worker:
+    """Un proceso `serve` con sus contadores."""
+
+    def __init__(self, name, server):
+        self.name = name
+        self.server = server
+        self.sessions = set()
+        self.queue = 0
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def track(self, game_id):
+        with self._lock:
+            self.sessions.add(game_id)
+
+    def request(self, args):
+        with self._lock:
+            self.queue += 1
+        start = time.perf_counter()
+        try:
+            return self.server.request(args)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.queue -= 1
+                self.requests += 1
+                self.total_ms += elapsed
+                self.last_ms = elapsed
+                self.max_ms = max(self.max_ms, elapsed)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "worker": self.name,
+                "sessions": len(self.sessions),
+                "queue": self.queue,
+                "requests": self.requests,
+                "errors": self.errors,
+                "avg_ms": self.total_ms / self.requests if self.requests else 0.0,
+                "last_ms": self.last_ms,
+                "max_ms": self.max_ms,
+            }
+
+
+class HangmanGateway:
+    def __init__(self, workers=None, server_factory=hangman_server.HangmanServer, replicas=64):
+        self._server_factory = server_factory
+        self._ring = HashRing(replicas=replicas)
+        self._workers = {}
+        self._names = itertools.count(1)
+        # Los comandos comparten el pool; agregar o quitar workers espera a que terminen
+        self._cond = threading.Condition()
+        self._active = 0
+        self._rebalancing = False
+        for _ in range(workers or os.cpu_count() or 1):
+            self._add(self._new_worker())
+
+    def _new_worker(self):
+        return Worker(f"w{next(self._names)}", self._server_factory())
+
+    def _add(self, worker):
+        self._workers[worker.name] = worker
+        self._ring.add(worker.name)
+
+    def _enter(self):
+        with self._cond:
+            while self._rebalancing:
+                self._cond.wait()
+            self._active += 1
+
+    def _leave(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _exclusive(self):
+        # Bloquea comandos nuevos y espera a que terminen los que estan en curso
+        self._cond.acquire()
+        while self._rebalancing:
+            self._cond.wait()
+        self._rebalancing = True
+        while self._active:
+            self._cond.wait()
+        self._cond.release()
+
+    def _release_exclusive(self):
+        with self._cond:
+            self._rebalancing = False
+            self._cond.notify_all()
+
+    def request(self, args):
+        """Envia el comando al worker duenio de la partida (args[1])."""
+        game_id = args[1] if len(args) > 1 else "default"
+        self._enter()
+        try:
+            worker = self._workers[self._ring.owner(game_id)]
+            worker.track(game_id)
+            return worker.request(args)
+        finally:
+            self._leave()
+
+    def _move_sessions(self, workers):
+        """Libera en el worker anterior las partidas que cambiaron de duenio.
+
+        Primero se arma la lista completa y se liberan todas; `sessions` solo se
+        actualiza si ninguna liberacion fallo. Si una falla, la excepcion sigue y
+        quien llamo deja el anillo como estaba.
+        """
+        moves = []
+        for worker in workers:
+            for game_id in list(worker.sessions):
+                owner = self._ring.owner(game_id)
+                if owner != worker.name:
+                    moves.append((worker, game_id, owner))
+        for worker, game_id, _ in moves:
+            worker.request(["release", game_id])
+        for worker, game_id, owner in moves:
+            worker.sessions.discard(game_id)
+            self._workers[owner].sessions.add(game_id)
+        return len(moves)
+
+    def add_worker(self):
+        """Agrega un worker y mueve a el las partidas que ahora le tocan; devuelve su nombre."""
+        worker = self._new_worker()
+        self._exclusive()
+        try:
+            self._add(worker)
+            try:
+                self._move_sessions([w for w in self._workers.values() if w is not worker])
+            except Exception:
+                # Vuelven a su worker de siempre; las que ya se liberaron se leen del diario
+                del self._workers[worker.name]
+                self._ring.remove(worker.name)
+                worker.server.close()
+                raise
+        finally:
+            self._release_exclusive()
+        return worker.name
+
+    def remove_worker(self, name):
+        """Quita el worker; sus partidas pasan a los demas. Devuelve cuantas se movieron."""
+        self._exclusive()
+        try:
+            if len(self._workers) == 1:
+                raise ValueError("No se puede quitar el ultimo worker")
+            worker = self._workers.pop(name)
+            self._ring.remove(name)
+            try:
+                moved = self._move_sessions([worker])
+            except Exception:
+                # El worker sigue atendiendo todas sus partidas, tambien las ya liberadas
+                self._add(worker)
+                raise
+        finally:
+            self._release_exclusive()
+        # Al cerrar stdin el proceso termina de guardar lo pendiente
+        worker.server.close()
+        return moved
+
+    @property
+    def workers(self):
+        return list(self._workers)
+
+    def stats(self):
+        """Contadores por worker: partidas, cola, pedidos, errores y latencias en ms."""
+        return [worker.stats() for worker in list(self._workers.values())]
+
+    def close(self):
+        for worker in list(self._workers.values()):
+            worker.server.close()
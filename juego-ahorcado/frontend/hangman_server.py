@@ -0,0 +1,48 @@
+"""Proceso `serve` del backend del ahorcado compartido por todas las partidas.
+
+En vez de lanzar .NET en cada comando (que ademas lee y escribe game_<id>.state
+cada vez) se mantiene un solo proceso que guarda las partidas en memoria.
+Cada comando viaja como {"id": n, "args": [...]} en una linea y la respuesta
+trae el mismo JSON que imprime el modo por linea de comandos.
+El arranque, los reintentos y el cierre son los de compartido/line_process.py.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from compartido import launcher
+from compartido.line_process import LineProcess
+
+
+class HangmanServer(LineProcess):
+    def __init__(self, command_factory=None, cwd=None):
+        # Los archivos de estado se guardan relativos al directorio de trabajo del backend
+        super().__init__(command_factory or (lambda: launcher.command(launcher.AHORCADO, "serve")),
+                         cwd=cwd or launcher.AHORCADO.project_dir,
+                         name="El backend del ahorcado", error_prefix="Backend error")
+
+    def request(self, args):
+        """Ejecuta el comando (lista de argumentos) y devuelve su respuesta ya decodificada."""
+        msg, _ = self.exchange(lambda request_id: json.dumps(
+            {"id": request_id, "args": list(args)}, ensure_ascii=False))
+        if not msg.get("ok"):
+            raise RuntimeError(f"Backend error: {msg.get('error')}")
+        return msg["result"]
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared():
+    """Servidor unico del proceso, creado la primera vez que se pide."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HangmanServer()
+            atexit.register(_shared.close)
+        return _shared
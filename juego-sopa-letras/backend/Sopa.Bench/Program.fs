@@ -0,0 +1,280 @@
+﻿open System
+open System.Collections.Generic
+open System.Diagnostics
+open System.IO
+open System.Text.Json
+open Sopa.Core
+
+// Matriz de casos y cuánto medir cada uno
+type Config =
+    { ops:string[]
+      sizes:int[]
+      wordCounts:int[]
+      seeds:int[]
+      iterations:int
+      warmup:int
+      budgetMs:float }
+
+type Resultado =
+    { op:string
+      size:int
+      words:int
+      samples:int
+      opsPerSec:float
+      meanMs:float
+      p50Ms:float
+      p99Ms:float
+      allocBytesPerOp:float }
+
+let porDefecto =
+    { ops = [| "generate"; "solve"; "validate" |]
+      sizes = [| 10; 15; 20; 50; 100; 200; 500 |]
+      wordCounts = [| 2; 10; 50; 200; 1000 |]
+      seeds = [| 1; 2; 3 |]
+      iterations = 20
+      warmup = 5
+      budgetMs = 2000.0 }
+
+let rapido =
+    { porDefecto with
+        sizes = [| 10; 20; 50 |]
+        wordCounts = [| 2; 10; 50 |]
+        seeds = [| 1 |]
+        iterations = 10
+        budgetMs = 500.0 }
+
+// Palabras sintéticas reproducibles: mismas (seed, cantidad, tamaño) dan siempre las mismas
+let palabras (seed:int) (cantidad:int) (size:int) =
+    let rnd = Random(seed * 7919 + cantidad)
+    let vistas = HashSet<string>()
+    let maxLen = max 3 (min 10 size)
+    while vistas.Count < cantidad do
+        let len = rnd.Next(3, maxLen + 1)
+        vistas.Add(String(Array.init len (fun _ -> char (int 'A' + rnd.Next 26)))) |> ignore
+    Seq.toList vistas
+
+// Prepara la operación a medir para una semilla; la entrada se construye fuera de la medición.
+// Devuelve la acción y cuántas llamadas a la operación hace cada ejecución.
+let preparar (op:string) (size:int) (cantidad:int) (seed:int) : (unit -> unit) * int =
+    let words = palabras seed cantidad size
+    match op with
+    | "generate" ->
+        (fun () -> Generator.generate seed size words |> ignore), 1
+    | "solve" ->
+        let board, _ = Generator.generate seed size words
+        (fun () -> Solver.solve board words |> ignore), 1
+    | "validate" ->
+        // cada colocación se valida en su sentido y en el contrario, más un trazo que no coincide
+        let board, placements = Generator.generate seed size words
+        let rays =
+            [| for p in placements do
+                 let r = p.ray
+                 yield r
+                 yield { origin = r.origin + (r.length - 1) * Board.step board r.dir; dir = 7 - r.dir; length = r.length }
+                 yield { r with length = 1 } |]
+        // una validación dura menos de un microsegundo: se repite para que cada muestra sea medible
+        let repeticiones = max 1 (1000 / max 1 rays.Length)
+        (fun () ->
+            for _ in 1 .. repeticiones do
+                for ray in rays do Validator.validate board words ray |> ignore), max 1 (rays.Length * repeticiones)
+    | _ -> failwithf "Operación desconocida: %s" op
+
+let percentil (ordenadas:float[]) (p:float) =
+    if ordenadas.Length = 0 then 0.0
+    else ordenadas.[min (ordenadas.Length - 1) (int (ceil (p * float ordenadas.Length)) - 1 |> max 0)]
+
+let medir (cfg:Config) (op:string) (size:int) (cantidad:int) : Resultado =
+    let acciones = cfg.seeds |> Array.map (preparar op size cantidad)
+    for _ in 1 .. cfg.warmup do
+        for accion, _ in acciones do accion ()
+    GC.Collect()
+    GC.WaitForPendingFinalizers()
+    // una muestra = latencia por llamada de una ejecución; los bytes se suman para todas
+    let muestras = ResizeArray<float>()
+    let mutable bytes = 0L
+    let mutable llamadas = 0L
+    let mutable segundos = 0.0
+    let total = Stopwatch.StartNew()
+    let mutable i = 0
+    while i < cfg.iterations && not (i >= 3 && total.Elapsed.TotalMilliseconds > cfg.budgetMs) do
+        for accion, n in acciones do
+            let antes = GC.GetAllocatedBytesForCurrentThread()
+            let t0 = Stopwatch.GetTimestamp()
+            accion ()
+            let t1 = Stopwatch.GetTimestamp()
+            bytes <- bytes + (GC.GetAllocatedBytesForCurrentThread() - antes)
+            let s = float (t1 - t0) / float Stopwatch.Frequency
+            segundos <- segundos + s
+            llamadas <- llamadas + int64 n
+            muestras.Add(s * 1000.0 / float n)
+        i <- i + 1
+    let ordenadas = muestras.ToArray() |> Array.sort
+    { op = op
+      size = size
+      words = cantidad
+      samples = ordenadas.Length
+      opsPerSec = if segundos > 0.0 then float llamadas / segundos else 0.0
+      meanMs = segundos * 1000.0 / float llamadas
+      p50Ms = percentil ordenadas 0.50
+      p99Ms = percentil ordenadas 0.99
+      allocBytesPerOp = float bytes / float llamadas }
+
+// Combinaciones con sentido: las palabras (de al menos 3 letras) deben poder caber en el tablero
+let casos (cfg:Config) =
+    [ for op in cfg.ops do
+        for size in cfg.sizes do
+            for n in cfg.wordCounts do
+                if n * 3 <= size * size then yield op, size, n ]
+
+type Comparacion =
+    { resultado:Resultado
+      baseP50Ms:float
+      baseAlloc:float
+      p50Ratio:float
+      allocRatio:float
+      regresion:bool }
+
+let cargarBaseline (ruta:string) =
+    use doc = JsonDocument.Parse(File.ReadAllText ruta)
+    let tabla = Dictionary<string * int * int, float * float>()
+    for r in doc.RootElement.GetProperty("results").EnumerateArray() do
+        let clave = r.GetProperty("op").GetString(), r.GetProperty("size").GetInt32(), r.GetProperty("words").GetInt32()
+        tabla.[clave] <- (r.GetProperty("p50Ms").GetDouble(), r.GetProperty("allocBytesPerOp").GetDouble())
+    tabla
+
+let comparar (umbral:float) (baseline:Dictionary<string * int * int, float * float>) (resultados:Resultado list) =
+    resultados |> List.choose (fun r ->
+        match baseline.TryGetValue((r.op, r.size, r.words)) with
+        | true, (p50, alloc) ->
+            let ratio actual anterior = if anterior > 0.0 then actual / anterior else 1.0
+            let p50Ratio = ratio r.p50Ms p50
+            let allocRatio = ratio r.allocBytesPerOp alloc
+            // unos pocos bytes de diferencia no son una regresión aunque el ratio sea grande
+            let allocPeor = allocRatio > 1.0 + umbral && r.allocBytesPerOp - alloc > 64.0
+            Some { resultado = r; baseP50Ms = p50; baseAlloc = alloc
+                   p50Ratio = p50Ratio; allocRatio = allocRatio
+                   regresion = p50Ratio > 1.0 + umbral || allocPeor }
+        | _ -> None)
+
+let escribirResultado (w:Utf8JsonWriter) (r:Resultado) =
+    w.WriteStartObject()
+    w.WriteString("op", r.op)
+    w.WriteNumber("size", r.size)
+    w.WriteNumber("words", r.words)
+    w.WriteNumber("samples", r.samples)
+    w.WriteNumber("opsPerSec", Math.Round(r.opsPerSec, 2))
+    w.WriteNumber("meanMs", Math.Round(r.meanMs, 6))
+    w.WriteNumber("p50Ms", Math.Round(r.p50Ms, 6))
+    w.WriteNumber("p99Ms", Math.Round(r.p99Ms, 6))
+    w.WriteNumber("allocBytesPerOp", Math.Round(r.allocBytesPerOp, 1))
+    w.WriteEndObject()
+
+let escribirInforme (salida:Stream) (cfg:Config) (resultados:Resultado list) (comparacion:(float * Comparacion list) option) =
+    use w = new Utf8JsonWriter(salida, JsonWriterOptions(Indented = true))
+    let enteros (nombre:string) (xs:int[]) =
+        w.WriteStartArray(nombre)
+        for x in xs do w.WriteNumberValue x
+        w.WriteEndArray()
+    w.WriteStartObject()
+    w.WriteStartObject("meta")
+    w.WriteString("runtime", Runtime.InteropServices.RuntimeInformation.FrameworkDescription)
+    w.WriteString("os", Runtime.InteropServices.RuntimeInformation.OSDescription)
+    w.WriteNumber("processorCount", Environment.ProcessorCount)
+    w.WriteString("date", DateTime.UtcNow.ToString("o"))
+#if DEBUG
+    w.WriteString("configuration", "Debug")
+#else
+    w.WriteString("configuration", "Release")
+#endif
+    w.WriteStartArray("ops")
+    for op in cfg.ops do w.WriteStringValue op
+    w.WriteEndArray()
+    enteros "sizes" cfg.sizes
+    enteros "wordCounts" cfg.wordCounts
+    enteros "seeds" cfg.seeds
+    w.WriteNumber("iterations", cfg.iterations)
+    w.WriteNumber("budgetMs", cfg.budgetMs)
+    w.WriteEndObject()
+    w.WriteStartArray("results")
+    for r in resultados do escribirResultado w r
+    w.WriteEndArray()
+    match comparacion with
+    | Some (umbral, filas) ->
+        w.WriteStartObject("comparison")
+        w.WriteNumber("threshold", umbral)
+        w.WriteNumber("regressions", filas |> List.filter (fun c -> c.regresion) |> List.length)
+        w.WriteStartArray("cases")
+        for c in filas do
+            w.WriteStartObject()
+            w.WriteString("op", c.resultado.op)
+            w.WriteNumber("size", c.resultado.size)
+            w.WriteNumber("words", c.resultado.words)
+            w.WriteNumber("p50Ms", Math.Round(c.resultado.p50Ms, 6))
+            w.WriteNumber("baselineP50Ms", Math.Round(c.baseP50Ms, 6))
+            w.WriteNumber("p50Ratio", Math.Round(c.p50Ratio, 3))
+            w.WriteNumber("allocBytesPerOp", Math.Round(c.resultado.allocBytesPerOp, 1))
+            w.WriteNumber("baselineAllocBytesPerOp", Math.Round(c.baseAlloc, 1))
+            w.WriteNumber("allocRatio", Math.Round(c.allocRatio, 3))
+            w.WriteBoolean("regression", c.regresion)
+            w.WriteEndObject()
+        w.WriteEndArray()
+        w.WriteEndObject()
+    | None -> ()
+    w.WriteEndObject()
+    w.Flush()
+
+let uso () =
+    eprintfn "Uso: Sopa.Bench [--quick] [--ops generate,solve,validate] [--sizes 10,20,...] [--words 2,10,...]"
+    eprintfn "                [--seeds 1,2,3] [--iterations N] [--warmup N] [--budget-ms N]"
+    eprintfn "                [--out resultados.json] [--baseline base.json] [--threshold 0.15]"
+
+[<EntryPoint>]
+let main argv =
+    let valor (nombre:string) =
+        match Array.tryFindIndex ((=) nombre) argv with
+        | Some i when i + 1 < argv.Length -> Some argv.[i + 1]
+        | _ -> None
+    let enteros (s:string) = s.Split(',', StringSplitOptions.RemoveEmptyEntries) |> Array.map int
+    if Array.contains "--help" argv then
+        uso ()
+        0
+    else
+        let base0 = if Array.contains "--quick" argv then rapido else porDefecto
+        let cfg =
+            { base0 with
+                ops = valor "--ops" |> Option.map (fun s -> s.Split(',', StringSplitOptions.RemoveEmptyEntries)) |> Option.defaultValue base0.ops
+                sizes = valor "--sizes" |> Option.map enteros |> Option.defaultValue base0.sizes
+                wordCounts = valor "--words" |> Option.map enteros |> Option.defaultValue base0.wordCounts
+                seeds = valor "--seeds" |> Option.map enteros |> Option.defaultValue base0.seeds
+                iterations = valor "--iterations" |> Option.map int |> Option.defaultValue base0.iterations
+                warmup = valor "--warmup" |> Option.map int |> Option.defaultValue base0.warmup
+                budgetMs = valor "--budget-ms" |> Option.map float |> Option.defaultValue base0.budgetMs }
+        let umbral = valor "--threshold" |> Option.map float |> Option.defaultValue 0.15
+
+        let resultados =
+            [ for op, size, n in casos cfg do
+                let r = medir cfg op size n
+                eprintfn "%-9s size=%-4d words=%-5d p50=%10.4f ms  p99=%10.4f ms  %12.1f op/s  %10.0f B/op"
+                    r.op r.size r.words r.p50Ms r.p99Ms r.opsPerSec r.allocBytesPerOp
+                yield r ]
+
+        let comparacion =
+            valor "--baseline" |> Option.map (fun ruta -> umbral, comparar umbral (cargarBaseline ruta) resultados)
+
+        match valor "--out" with
+        | Some ruta ->
+            use f = File.Create ruta
+            escribirInforme f cfg resultados comparacion
+        | None ->
+            use stdout = Console.OpenStandardOutput()
+            escribirInforme stdout cfg resultados comparacion
+
+        match comparacion with
+        | Some (_, filas) ->
+            let regresiones = filas |> List.filter (fun c -> c.regresion)
+            for c in regresiones do
+                eprintfn "REGRESIÓN %s size=%d words=%d: p50 x%.2f, alloc x%.2f"
+                    c.resultado.op c.resultado.size c.resultado.words c.p50Ratio c.allocRatio
+            eprintfn "%d casos comparados, %d regresiones (umbral %.0f%%)" filas.Length regresiones.Length (umbral * 100.0)
+            if regresiones.IsEmpty then 0 else 2
+        | None -> 0
@@ -8,46 +8,190 @@ open Sopa.Core.Generator
 open Sopa.Core.Validator
 open Sopa.Core.Solver
 
+let crearOpciones (compacto:bool) (peticion:bool) =
+    let o = JsonSerializerOptions(WriteIndented = false)
+    // en compact/1 los campos grid y cada Path tienen su propio formato; deben ir antes que el conversor F#
+    if compacto then
+        o.Converters.Add(Compact.Activa())
+        o.Converters.Add(Compact.PathConverter())
+    // en las peticiones los campos option pueden faltar o venir en null (p. ej. firstOnly en
+    // clientes antiguos); las respuestas siguen escribiendo None como null
+    let fsharp =
+        if peticion then JsonFSharpOptions.Default().WithSkippableOptionFields(SkippableOptionFields.Always, deserializeNullAsNone = true)
+        else JsonFSharpOptions.Default()
+    o.Converters.Add(JsonFSharpConverter(fsharp))
+    o
+
+// (peticiones, respuestas) de cada codificación
+let options = crearOpciones false true, crearOpciones false false
+let opcionesCompactas = crearOpciones true true, crearOpciones true false
+
+let opcionesPara (encoding:string) =
+    if encoding = Compact.version then opcionesCompactas else options
+
+// Una respuesta ya calculada (o por calcular, en los lotes) que se escribe en el writer
+type Respuesta = Utf8JsonWriter -> unit
+
+let generar (req:GenerateRequest) : GenerateResponse =
+    let size =
+        match req.size with
+        | Some s -> s
+        | None -> req.words |> List.map (fun w -> w.Length) |> List.max
+    let seed = defaultArg req.seed 42
+    let res =
+        match req.maxBacktracks with
+        | Some limite -> Generator.generateWithBudget seed size limite req.words
+        | None -> Generator.generateWithStats seed size req.words
+    { grid = WireGrid(Board.toGrid res.board)
+      placements = res.placements |> List.map (Board.toPlacement res.board)
+      unplaced = res.unplaced
+      stats = res.stats }
+
+// Interpreta la petición de una operación, o None si la operación no existe.
+// Las operaciones por lotes calculan cada elemento mientras escriben la respuesta,
+// así cada tablero sale por stdout en cuanto está listo.
+let preparar (encoding:string) (op:string) (json:string) : Respuesta option =
+    let options, salida = opcionesPara encoding
+    let escribir (obj:'T) : Respuesta = fun w -> JsonSerializer.Serialize(w, obj, salida)
+    match op with
+    | "hello" ->
+        let req = JsonSerializer.Deserialize<HelloRequest>(json, options)
+        Some (escribir { encoding = Compact.negotiate req.encodings; supported = Compact.supported })
+
+    | "generate" ->
+        let req = JsonSerializer.Deserialize<GenerateRequest>(json, options)
+        Some (escribir (generar req))
+
+    | "generate-batch" ->
+        let req = JsonSerializer.Deserialize<GenerateBatchRequest>(json, options)
+        Some (fun w ->
+            w.WriteStartObject()
+            w.WriteStartArray("boards")
+            for spec in req.specs do
+                try
+                    JsonSerializer.Serialize(w, generar spec, salida)
+                with ex ->
+                    w.WriteStartObject()
+                    w.WriteString("error", ex.Message)
+                    w.WriteEndObject()
+                w.Flush()
+            w.WriteEndArray()
+            w.WriteEndObject())
+
+    | "validate" ->
+        let req = JsonSerializer.Deserialize<ValidateRequest>(json, options)
+        let board = Board.ofGrid req.grid.Rows
+        let res =
+            match Board.between board req.selection.start req.selection.``end`` with
+            | Some ray -> Validator.validate board req.wordsRemaining ray
+            | None -> { found = false; word = None; ray = None }
+        Some (escribir { found = res.found; word = res.word; path = res.ray |> Option.map (Board.toPath board) })
+
+    | "solve" ->
+        let req = JsonSerializer.Deserialize<SolveRequest>(json, options)
+        let board = Board.ofGrid req.grid.Rows
+        let sols = Solver.solveWith (defaultArg req.firstOnly false) board req.wordsRemaining
+        Some (escribir { solutions = sols |> List.map (Board.toPlacement board) })
+
+    | "solve-batch" ->
+        let req = JsonSerializer.Deserialize<SolveBatchRequest>(json, options)
+        let workers = defaultArg req.workers Environment.ProcessorCount
+        let sw = Diagnostics.Stopwatch.StartNew()
+        let boards =
+            req.boards
+            |> List.map (fun b -> (defaultArg b.firstOnly false, Board.ofGrid b.grid.Rows, b.wordsRemaining))
+            |> List.toArray
+        let results =
+            Solver.solveMany workers boards
+            |> Array.mapi (fun i (res, ms) ->
+                let _, board, _ = boards.[i]
+                match res with
+                | Ok sols -> { solutions = sols |> List.map (Board.toPlacement board); error = None; elapsedMs = ms }
+                | Error msg -> { solutions = []; error = Some msg; elapsedMs = ms })
+            |> Array.toList
+        Some (escribir { results = results; workers = workers; elapsedMs = sw.Elapsed.TotalMilliseconds })
+
+    | _ -> None
+
+// Modo servidor: una petición JSON por línea en stdin, una respuesta por línea en stdout.
+// Petición:  {"id":1,"op":"generate","enc":"compact/1","payload":{...}}  ("enc" opcional, json por defecto)
+// Respuesta: {"id":1,"ok":true,"result":{...}}  o  {"id":1,"ok":false,"error":"..."}
+// La operación "hello" ({"encodings":[...]}) negocia la codificación a usar.
+let serve () =
+    use stdout = Console.OpenStandardOutput()
+    use w = new Utf8JsonWriter(stdout)
+    let finLinea () =
+        w.Flush()
+        stdout.WriteByte(byte '\n')
+        stdout.Flush()
+        w.Reset()
+    let mutable line = Console.In.ReadLine()
+    while not (isNull line) do
+        if not (String.IsNullOrWhiteSpace line) then
+            let mutable id = "null"
+            try
+                use doc = JsonDocument.Parse(line)
+                let root = doc.RootElement
+                match root.TryGetProperty("id") with
+                | true, v -> id <- v.GetRawText()
+                | _ -> ()
+                let op = root.GetProperty("op").GetString().ToLowerInvariant()
+                let payload =
+                    match root.TryGetProperty("payload") with
+                    | true, p -> p.GetRawText()
+                    | _ -> "{}"
+                let encoding =
+                    match root.TryGetProperty("enc") with
+                    | true, e -> e.GetString()
+                    | _ -> Compact.json
+                match preparar encoding op payload with
+                | Some responder ->
+                    w.WriteStartObject()
+                    w.WritePropertyName("id")
+                    w.WriteRawValue(id)
+                    w.WriteBoolean("ok", true)
+                    w.WritePropertyName("result")
+                    responder w
+                    w.WriteEndObject()
+                | None -> failwithf "Operación desconocida: %s" op
+            with ex ->
+                // si ya salió parte de la respuesta se cierra esa línea antes del error
+                if w.BytesCommitted > 0L then stdout.WriteByte(byte '\n')
+                w.Reset()
+                w.WriteStartObject()
+                w.WritePropertyName("id")
+                w.WriteRawValue(id)
+                w.WriteBoolean("ok", false)
+                w.WriteString("error", ex.Message)
+                w.WriteEndObject()
+            finLinea ()
+        line <- Console.In.ReadLine()
+    0
+
 [<EntryPoint>]
 let main argv =
     Console.InputEncoding  <- Encoding.UTF8
     Console.OutputEncoding <- Encoding.UTF8
 
     if argv.Length = 0 then
-        eprintfn "Uso: Sopa.Cli <generate|validate|solve>"
+        eprintfn "Uso: Sopa.Cli <generate|generate-batch|validate|solve|solve-batch|serve> [--encoding json|compact/1]"
         1
     else
-        let op = argv.[0].ToLowerInvariant()
-        let json = Console.In.ReadToEnd()
-        let options = JsonSerializerOptions(WriteIndented = false)
-        options.Converters.Add(JsonFSharpConverter())
-
-        let write obj =
-            let s = JsonSerializer.Serialize(obj, options)
-            Console.Out.Write(s)
-            0
-
-        match op with
-        | "generate" ->
-            let req = JsonSerializer.Deserialize<GenerateRequest>(json, options)
-            let size =
-                match req.size with
-                | Some s -> s
-                | None -> req.words |> List.map (fun w -> w.Length) |> List.max
-            let seed = defaultArg req.seed 42
-            let (grid, placements) = Generator.generate seed size req.words
-            write { grid = grid; placements = placements }
-
-        | "validate" ->
-            let req = JsonSerializer.Deserialize<ValidateRequest>(json, options)
-            let res = Validator.validate req.grid req.wordsRemaining req.selection
-            write { found = res.found; word = res.word; path = res.path }
-
-        | "solve" ->
-            let req = JsonSerializer.Deserialize<SolveRequest>(json, options)
-            let sols = Solver.solve req.grid req.wordsRemaining
-            write { solutions = sols }
-
-        | _ ->
-            eprintfn "Operación desconocida"
-            1
\ No newline at end of file
+        match argv.[0].ToLowerInvariant() with
+        | "serve" -> serve ()
+        | op ->
+            let encoding =
+                match Array.tryFindIndex ((=) "--encoding") argv with
+                | Some i when i + 1 < argv.Length -> argv.[i + 1]
+                | _ -> Compact.json
+            let json = Console.In.ReadToEnd()
+            match preparar encoding op json with
+            | Some responder ->
+                use stdout = Console.OpenStandardOutput()
+                use w = new Utf8JsonWriter(stdout)
+                responder w
+                w.Flush()
+                0
+            | None ->
+                eprintfn "Operación desconocida"
+                1
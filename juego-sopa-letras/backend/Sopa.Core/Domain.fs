@@ -4,4 +4,67 @@ type Coord = { r:int; c:int }
 type Grid = string[]
 type Path = Coord list
 
-type Placement = { word:string; path:Path }
\ No newline at end of file
+type Placement = { word:string; path:Path }
+
+/// Tablero compacto: todas las letras en un único buffer, fila tras fila
+type Board = { width:int; height:int; cells:char[] }
+
+/// Trazo recto sobre un Board: índice de la celda inicial en cells, dirección (0..7) y longitud
+[<Struct>]
+type Ray = { origin:int; dir:int; length:int }
+
+type WordRay = { word:string; ray:Ray }
+
+module Board =
+
+    /// Desplazamientos de las 8 direcciones, en el orden en que se recorren
+    let dRow = [| -1; -1; -1;  0; 0;  1; 1; 1 |]
+    let dCol = [| -1;  0;  1; -1; 1; -1; 0; 1 |]
+
+    let create (width:int) (height:int) =
+        { width = width; height = height; cells = Array.create (width * height) '\000' }
+
+    let ofGrid (grid:Grid) : Board =
+        let height = grid.Length
+        let width = if height = 0 then 0 else grid.[0].Length
+        let cells = Array.zeroCreate (width * height)
+        for r in 0 .. height - 1 do
+            grid.[r].CopyTo(0, cells, r * width, width)
+        { width = width; height = height; cells = cells }
+
+    let toGrid (b:Board) : Grid =
+        Array.init b.height (fun r -> System.String(b.cells, r * b.width, b.width))
+
+    /// Cuánto avanza el índice plano al dar un paso en la dirección d
+    let inline step (b:Board) (d:int) = dRow.[d] * b.width + dCol.[d]
+
+    let inline index (b:Board) (r:int) (c:int) = r * b.width + c
+
+    let inline letter (b:Board) (ray:Ray) (i:int) = b.cells.[ray.origin + i * step b ray.dir]
+
+    /// Índice de la dirección (-1..1, -1..1), o -1 si es (0, 0)
+    let direction (dr:int) (dc:int) =
+        let mutable d = -1
+        for i in 0 .. 7 do
+            if dRow.[i] = dr && dCol.[i] = dc then d <- i
+        d
+
+    /// Trazo recto entre dos celdas (ambas incluidas), si están en la misma fila,
+    /// columna o diagonal y dentro del tablero
+    let between (b:Board) (a:Coord) (z:Coord) : Ray option =
+        let dr, dc = z.r - a.r, z.c - a.c
+        let inside (p:Coord) = p.r >= 0 && p.r < b.height && p.c >= 0 && p.c < b.width
+        if not (inside a && inside z) then None
+        elif dr = 0 && dc = 0 then Some { origin = index b a.r a.c; dir = 0; length = 1 }
+        elif dr <> 0 && dc <> 0 && abs dr <> abs dc then None
+        else
+            let d = direction (sign dr) (sign dc)
+            Some { origin = index b a.r a.c; dir = d; length = max (abs dr) (abs dc) + 1 }
+
+    /// Convierte un trazo a la lista de coordenadas que usa el formato JSON
+    let toPath (b:Board) (ray:Ray) : Path =
+        let r0, c0 = ray.origin / b.width, ray.origin % b.width
+        [ for i in 0 .. ray.length - 1 -> { r = r0 + dRow.[ray.dir] * i; c = c0 + dCol.[ray.dir] * i } ]
+
+    let toPlacement (b:Board) (wr:WordRay) : Placement =
+        { word = wr.word; path = toPath b wr.ray }
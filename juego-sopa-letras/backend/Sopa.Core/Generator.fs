@@ -1,58 +1,263 @@
 namespace Sopa.Core
 open System
+open System.Collections.Generic
+open System.Diagnostics
 
 module Generator =
 
-    type Dir = { dr:int; dc:int }
-
-    let directions =
-        [ for dr in -1..1 do
-            for dc in -1..1 do
-                if not (dr=0 && dc=0) then yield {dr=dr; dc=dc} ]
-
-    let private cabe (size:int) (r:int) (c:int) (dir:Dir) (word:string) =
-        let endR = r + dir.dr * (word.Length - 1)
-        let endC = c + dir.dc * (word.Length - 1)
-        endR >= 0 && endR < size && endC >= 0 && endC < size
-
-    let private intentarColocar (grid:char[][]) (r:int) (c:int) (dir:Dir) (word:string) =
-        let size = grid.Length
-        if not (cabe size r c dir word) then false else
-        let mutable ok = true
-        for i in 0..word.Length-1 do
-            let rr, cc = r + dir.dr*i, c + dir.dc*i
-            let existing = grid.[rr].[cc]
-            if existing <> '\000' && existing <> word.[i] then ok <- false
-        if ok then
-            for i in 0..word.Length-1 do
-                let rr, cc = r + dir.dr*i, c + dir.dc*i
-                grid.[rr].[cc] <- word.[i]
-            true
-        else false
-
-    let generate (seed:int) (size:int) (words:string list) : Grid * Placement list =
+    type GenerationResult =
+        { board:Board
+          placements:WordRay list
+          unplaced:string list
+          stats:GenerationStats }
+
+    // Rango de una coordenada de inicio para que una palabra de longitud len quepa avanzando d
+    let private rango (size:int) (len:int) (d:int) =
+        if d > 0 then 0, size - len
+        elif d < 0 then len - 1, size - 1
+        else 0, size - 1
+
+    // Todas las colocaciones geométricamente válidas de una longitud: para cada dirección
+    // las celdas de inicio forman un rectángulo, así que basta guardar los 8 rectángulos y
+    // cuántas colocaciones hay antes de cada uno para decodificar la i-ésima en O(1).
+    type private Espacio(size:int, len:int) =
+        let rects =
+            Array.init 8 (fun d ->
+                let r0, r1 = rango size len Board.dRow.[d]
+                let c0, c1 = rango size len Board.dCol.[d]
+                if len = 0 || r1 < r0 || c1 < c0 then (0, 0, 0, 0)
+                else (r0, c0, r1 - r0 + 1, c1 - c0 + 1))
+        let acumulado =
+            rects |> Array.scan (fun acc (_, _, h, w) -> acc + int64 h * int64 w) 0L
+        member _.Total = acumulado.[8]
+        member _.Decodificar(i:int64) =
+            let mutable d = 0
+            while acumulado.[d + 1] <= i do d <- d + 1
+            let r0, c0, _, w = rects.[d]
+            let k = i - acumulado.[d]
+            r0 + int (k / int64 w), c0 + int (k % int64 w), d
+
+    // Recorre las colocaciones de un Espacio en un orden pseudoaleatorio sin repetir:
+    // (inicio + j*paso) mod total con paso coprimo con total es una permutación.
+    type private Recorrido(esp:Espacio, rnd:Random) =
+        let total = esp.Total
+        let rec mcd a b = if b = 0L then a else mcd b (a % b)
+        let mutable inicio = 0L
+        let mutable paso = 1L
+        let mutable j = 0L
+        member _.Reiniciar() =
+            j <- 0L
+            if total > 0L then
+                inicio <- rnd.NextInt64(total)
+                paso <- 1L + rnd.NextInt64(total)
+                while mcd paso total <> 1L do
+                    paso <- if paso >= total then 1L else paso + 1L
+        // por dónde va el recorrido, para poder volver a ese punto
+        member _.Estado
+            with get () = struct (inicio, paso, j)
+            and set (struct (i, p, jj)) =
+                inicio <- i
+                paso <- p
+                j <- jj
+        member _.Siguiente(r:byref<int>, c:byref<int>, d:byref<int>) =
+            if j >= total then false
+            else
+                let i = (inicio + j * paso % total) % total
+                j <- j + 1L
+                let rr, cc, dd = esp.Decodificar i
+                r <- rr
+                c <- cc
+                d <- dd
+                true
+
+    // Estado de la búsqueda al fallar una palabra: qué palabras estaban colocadas y por dónde
+    // iba cada recorrido
+    type private Foto =
+        { k:int
+          piso:int
+          colocadas:Ray voption[]
+          noColocadas:int[]
+          recorridos:struct (int64 * int64 * int64)[] }
+
+    /// Coloca las palabras de la más larga a la más corta probando solo colocaciones que
+    /// caben en el tablero y, si una palabra no entra, retrocede a la anterior para que
+    /// pruebe otra posición, hasta `maxBacktracks` veces (0 = pasada voraz). Antes de dar
+    /// una palabra por perdida vuelve al estado con más palabras colocadas que haya visto,
+    /// y nunca termina con menos palabras que la pasada voraz con la misma semilla.
+    /// Las palabras que no se logran colocar se informan en `unplaced`.
+    let generateWithBudget (seed:int) (size:int) (maxBacktracks:int) (words:string list) : GenerationResult =
+        let sw = Stopwatch.StartNew()
         let rnd = Random(seed)
-        let grid = Array.init size (fun _ -> Array.create size '\000')
-        let placements = ResizeArray<_>()
+        let palabras = List.toArray words
+        let n = palabras.Length
+        let board = Board.create size size
+        let letras = board.cells
+        // bit a 1 = celda ocupada por alguna palabra
+        let ocupadas : uint64[] = Array.zeroCreate ((size * size + 63) / 64)
+        let ocupada i = (ocupadas.[i >>> 6] >>> (i &&& 63)) &&& 1UL = 1UL
+        let marcar i = ocupadas.[i >>> 6] <- ocupadas.[i >>> 6] ||| (1UL <<< (i &&& 63))
+        let liberar i = ocupadas.[i >>> 6] <- ocupadas.[i >>> 6] &&& ~~~(1UL <<< (i &&& 63))
 
-        for w in words do
-            let mutable placed = false
-            let mutable tries = 0
-            while not placed && tries < 1000 do
+        let espacios = Dictionary<int, Espacio>()
+        let espacio len =
+            match espacios.TryGetValue len with
+            | true, e -> e
+            | _ ->
+                let e = Espacio(size, len)
+                espacios.[len] <- e
+                e
+
+        let orden = Array.init n id |> Array.sortBy (fun i -> -palabras.[i].Length)
+        let recorridos =
+            orden |> Array.map (fun i ->
+                let recorrido = Recorrido(espacio palabras.[i].Length, rnd)
+                recorrido.Reiniciar()
+                recorrido)
+        let colocadas : Ray voption[] = Array.create n ValueNone
+        // pila de celdas ocupadas en orden; cada palabra recuerda dónde empezaban las suyas
+        let nuevas : int[] = Array.zeroCreate (size * size)
+        let mutable tope = 0
+        let inicioNuevas : int[] = Array.zeroCreate n
+        let noColocadas = ResizeArray<int>()
+        let mutable tries = 0
+        let mutable backtracks = 0
+
+        let poner (k:int) (ray:Ray) =
+            let w = palabras.[orden.[k]]
+            let paso = Board.step board ray.dir
+            inicioNuevas.[k] <- tope
+            for i in 0 .. w.Length - 1 do
+                let idx = ray.origin + paso * i
+                if not (ocupada idx) then
+                    marcar idx
+                    letras.[idx] <- w.[i]
+                    nuevas.[tope] <- idx
+                    tope <- tope + 1
+            colocadas.[k] <- ValueSome ray
+
+        let intentar (k:int) =
+            let w = palabras.[orden.[k]]
+            let mutable r = 0
+            let mutable c = 0
+            let mutable d = 0
+            let mutable ok = false
+            while not ok && recorridos.[k].Siguiente(&r, &c, &d) do
                 tries <- tries + 1
-                let r, c = rnd.Next(size), rnd.Next(size)
-                let dir = directions.[rnd.Next(directions.Length)]
-                if intentarColocar grid r c dir w then
-                    placed <- true
-                    let path = [ for i in 0..w.Length-1 -> {r=r + dir.dr*i; c=c + dir.dc*i} ]
-                    placements.Add({word=w; path=path})
+                let paso = Board.step board d
+                let inicio = Board.index board r c
+                let mutable libre = true
+                let mutable i = 0
+                while libre && i < w.Length do
+                    let idx = inicio + paso * i
+                    if ocupada idx && letras.[idx] <> w.[i] then libre <- false
+                    i <- i + 1
+                if libre then
+                    poner k { origin = inicio; dir = d; length = w.Length }
+                    ok <- true
+            ok
+
+        // solo se deshace la última palabra colocada, así que sus celdas están en la cima
+        let quitar (k:int) =
+            while tope > inicioNuevas.[k] do
+                tope <- tope - 1
+                liberar nuevas.[tope]
+                letras.[nuevas.[tope]] <- '\000'
+            colocadas.[k] <- ValueNone
+
+        let contar (c:Ray voption[]) = c |> Array.sumBy (fun r -> if r.IsSome then 1 else 0)
+
+        let mutable k = 0
+        // nunca se retrocede por debajo de piso: las palabras anteriores ya están decididas
+        let mutable piso = 0
+        // sin retroceder más: desde aquí la búsqueda solo avanza
+        let mutable rendido = maxBacktracks <= 0
+        // el primer fallo, desde donde sigue la pasada voraz, y el fallo con más palabras colocadas
+        let mutable primera : Foto voption = ValueNone
+        let mutable mejor : Foto voption = ValueNone
+
+        let foto () =
+            { k = k
+              piso = piso
+              colocadas = Array.copy colocadas
+              noColocadas = noColocadas.ToArray()
+              recorridos = recorridos |> Array.map (fun r -> r.Estado) }
+
+        // rearma el tablero con las palabras de la foto, en el orden en que se colocan
+        let volverA (f:Foto) =
+            Array.fill letras 0 letras.Length '\000'
+            Array.fill ocupadas 0 ocupadas.Length 0UL
+            tope <- 0
+            Array.fill colocadas 0 n ValueNone
+            f.colocadas |> Array.iteri (fun j col -> match col with ValueSome ray -> poner j ray | ValueNone -> ())
+            f.recorridos |> Array.iteri (fun j estado -> recorridos.[j].Estado <- estado)
+            noColocadas.Clear()
+            noColocadas.AddRange f.noColocadas
+            k <- f.k
+            piso <- f.piso
+
+        let avanzar () =
+            while k < n do
+                if intentar k then
+                    k <- k + 1
+                else
+                    let ahora = contar colocadas
+                    if primera.IsNone then primera <- ValueSome (foto ())
+                    match mejor with
+                    | ValueSome m when contar m.colocadas >= ahora -> ()
+                    | _ -> mejor <- ValueSome (foto ())
+                    if not rendido && k > piso && backtracks < maxBacktracks then
+                        recorridos.[k].Reiniciar()
+                        k <- k - 1
+                        quitar k
+                        backtracks <- backtracks + 1
+                    else
+                        match mejor with
+                        | ValueSome m when contar m.colocadas > ahora ->
+                            // se retrocedió a un estado peor que uno ya visto: se vuelve a ese
+                            volverA m
+                            rendido <- true
+                        | _ ->
+                            noColocadas.Add orden.[k]
+                            k <- k + 1
+                            piso <- k
+
+        avanzar ()
+        // si la búsqueda dejó palabras afuera se completa también la pasada voraz desde el
+        // primer fallo (es el mismo estado y el mismo recorrido que sin retroceder) y se queda
+        // con la que coloque más
+        match primera with
+        | ValueSome p when noColocadas.Count > 0 && backtracks > 0 ->
+            let resultado = foto ()
+            volverA p
+            rendido <- true
+            mejor <- ValueNone
+            avanzar ()
+            if contar colocadas < contar resultado.colocadas then volverA resultado
+        | _ -> ()
 
         let alphabet = [|'A'..'Z'|]
-        for r in 0..size-1 do
-            for c in 0..size-1 do
-                if grid.[r].[c] = '\000' then
-                    grid.[r].[c] <- alphabet.[rnd.Next alphabet.Length]
-
-        let gridStr = grid |> Array.map (fun row -> String(row))
-        let placementsList = placements |> Seq.toList
-        gridStr, placementsList
+        for i in 0 .. letras.Length - 1 do
+            if letras.[i] = '\000' then
+                letras.[i] <- alphabet.[rnd.Next alphabet.Length]
+
+        let placements =
+            Array.zip orden colocadas
+            |> Array.choose (fun (i, col) ->
+                match col with
+                | ValueSome ray -> Some (i, ray)
+                | ValueNone -> None)
+            |> Array.sortBy fst
+            |> Array.map (fun (i, ray) -> { word = palabras.[i]; ray = ray })
+            |> Array.toList
+
+        { board = board
+          placements = placements
+          unplaced = noColocadas |> Seq.sort |> Seq.map (fun i -> palabras.[i]) |> Seq.toList
+          stats = { tries = tries; backtracks = backtracks; elapsedMs = sw.Elapsed.TotalMilliseconds } }
+
+    let generateWithStats (seed:int) (size:int) (words:string list) : GenerationResult =
+        generateWithBudget seed size (50 + 5 * List.length words) words
+
+    let generate (seed:int) (size:int) (words:string list) : Board * WordRay list =
+        let res = generateWithStats seed size words
+        res.board, res.placements
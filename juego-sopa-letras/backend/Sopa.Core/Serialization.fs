@@ -1,13 +1,106 @@
 namespace Sopa.Core
 
+open System
+open System.Text.Json
+open System.Text.Json.Serialization
 open Sopa.Core
 
-type GenerateRequest  = { words:string list; size:int option; seed:int option }
-type GenerateResponse = { grid:Grid; placements:Placement list }
+/// Codificación compacta "compact/1": los mismos mensajes, pero cada Grid viaja como
+/// {"letters": filas concatenadas, "width": ancho} y cada Path como [fila, columna,
+/// dirección, longitud], con la dirección como índice en Board.dRow/Board.dCol.
+module Compact =
+
+    let version = "compact/1"
+    let json = "json"
+    let supported = [ version; json ]
+
+    /// Se agrega a las opciones de compact/1 para que WireGridConverter sepa qué formato usar
+    type Activa() =
+        inherit JsonConverter<Activa>()
+        override _.Read(_, _, _) = raise (NotSupportedException())
+        override _.Write(_, _, _) = raise (NotSupportedException())
+
+    let activa (options:JsonSerializerOptions) =
+        options.Converters |> Seq.exists (fun c -> c :? Activa)
+
+    type PathConverter() =
+        inherit JsonConverter<Path>()
+        override _.Read(reader, _, _) =
+            use doc = JsonDocument.ParseValue(&reader)
+            let v i = doc.RootElement.[i].GetInt32()
+            let r, c, d, n = v 0, v 1, v 2, v 3
+            [ for i in 0 .. n - 1 -> { r = r + Board.dRow.[d] * i; c = c + Board.dCol.[d] * i } ]
+        override _.Write(writer, path, _) =
+            let d =
+                match path with
+                | a :: b :: _ -> Board.direction (b.r - a.r) (b.c - a.c)
+                | _ -> 0
+            let recto =
+                d >= 0 &&
+                path |> List.mapi (fun i p -> (i, p))
+                     |> List.forall (fun (i, p) ->
+                         p.r = path.Head.r + Board.dRow.[d] * i && p.c = path.Head.c + Board.dCol.[d] * i)
+            match path with
+            | first :: _ when recto ->
+                writer.WriteStartArray()
+                writer.WriteNumberValue(first.r)
+                writer.WriteNumberValue(first.c)
+                writer.WriteNumberValue(d)
+                writer.WriteNumberValue(path.Length)
+                writer.WriteEndArray()
+            | _ -> raise (JsonException "compact/1 solo admite caminos rectos y no vacíos")
+
+    /// Elige la primera codificación del cliente que también conoce este backend
+    let negotiate (offered:string list) =
+        offered |> List.tryFind (fun e -> List.contains e supported) |> Option.defaultValue json
+
+/// Tablero tal como viaja en los mensajes. Es un tipo aparte para que su conversor solo
+/// alcance a los campos grid y no a cualquier string[].
+[<JsonConverter(typeof<WireGridConverter>)>]
+type WireGrid(rows:Grid) =
+    member _.Rows = rows
+
+/// Lee los dos formatos; escribe el de compact/1 solo si las opciones tienen Compact.Activa
+and WireGridConverter() =
+    inherit JsonConverter<WireGrid>()
+    override _.Read(reader, _, _) =
+        use doc = JsonDocument.ParseValue(&reader)
+        let root = doc.RootElement
+        if root.ValueKind = JsonValueKind.Array then
+            WireGrid [| for e in root.EnumerateArray() -> e.GetString() |]
+        else
+            let letters = root.GetProperty("letters").GetString()
+            let width = root.GetProperty("width").GetInt32()
+            if width = 0 then WireGrid [||]
+            else WireGrid (Array.init (letters.Length / width) (fun r -> letters.Substring(r * width, width)))
+    override _.Write(writer, grid, options) =
+        let rows = grid.Rows
+        if Compact.activa options then
+            writer.WriteStartObject()
+            writer.WriteString("letters", String.Concat(rows))
+            writer.WriteNumber("width", (if rows.Length = 0 then 0 else rows.[0].Length))
+            writer.WriteEndObject()
+        else
+            writer.WriteStartArray()
+            for row in rows do writer.WriteStringValue(row)
+            writer.WriteEndArray()
+
+type GenerateRequest  = { words:string list; size:int option; seed:int option; maxBacktracks:int option }
+type GenerationStats  = { tries:int; backtracks:int; elapsedMs:float }
+type GenerateResponse = { grid:WireGrid; placements:Placement list; unplaced:string list; stats:GenerationStats }
+
+type GenerateBatchRequest = { specs:GenerateRequest list }
 
 type Selection = { start:Coord; ``end``:Coord }
-type ValidateRequest  = { grid:Grid; wordsRemaining:string list; selection:Selection }
+type ValidateRequest  = { grid:WireGrid; wordsRemaining:string list; selection:Selection }
 type ValidateResponse = { found:bool; word:string option; path:Path option }
 
-type SolveRequest     = { grid:Grid; wordsRemaining:string list }
-type SolveResponse    = { solutions:Placement list }
\ No newline at end of file
+type SolveRequest     = { grid:WireGrid; wordsRemaining:string list; firstOnly:bool option }
+type SolveResponse    = { solutions:Placement list }
+
+type SolveBatchRequest  = { boards:SolveRequest list; workers:int option }
+type SolveBatchItem     = { solutions:Placement list; error:string option; elapsedMs:float }
+type SolveBatchResponse = { results:SolveBatchItem list; workers:int; elapsedMs:float }
+
+type HelloRequest  = { encodings:string list }
+type HelloResponse = { encoding:string; supported:string list }
@@ -1,64 +1,112 @@
 namespace Sopa.Core
 
 module Solver =
+    open System.Collections.Generic
+    open System.Diagnostics
+    open System.Threading.Tasks
     open Sopa.Core
 
-    let directions =
-        [ for dr in -1..1 do
-            for dc in -1..1 do
-                if not (dr = 0 && dc = 0) then yield (dr, dc) ]
+    // Nodo del trie de prefijos sobre las palabras a buscar
+    type Nodo() =
+        member val Hijos = Dictionary<char, Nodo>() with get
+        // índices (en la lista de palabras) de las palabras que terminan en este nodo
+        member val Palabras = ResizeArray<int>() with get
+        // palabras del subárbol que todavía no se han encontrado
+        member val Pendientes = 0 with get, set
 
-    let vecinos (grid:Grid) (p:Coord) =
-        directions
-        |> List.map (fun (dr, dc) -> { r = p.r + dr; c = p.c + dc })
-        |> List.filter (fun n ->
-            n.r >= 0 && n.c >= 0 &&
-            n.r < grid.Length &&
-            n.c < grid.[0].Length)
+    let construirTrie (words:string[]) =
+        let raiz = Nodo()
+        words |> Array.iteri (fun i w ->
+            if w.Length > 0 then
+                let mutable nodo = raiz
+                nodo.Pendientes <- nodo.Pendientes + 1
+                for ch in w do
+                    nodo <-
+                        match nodo.Hijos.TryGetValue ch with
+                        | true, hijo -> hijo
+                        | _ ->
+                            let hijo = Nodo()
+                            nodo.Hijos.[ch] <- hijo
+                            hijo
+                    nodo.Pendientes <- nodo.Pendientes + 1
+                nodo.Palabras.Add i)
+        raiz
 
-    let extender (grid:Grid) (word:string) (path:Coord list) =
-        let nextIndex = path.Length
-        if nextIndex >= word.Length then
-            []
-        else
-            let nextChar = word.[nextIndex]
-            match path with
-            | [last] ->
-                vecinos grid last
-                |> List.filter (fun n -> grid.[n.r].[n.c] = nextChar)
-                |> List.map (fun n -> n :: path)
-            | last :: second :: _ ->
-                let dr = last.r - second.r
-                let dc = last.c - second.c
-                let next = { r = last.r + dr; c = last.c + dc }
-                if next.r >= 0 && next.c >= 0 &&
-                    next.r < grid.Length &&
-                    next.c < grid.[0].Length &&
-                    grid.[next.r].[next.c] = nextChar then
-                    [ next :: path ]
-                else
-                    []
-            | _ -> []
+    let private marcarEncontrada (raiz:Nodo) (word:string) =
+        let mutable nodo = raiz
+        nodo.Pendientes <- nodo.Pendientes - 1
+        for ch in word do
+            nodo <- nodo.Hijos.[ch]
+            nodo.Pendientes <- nodo.Pendientes - 1
 
-    let rec profundidad (expandir:'a -> 'a list) (frontera:'a list) =
-        seq {
-            match frontera with
-            | [] -> ()
-            | x::xs ->
-                yield x
-                yield! profundidad expandir (expandir x @ xs)
-        }
+    /// Busca todas las palabras a la vez: recorre cada uno de los 8 rayos desde cada celda
+    /// avanzando por el trie, así que cada letra del tablero se visita una vez por dirección.
+    /// Con firstOnly solo se reporta la primera aparición de cada palabra (un palíndromo no
+    /// sale dos veces) y la búsqueda termina en cuanto se han encontrado todas.
+    let solveWith (firstOnly:bool) (board:Board) (words:string list) : WordRay list =
+        let palabras = List.toArray words
+        let raiz = construirTrie palabras
+        let rows = board.height
+        let cols = board.width
+        let cells = board.cells
+        let hallazgos = Array.init palabras.Length (fun _ -> ResizeArray<Ray>())
 
-    let solve (grid:Grid) (words:string list) =
-        words
-        |> List.collect (fun w ->
-            let iniciales =
-                [ for r in 0 .. grid.Length - 1 do
-                    for c in 0 .. grid.[0].Length - 1 do
-                        if grid.[r].[c] = w.[0] then yield [{ r = r; c = c }] ]
+        let registrar (nodo:Nodo) (origen:int) (d:int) =
+            for i in nodo.Palabras do
+                if not firstOnly || hallazgos.[i].Count = 0 then
+                    let w = palabras.[i]
+                    hallazgos.[i].Add { origin = origen; dir = d; length = w.Length }
+                    if firstOnly then marcarEncontrada raiz w
 
-            profundidad (extender grid w) iniciales
-            |> Seq.filter (fun path -> path.Length = w.Length)
-            |> Seq.map List.rev
-            |> Seq.map (fun p -> { word = w; path = p })
-            |> Seq.toList)
+        // en modo firstOnly se poda cualquier rama cuyas palabras ya se encontraron
+        let vivo (nodo:Nodo) = not firstOnly || nodo.Pendientes > 0
+
+        let mutable r = 0
+        while r < rows && vivo raiz do
+            let mutable c = 0
+            while c < cols && vivo raiz do
+                let origen = Board.index board r c
+                match raiz.Hijos.TryGetValue cells.[origen] with
+                | true, inicio when vivo inicio ->
+                    registrar inicio origen 0
+                    for d in 0 .. 7 do
+                        let dr, dc = Board.dRow.[d], Board.dCol.[d]
+                        let paso = Board.step board d
+                        let mutable nodo = inicio
+                        let mutable rr = r + dr
+                        let mutable cc = c + dc
+                        let mutable idx = origen + paso
+                        let mutable seguir = true
+                        while seguir && rr >= 0 && rr < rows && cc >= 0 && cc < cols do
+                            match nodo.Hijos.TryGetValue cells.[idx] with
+                            | true, hijo when vivo hijo ->
+                                registrar hijo origen d
+                                nodo <- hijo
+                                rr <- rr + dr
+                                cc <- cc + dc
+                                idx <- idx + paso
+                            | _ -> seguir <- false
+                | _ -> ()
+                c <- c + 1
+            r <- r + 1
+
+        [ for i in 0 .. palabras.Length - 1 do
+            for ray in hallazgos.[i] do
+                yield { word = palabras.[i]; ray = ray } ]
+
+    let solve (board:Board) (words:string list) = solveWith false board words
+
+    /// Resuelve varios tableros en paralelo usando como mucho `workers` hilos.
+    /// Devuelve, en el orden de entrada, el resultado de cada tablero y lo que tardó en ms.
+    let solveMany (workers:int) (boards:(bool * Board * string list)[]) =
+        let results = Array.zeroCreate boards.Length
+        let opciones = ParallelOptions(MaxDegreeOfParallelism = max 1 workers)
+        Parallel.For(0, boards.Length, opciones, fun i ->
+            let sw = Stopwatch.StartNew()
+            let firstOnly, board, words = boards.[i]
+            let res =
+                try Ok (solveWith firstOnly board words)
+                with ex -> Error ex.Message
+            results.[i] <- (res, sw.Elapsed.TotalMilliseconds))
+        |> ignore
+        results
@@ -2,25 +2,24 @@ namespace Sopa.Core
 
 module Validator =
     open Sopa.Core
-    open System
 
-    type ValidationResult = { found:bool; word:string option; path:Path option }
+    type ValidationResult = { found:bool; word:string option; ray:Ray option }
 
-    let validate (grid:Grid) (wordsRemaining:string list) (sel:Selection) : ValidationResult =
-        let dr = Math.Sign(sel.``end``.r - sel.start.r)
-        let dc = Math.Sign(sel.``end``.c - sel.start.c)
-        let mutable path = []
-        let mutable r, c = sel.start.r, sel.start.c
-        let mutable word = ""
-        while r <> sel.``end``.r + dr || c <> sel.``end``.c + dc do
-            path <- {r=r; c=c} :: path
-            word <- word + string grid.[r].[c]
-            r <- r + dr
-            c <- c + dc
-        path <- List.rev path
-        let found = wordsRemaining |> List.exists (fun w -> w = word || w = new string(word.ToCharArray() |> Array.rev))
-        { 
-            found = found
-            word = if found then Some word else None
-            path = if found then Some path else None 
-        }
\ No newline at end of file
+    // Compara la palabra con las letras del trazo, en un sentido o en el otro, sin armar strings
+    let private coincide (board:Board) (ray:Ray) (w:string) =
+        if w.Length <> ray.length then false
+        else
+            let mutable adelante = true
+            let mutable atras = true
+            let mutable i = 0
+            while (adelante || atras) && i < ray.length do
+                let ch = Board.letter board ray i
+                if ch <> w.[i] then adelante <- false
+                if ch <> w.[ray.length - 1 - i] then atras <- false
+                i <- i + 1
+            adelante || atras
+
+    let validate (board:Board) (wordsRemaining:string list) (ray:Ray) : ValidationResult =
+        match wordsRemaining |> List.tryFind (coincide board ray) with
+        | Some w -> { found = true; word = Some w; ray = Some ray }
+        | None -> { found = false; word = None; ray = None }
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Compara tamano y tiempo de parseo de un `solve` en las dos codificaciones.
+
+Genera un tablero con el backend, lo resuelve en "json" y en "compact/1" y
+muestra, por codificacion, los bytes de peticion y respuesta, el tiempo medio
+de json.loads de la respuesta y el de llevarla a las formas de "json".
+
+Ejemplo:
+    python bench_wire.py --size 200 --repeat 5
+"""
+
+import argparse
+import json
+import time
+
+from services import backend, wire
+
+WORDS = ["PYTHON", "PROGRAMACION", "ALGORITMO", "LENGUAJES", "SOPA", "LETRAS"]
+
+
+def measure(server, board_size=200, words=None, seed=7, repeat=5):
+    words = words or WORDS
+    grid = backend.generate(words, size=board_size, seed=seed, server=server)["grid"]
+    remaining = words + [w[::-1] for w in words]
+
+    def payload(enc):
+        board = wire.encode_grid(grid) if enc == wire.COMPACT_V1 else grid
+        return {"grid": board, "wordsRemaining": remaining}
+
+    report = {}
+    for encoding in (wire.JSON, wire.COMPACT_V1):
+        request = json.dumps(payload(encoding), ensure_ascii=False)
+        _, raw, _ = server.call_raw("solve", payload, encoding)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = json.loads(raw)["result"]
+        parsed = time.perf_counter()
+        for _ in range(repeat):
+            wire.decode_result(result, encoding)
+        decoded = time.perf_counter()
+        report[encoding] = {
+            "request_bytes": len(request.encode("utf-8")),
+            "response_bytes": len(raw.encode("utf-8")),
+            "parse_ms": (parsed - start) * 1000 / repeat,
+            "decode_ms": (decoded - parsed) * 1000 / repeat,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tamano y parseo de un solve en json y compact/1")
+    parser.add_argument("--size", type=int, default=200, help="tamano del tablero")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones del parseo")
+    options = parser.parse_args(argv)
+    server = backend.CliServer()
+    try:
+        report = measure(server, board_size=options.size, seed=options.seed, repeat=options.repeat)
+    finally:
+        server.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,124 @@
-import json, subprocess, os, random
+import json, os, sys, random, atexit
+
+from services import wire
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from compartido import launcher
+from compartido.line_process import LineProcess
 
 CLI_PATH = os.environ.get("SOPA_CLI_PATH", None)
 
-def _call_cli(op: str, payload: dict):
+def _cli_command(op: str):
     if CLI_PATH and os.path.exists(CLI_PATH):
-        cmd = [CLI_PATH, op]
-    else:
-        root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-        cli_proj = os.path.join(root, "backend", "Sopa.Cli", "Sopa.Cli.fsproj")
-        cmd = ["dotnet", "run", "--project", cli_proj, "--", op]
-
-    proc = subprocess.run(
-        cmd, input=json.dumps(payload, ensure_ascii=False),
-        text=True, capture_output=True
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(f"CLI error {proc.returncode}: {proc.stderr.strip()}")
-    return json.loads(proc.stdout)
-
-def generate(words, size=None, seed=random.randint(1, 100)):
-    return _call_cli("generate", {"words": words, "size": size, "seed": seed})
+        return [CLI_PATH, op]
+    # Ejecuta el Sopa.Cli.dll ya compilado; solo recompila si cambiaron los fuentes
+    return launcher.command(launcher.SOPA, op)
+
+
+class CliServer(LineProcess):
+    """Proceso `Sopa.Cli serve` de larga vida compartido por todas las llamadas.
+
+    Envia una peticion JSON por linea y espera la respuesta con el mismo id
+    (ver compartido/line_process.py).
+    Al arrancar negocia la codificacion con `hello`; `call` siempre devuelve los
+    resultados en las formas de "json", sea cual sea la codificacion acordada.
+    """
+
+    def __init__(self, command_factory=_cli_command):
+        super().__init__(lambda: command_factory("serve"), name="Sopa.Cli", error_prefix="CLI error")
+        self.encoding = wire.JSON
+
+    def _started(self):
+        self.encoding = self._negotiate()
+
+    def _negotiate(self):
+        # Un backend sin `hello` responde con error: se sigue hablando "json"
+        request_id = next(self._ids)
+        line = json.dumps({"id": request_id, "op": "hello",
+                           "payload": {"encodings": wire.SUPPORTED}})
+        msg, _ = self._roundtrip(request_id, line)
+        if msg.get("ok") and msg["result"].get("encoding") in wire.SUPPORTED:
+            return msg["result"]["encoding"]
+        return wire.JSON
+
+    def call_raw(self, op: str, payload, encoding=None):
+        """Envia la peticion tal cual y devuelve (respuesta, linea recibida, codificacion).
+
+        `payload` es una funcion que recibe la codificacion y arma el payload,
+        ya que la codificacion puede cambiar si el proceso se relanza.
+        """
+        enc = None
+
+        def build(request_id):
+            nonlocal enc
+            enc = encoding or self.encoding
+            return json.dumps({"id": request_id, "op": op, "enc": enc, "payload": payload(enc)},
+                              ensure_ascii=False)
+
+        msg, raw = self.exchange(build)
+        if not msg.get("ok"):
+            raise RuntimeError(f"CLI error: {msg.get('error')}")
+        return msg, raw, enc
+
+    def call(self, op: str, payload):
+        msg, _, enc = self.call_raw(op, payload)
+        return wire.decode_result(msg["result"], enc)
+
+
+_server = CliServer()
+atexit.register(_server.close)
+
+def _call_cli(op: str, payload, server=None):
+    """`payload` puede ser un dict o una funcion de la codificacion que arma el dict.
+
+    Sin `server` se usa el proceso compartido del modulo.
+    """
+    return (server or _server).call(op, payload if callable(payload) else lambda _enc: payload)
+
+def generate(words, size=None, seed=None, server=None):
+    # La semilla se elige en cada llamada para que tableros consecutivos sean distintos
+    if seed is None:
+        seed = random.randint(1, 100)
+    return _call_cli("generate", {"words": words, "size": size, "seed": seed}, server)
+
+def generate_batch(specs, server=None):
+    """Genera varios tableros en una sola llamada.
+
+    `specs` es una lista de dicts con "words" y opcionalmente "size" y "seed".
+    Devuelve un tablero por spec, en el mismo orden; una spec que falla
+    devuelve {"error": ...} en su posicion.
+    """
+    payload = [{
+        "words": spec["words"],
+        "size": spec.get("size"),
+        "seed": spec["seed"] if spec.get("seed") is not None else random.randint(1, 100)
+    } for spec in specs]
+    return _call_cli("generate-batch", {"specs": payload}, server)["boards"]
+
+def _grid(grid, enc):
+    return wire.encode_grid(grid) if enc == wire.COMPACT_V1 else grid
 
 def validate(grid, words_remaining, start, end):
-    return _call_cli("validate", {
-        "grid": grid,
+    return _call_cli("validate", lambda enc: {
+        "grid": _grid(grid, enc),
         "wordsRemaining": words_remaining,
         "selection": {"start": start, "end": end}
     })
 
-def solve(grid, words_remaining):
-    return _call_cli("solve", {"grid": grid, "wordsRemaining": words_remaining})
+def solve(grid, words_remaining, first_only=False):
+    return _call_cli("solve", lambda enc: {
+        "grid": _grid(grid, enc), "wordsRemaining": words_remaining, "firstOnly": first_only
+    })
+
+def solve_batch(boards, workers=None, first_only=False):
+    """Resuelve muchos tableros en paralelo dentro del backend.
+
+    `boards` es una lista de pares (grid, words_remaining). Devuelve el dict
+    {"results": [...], "workers": n, "elapsedMs": t}, con un resultado por
+    tablero en el mismo orden y su tiempo en "elapsedMs".
+    """
+    return _call_cli("solve-batch", lambda enc: {
+        "boards": [{"grid": _grid(grid, enc), "wordsRemaining": words, "firstOnly": first_only}
+                   for grid, words in boards],
+        "workers": workers
+    })
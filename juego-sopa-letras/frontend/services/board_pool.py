@@ -0,0 +1,137 @@
+import threading
+from collections import OrderedDict, deque
+
+
+class BoardPool:
+    """Pool acotado de tableros pregenerados, indexado por (board_size, palabras).
+
+    `words` puede ser una lista fija o una fuente con `draw(board_size)` (p. ej.
+    un WordSampler); en ese caso la clave es la fuente y cada tablero se genera
+    con un sorteo de palabras propio.
+
+    Un hilo de fondo mantiene hasta `per_key` tableros listos para cada clave
+    pedida recientemente. Solo se rellenan las `max_keys` claves usadas mas
+    recientemente; al registrar una clave nueva se desaloja la menos reciente
+    junto con sus tableros (LRU). Si se da `generate_batch_fn`, el faltante de
+    una clave se genera en una sola llamada al backend.
+    """
+
+    def __init__(self, generate_fn, per_key=3, max_keys=4, generate_batch_fn=None):
+        self.generate_fn = generate_fn
+        self.generate_batch_fn = generate_batch_fn
+        self.per_key = per_key
+        self.max_keys = max_keys
+        self._boards = OrderedDict()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._worker = None
+        self._stats = {"hits": 0, "misses": 0, "generated": 0, "evicted": 0, "errors": 0}
+
+    @staticmethod
+    def key(board_size, words):
+        if hasattr(words, "draw"):
+            return (board_size, words)
+        return (board_size, tuple(words))
+
+    @staticmethod
+    def _words(board_size, words):
+        return words.draw(board_size) if hasattr(words, "draw") else list(words)
+
+    @property
+    def policy(self):
+        return {"per_key": self.per_key, "max_keys": self.max_keys, "eviction": "lru"}
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["ready"] = {key: len(boards) for key, boards in self._boards.items()}
+            return stats
+
+    def _touch(self, key):
+        # Registra la clave como la mas reciente; desaloja la menos reciente si sobra
+        if key in self._boards:
+            self._boards.move_to_end(key)
+            return self._boards[key]
+        boards = self._boards[key] = deque()
+        while len(self._boards) > self.max_keys:
+            _, evicted = self._boards.popitem(last=False)
+            self._stats["evicted"] += len(evicted)
+        self._ensure_worker()
+        self._cond.notify()
+        return boards
+
+    def prefill(self, board_size, words):
+        with self._cond:
+            self._touch(self.key(board_size, words))
+
+    def take(self, board_size, words):
+        """Devuelve un tablero listo en O(1), o None si no hay ninguno para esa clave."""
+        with self._cond:
+            boards = self._touch(self.key(board_size, words))
+            if boards:
+                self._stats["hits"] += 1
+                board = boards.popleft()
+            else:
+                self._stats["misses"] += 1
+                board = None
+            self._cond.notify()
+            return board
+
+    def _ensure_worker(self):
+        if self._worker is None and not self._closed:
+            self._worker = threading.Thread(target=self._refill_loop, daemon=True)
+            self._worker.start()
+
+    def _next_deficit(self):
+        # Rellena primero la clave usada mas recientemente
+        for key in reversed(self._boards):
+            missing = self.per_key - len(self._boards[key])
+            if missing > 0:
+                return key, missing
+        return None
+
+    def _produce(self, board_size, words, missing):
+        """Devuelve (tableros generados, cantidad de tableros que fallaron).
+
+        "errors" cuenta tableros: si la llamada entera falla, fallaron todos los pedidos.
+        """
+        requested = 1 if self.generate_batch_fn is None else missing
+        try:
+            if self.generate_batch_fn is None:
+                return [self.generate_fn(self._words(board_size, words), size=board_size)], 0
+            specs = [{"words": self._words(board_size, words), "size": board_size} for _ in range(missing)]
+            results = self.generate_batch_fn(specs)
+        except Exception:
+            return [], requested
+        boards = [board for board in results if "error" not in board]
+        return boards, requested - len(boards)
+
+    def _refill_loop(self):
+        while True:
+            with self._cond:
+                deficit = self._next_deficit()
+                while deficit is None and not self._closed:
+                    self._cond.wait()
+                    deficit = self._next_deficit()
+                if self._closed:
+                    return
+            key, missing = deficit
+            board_size, words = key
+            produced, failed = self._produce(board_size, words, missing)
+            with self._cond:
+                self._stats["errors"] += failed
+                if not produced:
+                    # Evitar reintentos en bucle si el backend no esta disponible o no genera nada
+                    self._cond.wait(timeout=5)
+                    continue
+                boards = self._boards.get(key)
+                for board in produced:
+                    if boards is None or len(boards) >= self.per_key:
+                        break
+                    boards.append(board)
+                    self._stats["generated"] += 1
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
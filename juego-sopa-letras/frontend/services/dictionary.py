@@ -0,0 +1,186 @@
+"""Diccionarios grandes para la sopa de letras.
+
+El archivo de palabras (una por linea) se normaliza una sola vez a un indice
+en disco: palabras en mayusculas A-Z, sin acentos ni repetidas, agrupadas
+por longitud. Cada grupo es un bloque de registros de ancho fijo (la
+longitud de sus palabras), asi que la k-esima palabra de longitud L esta en
+offset_L + k * L y se lee del archivo mapeado en memoria sin recorrer nada.
+
+Formato del indice:
+    MAGIC | cantidad de grupos (u32) | por grupo: longitud (u32), palabras (u32), offset (u64) | datos
+
+El indice se guarda junto al diccionario en `.index/`, con un nombre que
+depende de la ruta, el tamano y el mtime del original: si este cambia se
+reconstruye.
+"""
+
+import bisect
+import hashlib
+import mmap
+import os
+import random
+import struct
+import unicodedata
+
+MAGIC = b"SOPAIDX1"
+_HEADER = struct.Struct("<8sI")
+_BUCKET = struct.Struct("<IIQ")
+MIN_LENGTH = 3
+MAX_LENGTH = 64
+
+# Completa el sorteo cuando el diccionario tiene menos palabras de las que pide una partida
+FALLBACK_WORDS = (
+    "PYTHON", "PROGRAMACION", "ALGORITMO", "LENGUAJES", "SOPA", "LETRAS", "FUNCION", "VARIABLE",
+    "COMPILADOR", "TABLERO", "PALABRA", "CODIGO", "LISTA", "MATRIZ", "CADENA", "OBJETO", "CLASE",
+    "MODULO", "PRUEBA", "ERROR", "BUCLE", "RECURSION", "TIPO", "VALOR", "ARCHIVO", "DATOS",
+    "MEMORIA", "PROCESO", "SISTEMA", "RED", "PERRO", "GATO", "CASA", "ARBOL", "SOL", "LUNA",
+    "MAR", "RIO", "LIBRO", "MESA",
+)
+
+
+def normalize(line):
+    """Palabra en mayusculas A-Z sin acentos, o None si no sirve para el tablero."""
+    word = unicodedata.normalize("NFD", line.strip().upper())
+    word = "".join(ch for ch in word if not unicodedata.combining(ch))
+    if not (MIN_LENGTH <= len(word) <= MAX_LENGTH) or not word.isascii() or not word.isalpha():
+        return None
+    return word
+
+
+def _index_path(source):
+    st = os.stat(source)
+    key = f"{os.path.abspath(source)}|{st.st_size}|{st.st_mtime_ns}|{MAGIC.decode()}"
+    name = os.path.basename(source)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(os.path.dirname(os.path.abspath(source)), ".index", f"{name}.{digest}.idx")
+
+
+def _remove_stale(current, name):
+    # Indices de versiones anteriores del mismo diccionario
+    folder = os.path.dirname(current)
+    for other in os.listdir(folder):
+        path = os.path.join(folder, other)
+        if other.startswith(name + ".") and other.endswith(".idx") and path != current:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def build_index(source):
+    """Lee el diccionario completo y devuelve el indice como bytes."""
+    buckets = {}
+    with open(source, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            word = normalize(line)
+            if word is not None:
+                buckets.setdefault(len(word), set()).add(word)
+    lengths = sorted(buckets)
+    offset = _HEADER.size + _BUCKET.size * len(lengths)
+    header = [_HEADER.pack(MAGIC, len(lengths))]
+    data = []
+    for length in lengths:
+        words = sorted(buckets[length])
+        header.append(_BUCKET.pack(length, len(words), offset))
+        data.append("".join(words).encode("ascii"))
+        offset += length * len(words)
+    return b"".join(header + data)
+
+
+class Dictionary:
+    def __init__(self, buffer):
+        self._buffer = buffer
+        magic, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Indice de diccionario invalido")
+        self._buckets = {}
+        for i in range(count):
+            length, words, offset = _BUCKET.unpack_from(buffer, _HEADER.size + i * _BUCKET.size)
+            self._buckets[length] = (words, offset)
+
+    @classmethod
+    def open(cls, source):
+        """Abre el indice del diccionario, construyendolo si falta o si el original cambio."""
+        path = _index_path(source)
+        if not os.path.exists(path):
+            data = build_index(source)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                _remove_stale(path, os.path.basename(source))
+            except OSError:
+                # Sin permiso de escritura se usa el indice en memoria
+                return cls(data)
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def lengths(self):
+        return sorted(self._buckets)
+
+    def count(self, length):
+        return self._buckets.get(length, (0, 0))[0]
+
+    def __len__(self):
+        return sum(words for words, _ in self._buckets.values())
+
+    def word(self, length, k):
+        words, offset = self._buckets[length]
+        if not 0 <= k < words:
+            raise IndexError(k)
+        start = offset + k * length
+        return self._buffer[start:start + length].decode("ascii")
+
+    def sample(self, n, max_length, min_length=MIN_LENGTH, rng=random):
+        """Hasta n palabras distintas con longitud entre min_length y max_length.
+
+        Cuesta O(n) mas el numero de grupos, sin importar el tamano del diccionario:
+        se eligen n posiciones en el rango de palabras elegibles y cada una se
+        ubica en su grupo por busqueda binaria sobre los conteos acumulados.
+        """
+        lengths = [L for L in self.lengths if min_length <= L <= max_length]
+        cumulative = []
+        total = 0
+        for length in lengths:
+            total += self._buckets[length][0]
+            cumulative.append(total)
+        picks = rng.sample(range(total), min(n, total))
+        words = []
+        for pick in picks:
+            b = bisect.bisect_right(cumulative, pick)
+            before = cumulative[b - 1] if b else 0
+            words.append(self.word(lengths[b], pick - before))
+        return words
+
+
+class WordSampler:
+    """Fuente de palabras nuevas para cada partida.
+
+    Se usa como clave del BoardPool en lugar de una lista fija de palabras:
+    cada tablero pregenerado recibe su propio sorteo.
+    """
+
+    def __init__(self, dictionary, per_game=None, fallback=FALLBACK_WORDS):
+        self.dictionary = dictionary
+        self.per_game = per_game
+        self.fallback = fallback
+
+    def words_for(self, board_size):
+        # Aproximadamente una palabra cada 40 celdas, al menos 5
+        if self.per_game is not None:
+            return self.per_game
+        return max(5, board_size * board_size // 40)
+
+    def draw(self, board_size, rng=random):
+        wanted = self.words_for(board_size)
+        words = self.dictionary.sample(wanted, max_length=board_size, rng=rng)
+        if len(words) < wanted:
+            # Diccionario chico (el words.txt de ejemplo trae dos palabras): se completa con
+            # palabras fijas para que cada partida tenga su propio sorteo
+            chosen = set(words)
+            extra = [w for w in self.fallback if w not in chosen and MIN_LENGTH <= len(w) <= board_size]
+            words += rng.sample(extra, min(wanted - len(words), len(extra)))
+        return words
@@ -0,0 +1,40 @@
+class PlacementIndex:
+    """Indice de las colocaciones devueltas por `generate`.
+
+    Guarda cada colocacion (palabra y camino) y las agrupa por el par
+    (inicio, fin), en ambos sentidos, para validar una seleccion sin llamar
+    al backend. Una misma palabra colocada dos veces queda dos veces, y
+    varias colocaciones pueden compartir extremos (p. ej. ROMA y AMOR sobre
+    las mismas celdas).
+    """
+
+    def __init__(self, placements=()):
+        self._placements = []
+        self._by_ends = {}
+        for placement in placements:
+            self.add(placement["word"], placement["path"])
+
+    @staticmethod
+    def _cell(coord):
+        return (coord["r"], coord["c"])
+
+    def add(self, word, path):
+        entry = (word, path)
+        self._placements.append(entry)
+        first, last = self._cell(path[0]), self._cell(path[-1])
+        self._by_ends.setdefault((first, last), []).append(entry)
+        # Un camino de una sola celda tiene los dos extremos iguales: va una sola vez
+        if last != first:
+            self._by_ends.setdefault((last, first), []).append(entry)
+
+    def lookup(self, start, end):
+        """Devuelve las (palabra, camino) con esos extremos, primero las que se leen desde `start`.
+
+        La lista esta vacia si la seleccion no coincide con ninguna colocacion.
+        """
+        first = self._cell(start)
+        hits = self._by_ends.get((first, self._cell(end)), [])
+        return sorted(hits, key=lambda hit: self._cell(hit[1][0]) != first)
+
+    def __len__(self):
+        return len(self._placements)
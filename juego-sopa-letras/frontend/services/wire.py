@@ -0,0 +1,50 @@
+"""Codificaciones de los mensajes entre el frontend y Sopa.Cli.
+
+"json" es el formato original: el tablero como lista de filas y cada camino
+como lista de {"r", "c"}. "compact/1" envia los mismos mensajes pero con el
+tablero como {"letters": filas concatenadas, "width": ancho} y cada camino
+como [fila, columna, direccion, longitud]. Las direcciones siguen el orden de
+Board.dRow/Board.dCol en Sopa.Core.
+"""
+
+JSON = "json"
+COMPACT_V1 = "compact/1"
+SUPPORTED = [COMPACT_V1, JSON]
+
+DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def encode_grid(grid):
+    return {"letters": "".join(grid), "width": len(grid[0]) if grid else 0}
+
+
+def decode_grid(board):
+    letters, width = board["letters"], board["width"]
+    if not width:
+        return []
+    return [letters[i:i + width] for i in range(0, len(letters), width)]
+
+
+def decode_path(ray):
+    r, c, d, length = ray
+    dr, dc = DIRECTIONS[d]
+    return [{"r": r + dr * i, "c": c + dc * i} for i in range(length)]
+
+
+def decode_result(result, encoding):
+    """Devuelve el resultado con las formas de "json", sea cual sea la codificacion."""
+    if encoding != COMPACT_V1:
+        return result
+    if isinstance(result, list):
+        return [decode_result(item, encoding) for item in result]
+    if not isinstance(result, dict):
+        return result
+    decoded = {}
+    for key, value in result.items():
+        if key == "grid" and isinstance(value, dict):
+            decoded[key] = decode_grid(value)
+        elif key == "path" and value is not None:
+            decoded[key] = decode_path(value)
+        else:
+            decoded[key] = decode_result(value, encoding)
+    return decoded
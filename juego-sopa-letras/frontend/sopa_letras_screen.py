@@ -1,16 +1,40 @@
 import tkinter as tk
 from tkinter import messagebox
+import atexit
+import functools
 import os
+import sys
 import time
+from collections import Counter
 
 from services import backend
+from services.board_pool import BoardPool
+from services.dictionary import Dictionary, WordSampler
+from services.placement_index import PlacementIndex
 from ui.board import Board
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "words.txt")
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from compartido.dispatcher import Dispatcher
 
-def load_words():
-    with open(DATA_PATH, encoding="utf-8") as f:
-        return [line.strip().upper() for line in f if line.strip()]
+# SOPA_DICTIONARY permite jugar con otro diccionario (p. ej. uno de cientos de miles de palabras)
+DATA_PATH = os.environ.get("SOPA_DICTIONARY") or os.path.join(os.path.dirname(__file__), "..", "data", "words.txt")
+
+# Compartido entre pantallas para que volver al menu no descarte tableros ya generados.
+# Rellena con su propio proceso de Sopa.Cli: una tanda en curso no demora lo que pide
+# la partida (generar en un fallo del pool, validar, resolver)
+_pool_server = backend.CliServer()
+atexit.register(_pool_server.close)
+board_pool = BoardPool(functools.partial(backend.generate, server=_pool_server),
+                       generate_batch_fn=functools.partial(backend.generate_batch, server=_pool_server))
+
+_word_source = None
+
+def word_source():
+    """Sorteo de palabras por partida sobre el diccionario; el indice se abre una sola vez."""
+    global _word_source
+    if _word_source is None:
+        _word_source = WordSampler(Dictionary.open(DATA_PATH))
+    return _word_source
 
 class SopaLetrasScreen:
     def __init__(self, root, volver_callback, board_size=15):
@@ -20,12 +44,23 @@ class SopaLetrasScreen:
         
         self.setup_responsive_layout()
         
-        self.words = load_words()
+        self.word_source = word_source()
         self.grid = []
-        self.words_remaining = self.words[:]
-        self.words_found = []
+        self.placements = PlacementIndex()
+        # Palabras que realmente quedaron en el tablero (el generador informa las que no caben)
+        self.board_words = []
+        self.words_remaining = []
+        # Cuantas veces se encontro cada palabra: una palabra puede estar colocada mas de una vez
+        self.words_found = Counter()
+        # Celdas de cada colocacion ya encontrada, para no contarla dos veces
+        self.found_paths = set()
+        # Un label por colocacion, en el orden de board_words, y si ya se muestra como encontrada
+        self.word_labels = []
+        self.word_label_found = []
+        self.word_labels_for = None
         self.start_time = None
         self.game_active = False
+        self.dispatcher = Dispatcher(root)
         
         self.setup_fonts()
         self.setup_ui()
@@ -114,6 +149,8 @@ class SopaLetrasScreen:
         
         self.words_inner_frame = tk.Frame(self.words_canvas, bg='#34495e')
         self.words_canvas.create_window((0, 0), window=self.words_inner_frame, anchor='nw')
+        # Tk avisa cuando cambia el tamano del panel; no hace falta forzar el layout
+        self.words_inner_frame.bind("<Configure>", lambda e: self.words_canvas.configure(scrollregion=self.words_canvas.bbox("all")))
         
         self.words_canvas.bind("<MouseWheel>", self._on_mousewheel)
         self.words_canvas.bind("<Button-4>", self._on_mousewheel)
@@ -144,13 +181,13 @@ class SopaLetrasScreen:
         verify_btn = tk.Button(controls_frame, text="VERIFICAR", 
                               font=("Arial", 12, "bold"), bg='#27ae60', fg='white',
                               activebackground='#2ecc71', cursor='hand2',
-                              command=self.on_verify_selection, width=15)
+                              command=lambda: self.board.verify_selection(), width=15)
         verify_btn.pack(pady=8, padx=15)
         
         clear_btn = tk.Button(controls_frame, text="LIMPIAR", 
                              font=("Arial", 12, "bold"), bg='#e74c3c', fg='white',
                              activebackground='#c0392b', cursor='hand2',
-                             command=self.on_clear_selection, width=15)
+                             command=lambda: self.board.clear_selection(), width=15)
         clear_btn.pack(pady=8, padx=15)
         
         # Separador
@@ -223,10 +260,29 @@ class SopaLetrasScreen:
             pass
 
     def new_game(self):
-        resp = backend.generate(self.words, size=self.board_size)
+        # Un tablero ya pedido se espera; otro clic en NUEVO JUEGO no pide uno mas
+        if self.dispatcher.in_flight("generate"):
+            return
+        # Lo que siga en curso (validaciones, resolver) es de la partida anterior
+        self.dispatcher.new_generation()
+        resp = board_pool.take(self.board_size, self.word_source)
+        if resp is not None:
+            self.start_board(resp)
+            return
+        self.game_active = False
+        self.message_label.config(text="Generando tablero...", fg='#f39c12')
+        words = self.word_source.draw(self.board_size)
+        self.dispatcher.submit("generate", backend.generate, words, size=self.board_size,
+                               on_done=self.start_board, on_error=self.on_backend_error)
+
+    def start_board(self, resp):
         self.grid = resp["grid"]
-        self.words_remaining = self.words[:]
-        self.words_found = []
+        self.placements = PlacementIndex(resp.get("placements", []))
+        # Cada partida trae su propio sorteo: las palabras del tablero son las colocadas
+        self.board_words = [p["word"] for p in resp.get("placements", [])]
+        self.words_remaining = self.board_words[:]
+        self.words_found = Counter()
+        self.found_paths = set()
         self.start_time = time.time()
         self.game_active = True
         
@@ -235,8 +291,8 @@ class SopaLetrasScreen:
         self.message_label.config(text=f"¡Encuentra todas las palabras en el tablero {self.board_size}x{self.board_size}! Haz clic en las letras para formar palabras y presiona VERIFICAR.", fg='#f39c12')
 
     def update_stats(self):
-        found_count = len(self.words_found)
-        total_count = len(self.words)
+        found_count = sum(self.words_found.values())
+        total_count = len(self.board_words)
         
         self.words_found_label.config(text=f"Encontradas: {found_count}/{total_count}")
         self.update_words_display()
@@ -250,42 +306,71 @@ class SopaLetrasScreen:
             messagebox.showinfo("¡Completado!", f"¡Felicitaciones! Completaste la sopa de letras en {minutes:02d}:{seconds:02d}")
 
     def update_words_display(self):
+        if self.word_labels_for != self.board_words:
+            self.rebuild_word_labels()
+        
+        # Solo se tocan los labels cuyo estado cambio; de una palabra repetida se marcan
+        # tantas apariciones como veces se encontro
+        seen = Counter()
+        for slot, (word, label) in enumerate(zip(self.board_words, self.word_labels)):
+            seen[word] += 1
+            found = seen[word] <= self.words_found[word]
+            if self.word_label_found[slot] != found:
+                self.word_label_found[slot] = found
+                self.style_word_label(label, word, found)
+
+    def rebuild_word_labels(self):
         for widget in self.words_inner_frame.winfo_children():
             widget.destroy()
-        
-        for word in self.words:
-            if word in self.words_found:
-                bg_color = '#27ae60'
-                fg_color = 'white'
-                text = f"✓ {word}"
-                relief = 'sunken'
-            else:
-                bg_color = '#34495e'
-                fg_color = '#ecf0f1'
-                text = word
-                relief = 'raised'
-            
-            word_label = tk.Label(self.words_inner_frame, text=text,
-                                font=("Arial", 10, "bold"), bg=bg_color, fg=fg_color,
-                                relief=relief, bd=1, padx=8, pady=2)
+        self.word_labels = []
+        self.word_label_found = []
+        self.word_labels_for = self.board_words[:]
+        
+        for word in self.board_words:
+            # Ancho fijo: marcarla como encontrada no cambia el layout del panel
+            word_label = tk.Label(self.words_inner_frame, width=len(word) + 2,
+                                font=("Arial", 10, "bold"), bd=1, padx=8, pady=2)
             word_label.pack(side='left', padx=2, pady=2)
-        
-        self.words_inner_frame.update_idletasks()
-        self.words_canvas.configure(scrollregion=self.words_canvas.bbox("all"))
-        
-        canvas_width = self.words_canvas.winfo_width()
-        if canvas_width > 1:
-            self.words_canvas.configure(scrollregion=self.words_canvas.bbox("all"))
+            self.style_word_label(word_label, word, False)
+            self.word_labels.append(word_label)
+            self.word_label_found.append(False)
+
+    def style_word_label(self, label, word, found):
+        if found:
+            label.config(text=f"✓ {word}", bg='#27ae60', fg='white', relief='sunken')
+        else:
+            label.config(text=word, bg='#34495e', fg='#ecf0f1', relief='raised')
 
     def on_verify_selection(self, start, end):
         if not self.game_active:
             return
             
-        result = backend.validate(self.grid, self.words_remaining, start, end)
-        if result["found"]:
+        hits = self.placements.lookup(start, end)
+        if hits:
+            # Entre colocaciones con los mismos extremos vale la de una palabra que falta encontrar
+            word, path = next((hit for hit in hits if hit[0] in self.words_remaining), hits[0])
+            found = word in self.words_remaining
+            self.apply_verification({"found": found, "word": word if found else None, "path": path if found else None})
+        else:
+            # La seleccion no es ninguna colocacion conocida, pero las letras de relleno
+            # pueden haber formado por casualidad otra aparicion de una palabra
+            key = ("validate", start["r"], start["c"], end["r"], end["c"])
+            self.dispatcher.submit(key, backend.validate, self.grid, list(self.words_remaining), start, end,
+                                   on_done=self.apply_verification, on_error=self.on_backend_error)
+
+    def apply_verification(self, result):
+        if not self.game_active:
+            return
+        # Otra verificacion pudo haber encontrado la misma palabra mientras esta viajaba
+        cells = frozenset((p["r"], p["c"]) for p in result["path"]) if result["found"] else None
+        if cells in self.found_paths:
+            self.board.clear_selection()
+            self.message_label.config(text=f"Ya encontraste '{result['word']}' en ese lugar", fg='#f39c12')
+        elif result["found"] and result["word"] in self.words_remaining:
             word = result["word"]
-            self.words_found.append(word)
-            self.words_remaining = [w for w in self.words_remaining if w != word]
+            self.found_paths.add(cells)
+            self.words_found[word] += 1
+            self.words_remaining.remove(word)
             self.board.highlight(result["path"], color="#27ae60")
             self.board.clear_selection()
             self.message_label.config(text=f"¡Excelente! Encontraste '{word}'", fg='#27ae60')
@@ -306,17 +391,21 @@ class SopaLetrasScreen:
             return
             
         self.message_label.config(text="Resolviendo automáticamente...", fg='#f39c12')
-        
-        res = backend.solve(self.grid, self.words_remaining)
+        self.dispatcher.submit("solve", backend.solve, self.grid, list(self.words_remaining), first_only=True,
+                               on_done=self.show_solutions, on_error=self.on_backend_error)
+
+    def show_solutions(self, res):
+        if not self.game_active:
+            return
         for sol in res["solutions"]:
             self.board.highlight(sol["path"], color="#3498db")
-            if sol["word"] not in self.words_found:
-                self.words_found.append(sol["word"])
+            self.words_found[sol["word"]] += 1
         
-        self.root.after(2000, self.complete_auto_solve)
+        generation = self.dispatcher.generation
+        self.root.after(2000, lambda: generation == self.dispatcher.generation and self.complete_auto_solve())
     
     def complete_auto_solve(self):
-        self.words_found = self.words[:]
+        self.words_found = Counter(self.board_words)
         self.words_remaining = []
         
         self.update_stats()
@@ -330,8 +419,12 @@ class SopaLetrasScreen:
         else:
             self.message_label.config(text="¡Todas las palabras han sido encontradas automáticamente!", fg='#3498db')
 
+    def on_backend_error(self, error):
+        self.message_label.config(text=f"Error comunicándose con el backend: {error}", fg='#e74c3c')
+
     def volver_al_menu(self):
         self.game_active = False
+        self.dispatcher.close()
         if self.volver_callback:
             self.volver_callback()
 
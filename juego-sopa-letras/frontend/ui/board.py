@@ -1,16 +1,41 @@
 import tkinter as tk
 
+from ui.board_model import BoardModel
+
 class Board:
+    """Tablero dibujado sobre un unico Canvas.
+
+    El estado (letras, seleccion, celdas encontradas) vive en un BoardModel; esta
+    clase solo traduce clics al modelo y pinta las celdas que el modelo cambio.
+
+    Cada celda es un rectangulo y un texto; los clics se traducen a (fila, columna)
+    dividiendo por el tamano de celda. El numero de orden de una letra seleccionada
+    es un tercer texto que solo existe mientras la celda esta seleccionada.
+    Entre partidas del mismo tamano los items se reutilizan y solo se reescriben
+    las letras que cambiaron.
+    """
+
     def __init__(self, parent_frame, on_verify_callback, on_clear_callback, on_word_update_callback=None):
         self.parent_frame = parent_frame
         self.frame = tk.Frame(parent_frame, bg='#2c3e50')
         self.on_verify = on_verify_callback
         self.on_clear = on_clear_callback
         self.on_word_update = on_word_update_callback
-        self.buttons = []
+        self.model = BoardModel()
         self.size = 0
-        self.selected_letters = []
+        self.cell = 0
         self.selection_colors = ['#e74c3c', '#f39c12', '#f1c40f', '#2ecc71', '#3498db', '#9b59b6', '#e67e22', '#95a5a6']
+        # Ids de los items del canvas, indexados por r * size + c
+        self.rects = []
+        self.letters = []
+        self.numbers = {}
+
+        self.canvas = tk.Canvas(self.frame, bg='#2c3e50', highlightthickness=0)
+        self.xscroll = tk.Scrollbar(self.frame, orient='horizontal', command=self.canvas.xview)
+        self.yscroll = tk.Scrollbar(self.frame, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(xscrollcommand=self.xscroll.set, yscrollcommand=self.yscroll.set)
+        self.canvas.grid(row=0, column=0, sticky='nsew')
+        self.canvas.bind('<Button-1>', self._on_click)
 
     def get_frame(self):
         return self.frame
@@ -24,194 +49,165 @@ class Board:
         return screen_width, screen_height
 
     def calculate_responsive_dimensions(self, grid_size):
+        """Devuelve (lado de celda en px, tamano de letra, ancho y alto visibles del canvas)."""
         screen_width, screen_height = self.get_screen_dimensions()
-        
+
         available_width = int(screen_width * 0.75)
         available_height = int(screen_height * 0.65)
-        
-        max_button_space = min(available_width // grid_size, available_height // grid_size)
-        
-        base_size = max(15, min(60, max_button_space))
-        
-        button_width = max(1, base_size // 12)
-        button_height = max(1, base_size // 24)
-        
-        if grid_size <= 12:
-            font_size = max(8, min(16, base_size // 3))
-            padding = max(1, base_size // 12)
-        elif grid_size <= 16:
-            font_size = max(6, min(14, base_size // 4))
-            padding = max(1, base_size // 15)
-        else:
-            font_size = max(5, min(12, base_size // 5))
-            padding = max(1, base_size // 18)
-        
-        return button_width, button_height, font_size, padding
 
-    def draw(self, grid):
-        for w in self.frame.winfo_children():
-            w.destroy()
+        # Por debajo de 16 px las letras no se leen: el tablero pasa a desplazarse
+        cell = max(16, min(60, min(available_width, available_height) // max(1, grid_size)))
+        font_size = max(6, min(20, cell // 2 - 2))
 
-        self.buttons.clear()
-        self.selected_letters.clear()
+        view_width = min(available_width, cell * grid_size)
+        view_height = min(available_height, cell * grid_size)
+        return cell, font_size, view_width, view_height
+
+    def draw(self, grid):
+        previous = self.model
+        self.model = BoardModel(grid)
+        resized = len(grid) != self.size or not self.rects
         self.size = len(grid)
-        
-        button_width, button_height, font_size, padding = self.calculate_responsive_dimensions(self.size)
-        
-        for r, row in enumerate(grid):
-            row_btns = []
-            for c, ch in enumerate(row):
-                b = tk.Button(self.frame, text=ch, 
-                            width=button_width, 
-                            height=button_height,
-                            font=("Consolas", font_size, "bold"),
-                            bg='#ecf0f1', fg='#2c3e50',
-                            activebackground='#bdc3c7',
-                            relief='raised', bd=2,
-                            cursor='hand2')
-                
-                b.bind('<Button-1>', lambda e, r=r, c=c: self.on_letter_click(r, c))
-                
-                b.grid(row=r, column=c, padx=padding, pady=padding)
-                row_btns.append(b)
-            self.buttons.append(row_btns)
-        
-        self.update_word_display()
+        self.canvas.delete('number')
+        self.numbers.clear()
 
-    def on_letter_click(self, r, c):
-        coord = {"r": r, "c": c}
-        
-        if coord in self.selected_letters:
-            index = self.selected_letters.index(coord)
-            removed_letters = self.selected_letters[index:]
-            self.selected_letters = self.selected_letters[:index]
-            
-            for letter_coord in removed_letters:
-                btn = self.buttons[letter_coord["r"]][letter_coord["c"]]
-                if btn['state'] != 'disabled':
-                    current_text = btn.cget('text')
-                    if '\n' in current_text:
-                        original_text = current_text.split('\n')[0]
-                    else:
-                        original_text = ''.join(char for char in current_text if char.isalpha())
-                        if not original_text:
-                            original_text = current_text[0] if current_text else 'A'
-                    
-                    btn.config(bg='#ecf0f1', fg='#2c3e50', text=original_text)
-            
-            self.renumber_selected_letters()
+        if resized:
+            self._layout()
+            previous = BoardModel()
         else:
-            self.selected_letters.append(coord)
-            
-            color_index = (len(self.selected_letters) - 1) % len(self.selection_colors)
-            color = self.selection_colors[color_index]
-            
-            btn = self.buttons[r][c]
-            original_text = btn.cget('text').split('\n')[0]
-            
-            number = str(len(self.selected_letters))
-            display_text = f"{original_text}\n{number}"
-            
-            btn.config(bg=color, fg='white', text=display_text)
-            
+            # Mismo tamano: se reutilizan los items, solo cambian colores y letras
+            self.canvas.itemconfigure('cell', fill='#ecf0f1')
+            self.canvas.itemconfigure('letter', fill='#2c3e50')
+
+        old_letters = previous.letters
+        for i, ch in enumerate(self.model.letters):
+            if i >= len(old_letters) or old_letters[i] != ch:
+                self.canvas.itemconfigure(self.letters[i], text=ch)
+
         self.update_word_display()
 
-    def renumber_selected_letters(self):
-        for i, coord in enumerate(self.selected_letters):
-            if coord:
-                btn = self.buttons[coord["r"]][coord["c"]]
-                if btn['state'] != 'disabled':
-                    current_text = btn.cget('text')
-                    if '\n' in current_text:
-                        original_text = current_text.split('\n')[0]
-                    else:
-                        original_text = ''.join(char for char in current_text if char.isalpha())
-                        if not original_text:
-                            original_text = current_text[0] if current_text else 'A'
-                    
-                    color_index = i % len(self.selection_colors)
-                    color = self.selection_colors[color_index]
-                    
-                    number = str(i + 1)
-                    display_text = f"{original_text}\n{number}"
-                    
-                    btn.config(bg=color, fg='white', text=display_text)
+    def _layout(self):
+        """Ajusta la cantidad y posicion de los items al tamano actual.
 
-    def update_word_display(self):
-        if self.selected_letters:
-            word = ""
-            for coord in self.selected_letters:
-                btn = self.buttons[coord["r"]][coord["c"]]
-                letter = btn.cget('text').split('\n')[0]
-                word += letter
-            display_text = f"Palabra: {word}"
+        Los items que ya existen se mueven; solo se crean o borran los que sobran o faltan.
+        """
+        self.cell, font_size, view_width, view_height = self.calculate_responsive_dimensions(self.size)
+        self.letter_font = ("Consolas", font_size, "bold")
+        self.number_font = ("Arial", max(6, font_size // 2), "bold")
+        cell = self.cell
+
+        count = self.size * self.size
+        while len(self.rects) > count:
+            self.canvas.delete(self.rects.pop())
+            self.canvas.delete(self.letters.pop())
+        while len(self.rects) < count:
+            self.rects.append(self.canvas.create_rectangle(0, 0, 0, 0, outline='#bdc3c7', tags=('cell',)))
+            self.letters.append(self.canvas.create_text(0, 0, tags=('letter',)))
+
+        for i in range(count):
+            r, c = divmod(i, self.size)
+            x, y = c * cell, r * cell
+            self.canvas.coords(self.rects[i], x + 1, y + 1, x + cell - 1, y + cell - 1)
+            self.canvas.coords(self.letters[i], x + cell // 2, y + cell // 2)
+        self.canvas.itemconfigure('cell', fill='#ecf0f1')
+        self.canvas.itemconfigure('letter', fill='#2c3e50', font=self.letter_font, text='')
+
+        total = cell * self.size
+        self.canvas.configure(width=view_width, height=view_height, scrollregion=(0, 0, total, total))
+        self._show_scrollbars(total > view_width, total > view_height)
+
+    def _show_scrollbars(self, horizontal, vertical):
+        if horizontal:
+            self.xscroll.grid(row=1, column=0, sticky='ew')
+        else:
+            self.xscroll.grid_remove()
+        if vertical:
+            self.yscroll.grid(row=0, column=1, sticky='ns')
         else:
-            display_text = "Palabra: "
-        
+            self.yscroll.grid_remove()
+
+    def _on_click(self, event):
+        if not self.cell:
+            return
+        c = int(self.canvas.canvasx(event.x) // self.cell)
+        r = int(self.canvas.canvasy(event.y) // self.cell)
+        if 0 <= r < self.size and 0 <= c < self.size:
+            self.on_letter_click(r, c)
+
+    def _paint(self, r, c, fill, text_color):
+        i = r * self.size + c
+        self.canvas.itemconfigure(self.rects[i], fill=fill)
+        self.canvas.itemconfigure(self.letters[i], fill=text_color)
+
+    def _set_number(self, r, c, number):
+        i = r * self.size + c
+        item = self.numbers.get(i)
+        if number is None:
+            if item is not None:
+                self.canvas.delete(self.numbers.pop(i))
+        elif item is None:
+            x, y = c * self.cell + self.cell - 3, r * self.cell + self.cell - 2
+            self.numbers[i] = self.canvas.create_text(x, y, text=str(number), anchor='se',
+                                                      font=self.number_font, fill='white', tags=('number',))
+        else:
+            self.canvas.itemconfigure(item, text=str(number))
+
+    def _restore(self, r, c):
+        # Vuelve la celda a su aspecto sin seleccion: el color de su palabra o el normal
+        self._set_number(r, c, None)
+        color = self.model.locked_color(r, c)
+        if color is None:
+            self._paint(r, c, '#ecf0f1', '#2c3e50')
+        else:
+            self._paint(r, c, color, 'white')
+
+    def on_letter_click(self, r, c):
+        added, removed = self.model.toggle(r, c)
+
+        for cell in removed:
+            self._restore(*cell)
+
+        for r, c in added:
+            number = self.model.number(r, c)
+            color = self.selection_colors[(number - 1) % len(self.selection_colors)]
+            self._paint(r, c, color, 'white')
+            self._set_number(r, c, number)
+
+        self.update_word_display()
+
+    def update_word_display(self):
+        display_text = f"Palabra: {self.model.word}"
+
         if self.on_word_update:
             self.on_word_update(display_text)
 
     def verify_selection(self):
-        if len(self.selected_letters) < 2:
+        endpoints = self.model.endpoints()
+        if endpoints is None:
             return
-        
-        start = self.selected_letters[0]
-        end = self.selected_letters[-1]
-        
-        if not self.is_straight_line(self.selected_letters):
+
+        if not self.model.is_straight_line():
             self.clear_with_feedback()
             return
-        
-        self.on_verify(start, end)
+
+        (r0, c0), (r1, c1) = endpoints
+        self.on_verify({"r": r0, "c": c0}, {"r": r1, "c": c1})
 
     def clear_selection(self):
-        for coord in self.selected_letters:
-            btn = self.buttons[coord["r"]][coord["c"]]
-            if btn['state'] != 'disabled':
-                current_text = btn.cget('text')
-                if '\n' in current_text:
-                    original_text = current_text.split('\n')[0]
-                else:
-                    original_text = ''.join(char for char in current_text if char.isalpha())
-                    if not original_text:
-                        original_text = current_text[0] if current_text else 'A'
-                
-                btn.config(bg='#ecf0f1', fg='#2c3e50', text=original_text)
-        
-        self.selected_letters.clear()
+        for cell in self.model.clear():
+            self._restore(*cell)
+
         self.update_word_display()
         self.on_clear()
 
     def clear_with_feedback(self):
-        for coord in self.selected_letters:
-            btn = self.buttons[coord["r"]][coord["c"]]
-            if btn['state'] != 'disabled':
-                btn.config(bg='#e74c3c', fg='white')
-        
-        self.word_label.after(500, self.clear_selection)
-
-    def is_straight_line(self, coords):
-        if len(coords) < 2:
-            return True
-        
-        dr = coords[1]["r"] - coords[0]["r"]
-        dc = coords[1]["c"] - coords[0]["c"]
-        
-        if dr != 0:
-            dr = dr // abs(dr)
-        if dc != 0:
-            dc = dc // abs(dc)
-        
-        for i in range(1, len(coords)):
-            expected_r = coords[0]["r"] + i * dr
-            expected_c = coords[0]["c"] + i * dc
-            
-            if coords[i]["r"] != expected_r or coords[i]["c"] != expected_c:
-                return False
-        
-        return True
+        for r, c in self.model.selection:
+            self._paint(r, c, '#e74c3c', 'white')
+
+        self.canvas.after(500, self.clear_selection)
 
     def highlight(self, path, color="#27ae60"):
-        for coord in path:
-            btn = self.buttons[coord["r"]][coord["c"]]
-            btn.config(bg=color, fg='white', state='disabled')
\ No newline at end of file
+        cells = [(coord["r"], coord["c"]) for coord in path]
+        self.model.lock(cells, color)
+        for r, c in cells:
+            self._paint(r, c, color, 'white')
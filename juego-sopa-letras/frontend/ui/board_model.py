@@ -0,0 +1,119 @@
+"""Estado del tablero independiente de Tk.
+
+Las celdas se identifican por su indice plano r * size + c; hacia afuera se
+exponen como tuplas (r, c). La seleccion es una secuencia ordenada con un dict
+de posiciones, asi que saber si una celda esta seleccionada, agregarla o
+cortar la seleccion desde ella cuesta O(1) por celda afectada. La palabra
+seleccionada se mantiene en un buffer que crece y se recorta con la seleccion.
+"""
+
+SELECTED = 1
+LOCKED = 2
+
+
+class BoardModel:
+    __slots__ = ("size", "letters", "flags", "locked_colors", "_selection", "_positions", "_word")
+
+    def __init__(self, grid=()):
+        self.load(grid)
+
+    def load(self, grid):
+        self.size = len(grid)
+        self.letters = "".join(grid)
+        self.flags = bytearray(len(self.letters))
+        # Color de la palabra encontrada que ocupa cada celda bloqueada
+        self.locked_colors = {}
+        self._selection = []
+        self._positions = {}
+        self._word = []
+
+    def index(self, r, c):
+        return r * self.size + c
+
+    def cell(self, i):
+        return divmod(i, self.size)
+
+    def letter(self, r, c):
+        return self.letters[r * self.size + c]
+
+    def row(self, r):
+        return self.letters[r * self.size:(r + 1) * self.size]
+
+    def is_selected(self, r, c):
+        return bool(self.flags[r * self.size + c] & SELECTED)
+
+    def is_locked(self, r, c):
+        return bool(self.flags[r * self.size + c] & LOCKED)
+
+    def locked_color(self, r, c):
+        return self.locked_colors.get(r * self.size + c)
+
+    def number(self, r, c):
+        """Posicion (desde 1) de la celda en la seleccion, o None."""
+        position = self._positions.get(r * self.size + c)
+        return None if position is None else position + 1
+
+    @property
+    def selection(self):
+        return [self.cell(i) for i in self._selection]
+
+    @property
+    def word(self):
+        return "".join(self._word)
+
+    def __len__(self):
+        return len(self._selection)
+
+    def toggle(self, r, c):
+        """Agrega la celda al final de la seleccion o, si ya estaba, corta la seleccion desde ella.
+
+        Devuelve (agregadas, quitadas) como listas de (r, c).
+        """
+        i = r * self.size + c
+        position = self._positions.get(i)
+        if position is None:
+            self._positions[i] = len(self._selection)
+            self._selection.append(i)
+            self._word.append(self.letters[i])
+            self.flags[i] |= SELECTED
+            return [(r, c)], []
+        return [], self._truncate(position)
+
+    def clear(self):
+        """Vacia la seleccion y devuelve las celdas que estaban seleccionadas."""
+        return self._truncate(0)
+
+    def _truncate(self, position):
+        removed = self._selection[position:]
+        del self._selection[position:]
+        del self._word[position:]
+        for i in removed:
+            del self._positions[i]
+            self.flags[i] &= ~SELECTED
+        return [self.cell(i) for i in removed]
+
+    def lock(self, cells, color):
+        """Marca como encontradas las celdas (r, c) dadas, con el color de su palabra."""
+        for r, c in cells:
+            i = r * self.size + c
+            self.flags[i] |= LOCKED
+            self.locked_colors[i] = color
+
+    def endpoints(self):
+        """Primera y ultima celda seleccionadas, o None si hay menos de dos."""
+        if len(self._selection) < 2:
+            return None
+        return self.cell(self._selection[0]), self.cell(self._selection[-1])
+
+    def is_straight_line(self):
+        if len(self._selection) < 2:
+            return True
+        r0, c0 = self.cell(self._selection[0])
+        r1, c1 = self.cell(self._selection[1])
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        for k, i in enumerate(self._selection):
+            r, c = self.cell(i)
+            if r != r0 + k * dr or c != c0 + k * dc:
+                return False
+        return True
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga local de los dos juegos con N jugadores virtuales simultaneos.
+
+Cada jugador es un hilo que repite partidas completas:
+    ahorcado: start y letras al azar hasta ganar o perder (HangmanClient)
+    sopa:     generate, validate de cada palabra colocada y solve (services/backend.py)
+esperando un tiempo de "pensar" entre acciones. Los jugadores entran de a
+grupos a lo largo de la rampa. Al final se informa, por operacion,
+throughput, latencias p50/p95/p99 y tasa de errores, en consola y en JSON.
+
+Ejemplos:
+    python load_test.py --game hangman --players 50 --ramp 10 --duration 60
+    python load_test.py --game both --players 20 --games 3 --think 100 --json carga.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-ahorcado", "frontend"))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+LETTERS = "ABCDEFGHIJKLMNÑOPQRSTUVWXYZ"
+
+
+def percentile(ordered, p):
+    """Percentil por rango mas cercano sobre una lista ya ordenada."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[int(rank) - 1]
+
+
+class Recorder:
+    """Latencias y errores por operacion, compartido por todos los jugadores."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._errors = Counter()
+        self._error_samples = {}
+        self.games = Counter()
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def measure(self, op, fn, *args, check=None, **kwargs):
+        """Ejecuta fn y registra su latencia; `check(resultado)` devuelve un error o None."""
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            error = check(result) if check else None
+        except Exception as e:
+            result, error = None, f"{type(e).__name__}: {e}"
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._latencies.setdefault(op, []).append(elapsed)
+            if error:
+                self._errors[op] += 1
+                self._error_samples.setdefault(op, error)
+        if error:
+            raise OperationFailed(op, error)
+        return result
+
+    def game(self, outcome):
+        with self._lock:
+            self.games[outcome] += 1
+
+    def report(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        operations = {}
+        with self._lock:
+            for op, latencies in sorted(self._latencies.items()):
+                ordered = sorted(latencies)
+                errors = self._errors[op]
+                operations[op] = {
+                    "count": len(ordered),
+                    "errors": errors,
+                    "error_rate": errors / len(ordered),
+                    "throughput": len(ordered) / elapsed if elapsed else 0.0,
+                    "mean_ms": sum(ordered) / len(ordered),
+                    "p50_ms": percentile(ordered, 50),
+                    "p95_ms": percentile(ordered, 95),
+                    "p99_ms": percentile(ordered, 99),
+                    "max_ms": ordered[-1],
+                }
+                if op in self._error_samples:
+                    operations[op]["first_error"] = self._error_samples[op]
+            total = sum(o["count"] for o in operations.values())
+            errors = sum(o["errors"] for o in operations.values())
+            return {
+                "elapsed_s": elapsed,
+                "operations": operations,
+                "total": {
+                    "count": total,
+                    "errors": errors,
+                    "error_rate": errors / total if total else 0.0,
+                    "throughput": total / elapsed if elapsed else 0.0,
+                },
+                "games": dict(self.games),
+            }
+
+
+class OperationFailed(Exception):
+    def __init__(self, op, error):
+        super().__init__(f"{op}: {error}")
+        self.op = op
+
+
+class Player(threading.Thread):
+    """Jugador virtual: juega partidas hasta completar `games` o hasta el `deadline`."""
+
+    def __init__(self, number, recorder, options, deadline):
+        super().__init__(name=f"player-{number}", daemon=True)
+        self.number = number
+        self.recorder = recorder
+        self.options = options
+        self.deadline = deadline
+        self.rng = random.Random(options.seed * 1000003 + number)
+
+    def think(self):
+        # Espera entre acciones con +-50% de variacion para no sincronizar a los jugadores
+        if self.options.think > 0:
+            time.sleep(self.options.think / 1000 * self.rng.uniform(0.5, 1.5))
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def run(self):
+        played = 0
+        while not self.expired() and (self.deadline is not None or played < self.options.games):
+            try:
+                self.recorder.game(f"{self.kind}.{self.play()}")
+            except OperationFailed:
+                self.recorder.game(f"{self.kind}.failed")
+            played += 1
+
+
+class HangmanPlayer(Player):
+    kind = "hangman"
+
+    def __init__(self, number, recorder, options, deadline, server):
+        super().__init__(number, recorder, options, deadline)
+        from hangman_client import HangmanClient
+        self.client = HangmanClient(f"load-{options.run_id}-{number}", server=server)
+
+    @staticmethod
+    def _check(view):
+        return view.message if view.status == "error" else None
+
+    def play(self):
+        measure = self.recorder.measure
+        view = measure("hangman.start", self.client.start_game, check=self._check)
+        letters = list(LETTERS)
+        self.rng.shuffle(letters)
+        while not view.over and letters and not self.expired():
+            self.think()
+            view = measure("hangman.guess", self.client.make_guess, letters.pop(), check=self._check)
+        return view.status if view.over else "unfinished"
+
+
+class SopaPlayer(Player):
+    kind = "sopa"
+
+    def __init__(self, number, recorder, options, deadline, words):
+        super().__init__(number, recorder, options, deadline)
+        from services import backend
+        self.backend = backend
+        self.words = words
+
+    def play(self):
+        measure = self.recorder.measure
+        size = self.options.size
+        board = measure("sopa.generate", self.backend.generate, self.words.draw(size),
+                        size=size, seed=self.rng.randint(1, 1_000_000))
+        remaining = [p["word"] for p in board["placements"]]
+        for placement in board["placements"]:
+            self.think()
+            path = placement["path"]
+            # El backend tiene que reconocer cada palabra en la posicion en que la coloco
+            measure("sopa.validate", self.backend.validate, board["grid"], list(remaining),
+                    path[0], path[-1],
+                    check=lambda r, w=placement["word"]: None if r["found"] and r["word"] == w
+                    else f"no reconocio {w}")
+            remaining.remove(placement["word"])
+        self.think()
+        words = [p["word"] for p in board["placements"]]
+        measure("sopa.solve", self.backend.solve, board["grid"], words,
+                check=lambda r: None if {s["word"] for s in r["solutions"]} >= set(words)
+                else "faltan palabras en la solucion")
+        return "completed"
+
+
+def _hangman_server(options):
+    import hangman_server
+    if options.workers > 1:
+        from hangman_gateway import HangmanGateway
+        return HangmanGateway(workers=options.workers)
+    return hangman_server.HangmanServer()
+
+
+def _sopa_words(options):
+    from services.dictionary import Dictionary, WordSampler
+    path = os.environ.get("SOPA_DICTIONARY") or os.path.join(
+        project_root, "juego-sopa-letras", "data", "words.txt")
+    return WordSampler(Dictionary.open(path), per_game=options.words)
+
+
+def run(options):
+    """Lanza los jugadores segun la rampa y devuelve el reporte."""
+    recorder = Recorder()
+    deadline = time.monotonic() + options.ramp + options.duration if options.duration else None
+    kinds = ["hangman", "sopa"] if options.game == "both" else [options.game]
+    hangman = _hangman_server(options) if "hangman" in kinds else None
+    words = _sopa_words(options) if "sopa" in kinds else None
+
+    players = []
+    for i in range(options.players):
+        kind = kinds[i % len(kinds)]
+        if kind == "hangman":
+            players.append(HangmanPlayer(i, recorder, options, deadline, hangman))
+        else:
+            players.append(SopaPlayer(i, recorder, options, deadline, words))
+
+    # Rampa lineal: los jugadores entran de a `ramp_step` repartidos en `ramp` segundos
+    groups = [players[i:i + options.ramp_step] for i in range(0, len(players), options.ramp_step)]
+    pause = options.ramp / (len(groups) - 1) if len(groups) > 1 else 0.0
+    recorder.started = time.perf_counter()
+    try:
+        for n, group in enumerate(groups):
+            if n:
+                time.sleep(pause)
+            for player in group:
+                player.start()
+        for player in players:
+            player.join()
+    finally:
+        recorder.finished = time.perf_counter()
+        workers = hangman.stats() if hasattr(hangman, "stats") else None
+        if hangman is not None:
+            hangman.close()
+    report = recorder.report()
+    report["config"] = {k: v for k, v in vars(options).items() if k != "json"}
+    if workers is not None:
+        report["hangman_workers"] = workers
+    return report
+
+
+def print_summary(report, out=sys.stdout):
+    config = report["config"]
+    print(f"\n{config['players']} jugadores ({config['game']}), {report['elapsed_s']:.1f} s", file=out)
+    header = f"{'operacion':<16}{'total':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errores':>9}"
+    print(header, file=out)
+    print("-" * len(header), file=out)
+    for op, stats in report["operations"].items():
+        print(f"{op:<16}{stats['count']:>8}{stats['throughput']:>9.1f}{stats['p50_ms']:>9.1f}"
+              f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}"
+              f"{stats['error_rate']:>8.1%} ", file=out)
+    total = report["total"]
+    print("-" * len(header), file=out)
+    print(f"{'total':<16}{total['count']:>8}{total['throughput']:>9.1f}{'':>36}{total['error_rate']:>8.1%} ",
+          file=out)
+    if report["games"]:
+        print("partidas: " + ", ".join(f"{k}={v}" for k, v in sorted(report["games"].items())), file=out)
+    for op, stats in report["operations"].items():
+        if "first_error" in stats:
+            print(f"primer error en {op}: {stats['first_error']}", file=out)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga local del ahorcado y la sopa de letras")
+    parser.add_argument("--game", choices=("hangman", "sopa", "both"), default="both")
+    parser.add_argument("--players", type=int, default=10, help="jugadores virtuales simultaneos")
+    parser.add_argument("--games", type=int, default=3, help="partidas por jugador (sin --duration)")
+    parser.add_argument("--duration", type=float, default=0,
+                        help="segundos de carga despues de la rampa; reemplaza a --games")
+    parser.add_argument("--ramp", type=float, default=0, help="segundos para que entren todos los jugadores")
+    parser.add_argument("--ramp-step", type=int, default=1, help="jugadores que entran juntos en la rampa")
+    parser.add_argument("--think", type=float, default=0, help="ms de espera media entre acciones")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos del ahorcado; con mas de uno se usa HangmanGateway")
+    parser.add_argument("--size", type=int, default=15, help="tamano de los tableros de la sopa")
+    parser.add_argument("--words", type=int, default=None, help="palabras por tablero de la sopa")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="archivo donde guardar el reporte ('-' para la salida estandar)")
+    options = parser.parse_args(argv)
+    if options.players < 1 or options.ramp_step < 1:
+        parser.error("--players y --ramp-step deben ser positivos")
+    options.run_id = f"{os.getpid()}-{int(time.time())}"
+    return options
+
+
+def main(argv=None):
+    options = parse_args(argv)
+    # Las partidas de prueba van a un diario propio, no al del juego
+    if "HANGMAN_JOURNAL" not in os.environ:
+        journal_dir = tempfile.mkdtemp(prefix="hangman-load-")
+        os.environ["HANGMAN_JOURNAL"] = os.path.join(journal_dir, "sessions.journal")
+    report = run(options)
+    if options.json == "-":
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        print_summary(report, out=sys.stderr)
+    else:
+        if options.json:
+            with open(options.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        print_summary(report)
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
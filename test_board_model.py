@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pruebas del estado del tablero de la sopa de letras, sin abrir ventanas
+"""
+
+import sys
+import os
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from ui.board_model import BoardModel
+
+
+def test_seleccion_y_palabra():
+    """La palabra se arma y se recorta junto con la seleccion"""
+    model = BoardModel(["GATO", "XXXX", "XXXX", "XXXX"])
+    for c in range(4):
+        assert model.toggle(0, c) == ([(0, c)], [])
+    assert model.word == "GATO"
+    assert model.number(0, 3) == 4
+
+    # Volver a tocar una celda corta la seleccion desde ella
+    assert model.toggle(0, 2) == ([], [(0, 2), (0, 3)])
+    assert model.word == "GA"
+    assert not model.is_selected(0, 3)
+    assert model.number(0, 2) is None
+
+    assert model.clear() == [(0, 0), (0, 1)]
+    assert model.word == "" and len(model) == 0
+
+
+def test_linea_recta_y_extremos():
+    """Solo filas, columnas y diagonales contiguas son selecciones validas"""
+    model = BoardModel(["ABC", "DEF", "GHI"])
+    assert model.endpoints() is None
+    for cell in [(0, 0), (1, 1), (2, 2)]:
+        model.toggle(*cell)
+    assert model.is_straight_line()
+    assert model.endpoints() == ((0, 0), (2, 2))
+    assert model.word == "AEI"
+
+    model.clear()
+    for cell in [(0, 0), (0, 1), (1, 1)]:
+        model.toggle(*cell)
+    assert not model.is_straight_line()
+
+
+def test_celdas_encontradas():
+    """Las celdas bloqueadas recuerdan el color de su palabra y siguen siendo seleccionables"""
+    model = BoardModel(["AB", "CD"])
+    model.lock([(0, 0), (1, 1)], "#27ae60")
+    assert model.is_locked(0, 0) and model.locked_color(1, 1) == "#27ae60"
+    assert model.locked_color(0, 1) is None
+    model.toggle(0, 0)
+    assert model.is_selected(0, 0) and model.is_locked(0, 0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Pruebas del pool de tableros pregenerados de la sopa de letras, sin backend
+"""
+
+import sys
+import os
+import time
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from services.board_pool import BoardPool
+
+
+def _wait(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "el pool no llego al estado esperado"
+        time.sleep(0.01)
+
+
+def _generate(words, size=None):
+    return {"grid": ["X" * size] * size, "words": words}
+
+
+def test_acierto_fallo_y_desalojo():
+    """Sin tableros listos se informa un fallo; luego el hilo rellena y hay aciertos"""
+    pool = BoardPool(_generate, per_key=2, max_keys=1)
+    try:
+        assert pool.take(10, ["GATO"]) is None
+        _wait(lambda: pool.stats()["ready"].get((10, ("GATO",))) == 2)
+        board = pool.take(10, ["GATO"])
+        assert board["words"] == ["GATO"] and len(board["grid"]) == 10
+        stats = pool.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+        # Con max_keys=1 una clave nueva desaloja la anterior junto con sus tableros
+        _wait(lambda: pool.stats()["ready"].get((10, ("GATO",))) == 2)
+        pool.prefill(12, ["SOL"])
+        stats = pool.stats()
+        assert list(stats["ready"]) == [(12, ("SOL",))]
+        assert stats["evicted"] == 2
+    finally:
+        pool.close()
+
+
+def test_errores_del_backend():
+    """Una excepcion cuenta como error y el hilo espera antes de reintentar"""
+    calls = []
+
+    def failing(words, size=None):
+        calls.append(words)
+        raise RuntimeError("backend caido")
+
+    pool = BoardPool(failing)
+    try:
+        pool.prefill(10, ["GATO"])
+        _wait(lambda: pool.stats()["errors"] == 1)
+        time.sleep(0.1)
+        assert len(calls) == 1
+    finally:
+        pool.close()
+
+
+def test_tanda_sin_tableros():
+    """Si fallan todos los specs de una tanda cuenta un error por tablero y el hilo espera"""
+    calls = []
+
+    def batch(specs):
+        calls.append(specs)
+        return [{"error": "no cabe"} for _ in specs]
+
+    pool = BoardPool(_generate, generate_batch_fn=batch)
+    try:
+        pool.prefill(10, ["GATO"])
+        _wait(lambda: pool.stats()["errors"] == 3)
+        time.sleep(0.1)
+        assert len(calls) == 1 and len(calls[0]) == 3
+        assert pool.stats()["generated"] == 0
+    finally:
+        pool.close()
+
+
+def test_tanda_parcial():
+    """Los specs que fallan en una tanda cuentan una sola vez y los tableros buenos se guardan"""
+    calls = []
+
+    def batch(specs):
+        calls.append(specs)
+        if len(calls) == 1:
+            return [_generate(specs[0]["words"], size=10), {"error": "no cabe"}, {"error": "no cabe"}]
+        return [_generate(spec["words"], size=10) for spec in specs]
+
+    pool = BoardPool(_generate, generate_batch_fn=batch)
+    try:
+        pool.prefill(10, ["GATO"])
+        _wait(lambda: pool.stats()["ready"].get((10, ("GATO",))) == 3)
+        stats = pool.stats()
+        assert stats["errors"] == 2 and stats["generated"] == 3
+        assert [len(specs) for specs in calls] == [3, 2]
+    finally:
+        pool.close()
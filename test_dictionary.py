@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Pruebas del diccionario indexado de la sopa de letras
+"""
+
+import sys
+import os
+import random
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from services.dictionary import Dictionary, WordSampler, normalize
+
+
+def _write(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_normalizacion():
+    """Mayusculas sin acentos; se descartan las cortas y las que no son letras"""
+    assert normalize("  canción\n") == "CANCION"
+    assert normalize("niño") == "NINO"
+    assert normalize("ab") is None
+    assert normalize("hola mundo") is None
+    assert normalize("abc1") is None
+
+
+def test_indice_agrupado_por_longitud(tmp_path):
+    """Palabras unicas, ordenadas y agrupadas por longitud"""
+    source = _write(tmp_path / "words.txt", ["gato", "Sol", "GATO", "perro", "árbol", "x", "luna"])
+    dictionary = Dictionary.open(source)
+    assert len(dictionary) == 5
+    assert dictionary.lengths == [3, 4, 5]
+    assert [dictionary.word(4, k) for k in range(dictionary.count(4))] == ["GATO", "LUNA"]
+    assert dictionary.word(5, 0) == "ARBOL"
+
+
+def test_reabrir_y_reconstruir(tmp_path):
+    """El indice se reutiliza al reabrir y se reconstruye si el diccionario cambia"""
+    source = _write(tmp_path / "words.txt", ["gato", "perro"])
+    Dictionary.open(source)
+    index_dir = tmp_path / ".index"
+    (first,) = os.listdir(index_dir)
+    mtime = os.stat(index_dir / first).st_mtime_ns
+    assert len(Dictionary.open(source)) == 2
+    assert os.stat(index_dir / first).st_mtime_ns == mtime
+
+    _write(tmp_path / "words.txt", ["gato", "perro", "caballo"])
+    os.utime(source, ns=(mtime + 10**9, mtime + 10**9))
+    assert len(Dictionary.open(source)) == 3
+    # El indice viejo se borra al crear el nuevo
+    assert len(os.listdir(index_dir)) == 1 and os.listdir(index_dir)[0] != first
+
+
+def test_sorteo(tmp_path):
+    """El sorteo respeta la longitud maxima y no repite palabras"""
+    words = [w * k for w in "ABCDEFGH" for k in range(3, 9)]
+    dictionary = Dictionary.open(_write(tmp_path / "words.txt", words))
+    rng = random.Random(3)
+    sample = dictionary.sample(10, max_length=5, rng=rng)
+    assert len(sample) == 10 and len(set(sample)) == 10
+    assert all(3 <= len(w) <= 5 for w in sample)
+    # Si se piden mas palabras de las que hay se devuelven todas las elegibles
+    assert len(dictionary.sample(100, max_length=4, rng=rng)) == 16
+
+
+def test_sampler_completa_diccionarios_chicos(tmp_path):
+    """Con menos palabras que las de una partida se completa con las palabras fijas"""
+    sampler = WordSampler(Dictionary.open(_write(tmp_path / "words.txt", ["gato", "perro"])))
+    words = sampler.draw(15, rng=random.Random(1))
+    assert len(words) == sampler.words_for(15) == 5
+    assert {"GATO", "PERRO"} <= set(words) and len(set(words)) == 5
+    assert all(len(w) <= 6 for w in sampler.draw(6, rng=random.Random(2)))
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Pruebas del estado de la partida del ahorcado (GameState.fs) a traves del backend F#
+
+Se saltan si el backend no se puede compilar en esta maquina.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "juego-ahorcado", "frontend"))
+
+from compartido import launcher
+from hangman_client import MASK_SEPARATOR
+from hangman_server import HangmanServer
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Proceso `serve` con un diario propio en un directorio temporal."""
+    try:
+        command = launcher.command(launcher.AHORCADO, "serve")
+    except RuntimeError as e:
+        pytest.skip(f"backend F# no disponible: {e}")
+    monkeypatch.setenv("HANGMAN_JOURNAL", str(tmp_path / "sessions.journal"))
+    backend = HangmanServer(lambda: command, cwd=str(tmp_path))
+    yield backend
+    backend.close()
+
+
+def _positions(view):
+    """Un caracter por posicion de la palabra."""
+    return view["masked"].split(MASK_SEPARATOR)
+
+
+def test_frase_con_espacios_y_guiones(server):
+    """Los caracteres que no son letras se muestran desde el principio y no hay que adivinarlos"""
+    start = server.request(["start", "p", "hola mundo-x"])
+    assert _positions(start) == list("____ _____-_")
+    view = server.request(["guess", "p", "o"])
+    assert _positions(view) == list("_O__ ____O-_")
+    assert view["remaining"] == 6
+    for letter in "HLAMUNDX":
+        view = server.request(["guess", "p", letter])
+    assert view["status"] == "won" and view["word"] == "HOLA MUNDO-X"
+
+
+
+def test_espacios_de_la_frase_no_se_confunden_con_el_separador(server):
+    """Cada espacio de la frase ocupa su propia posicion, separada de las letras vecinas"""
+    view = server.request(["start", "e", "A  B"])
+    assert _positions(view) == ["_", " ", " ", "_"]
+    view = server.request(["guess", "e", "A"])
+    assert _positions(view) == ["A", " ", " ", "_"]
+
+
+def test_palabra_sin_letras_se_rechaza(server):
+    """Sin letras para adivinar la partida se ganaria sola: no se crea"""
+    for word in ["123", " - ", ""]:
+        view = server.request(["start", "x", word])
+        assert view["status"] == "error"
+        assert server.request(["status", "x"])["status"] == "error"
+    view = server.request(["start", "x", "A" + MASK_SEPARATOR + "B"])
+    assert view["status"] == "error"
+
+def test_intentos_invalidos_y_repetidos(server):
+    """Ni un caracter que no es letra ni una letra repetida gastan intentos"""
+    server.request(["start", "g", "GATO"])
+    view = server.request(["guess", "g", "1"])
+    assert view["message"] == "Ingresa solo una letra" and view["remaining"] == 6
+    server.request(["guess", "g", "Z"])
+    view = server.request(["guess", "g", "z"])
+    assert view["message"] == "Ya intentaste esta letra"
+    assert view["remaining"] == 5 and view["incorrect"] == ["Z"]
+
+
+def test_letras_con_tilde_y_enie(server):
+    """Ñ y las vocales con tilde son letras propias del alfabeto"""
+    server.request(["start", "n", "ÑANDÚ"])
+    view = server.request(["guess", "n", "ñ"])
+    assert _positions(view) == list("Ñ____")
+    view = server.request(["guess", "n", "U"])
+    assert view["incorrect"] == ["U"]
+    view = server.request(["guess", "n", "Ú"])
+    assert _positions(view) == list("Ñ___Ú")
+
+
+def test_partida_terminada_y_restaurada(server):
+    """Tras perder no se aceptan mas intentos, y la partida se recupera igual del diario"""
+    server.request(["start", "t", "SOL"])
+    server.request(["guess", "t", "O"])
+    for letter in "ABCDEF":
+        view = server.request(["guess", "t", letter])
+    assert view["status"] == "lost" and view["remaining"] == 0
+    view = server.request(["guess", "t", "S"])
+    assert view["status"] == "lost" and _positions(view) == list("_O_")
+
+    # Otro proceso reconstruye la partida a partir de sus intentos
+    server.request(["release", "t"])
+    restored = server.request(["status", "t"])
+    assert _positions(restored) == list("_O_") and restored["status"] == "lost"
+    assert restored["incorrect"] == list("ABCDEF")
+
+
+def test_modo_por_comando_lee_del_indice(server, tmp_path):
+    """Una llamada por linea de comandos encuentra la partida por el indice, y lo rearma si falta"""
+    server.request(["start", "c", "LUNA"])
+    server.request(["guess", "c", "U"])
+    server.request(["guess", "c", "X"])
+    server.close()
+
+    def status():
+        command = launcher.command(launcher.AHORCADO, "status", "c")
+        out = subprocess.run(command, cwd=str(tmp_path), capture_output=True, text=True, timeout=60)
+        return json.loads(out.stdout)
+
+    assert (tmp_path / "sessions.journal.idx").exists()
+    view = status()
+    assert _positions(view) == list("_U__") and view["incorrect"] == ["X"]
+    (tmp_path / "sessions.journal.idx").unlink()
+    assert status() == view
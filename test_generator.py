@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Pruebas del generador de tableros de la sopa de letras (Generator.fs) a traves de Sopa.Cli
+
+Se saltan si el backend no se puede compilar en esta maquina.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from compartido import launcher
+from services.backend import CliServer
+
+
+@pytest.fixture(scope="module")
+def cli():
+    try:
+        launcher.command(launcher.SOPA, "serve")
+    except RuntimeError as e:
+        pytest.skip(f"backend F# no disponible: {e}")
+    server = CliServer(lambda op: launcher.command(launcher.SOPA, op))
+    yield server
+    server.close()
+
+
+def _generate(cli, words, size, seed, max_backtracks=None):
+    payload = {"words": words, "size": size, "seed": seed}
+    if max_backtracks is not None:
+        payload["maxBacktracks"] = max_backtracks
+    return cli.call("generate", lambda _enc: payload)
+
+
+def _check_board(board, words):
+    """Cada palabra colocada se lee en la grilla a lo largo de su camino"""
+    grid = board["grid"]
+    for placement in board["placements"]:
+        assert "".join(grid[p["r"]][p["c"]] for p in placement["path"]) == placement["word"]
+    placed = [p["word"] for p in board["placements"]]
+    assert sorted(placed + board["unplaced"]) == sorted(words)
+
+
+def test_retroceso_nunca_coloca_menos_que_la_pasada_voraz(cli):
+    """Con la misma semilla, retroceder nunca deja mas palabras afuera que no retroceder"""
+    rng = random.Random(7)
+    for seed in range(60):
+        size = rng.choice([6, 7, 8])
+        # Palabras largas de pocas letras distintas en tableros chicos: no siempre entran todas
+        words = ["".join(rng.choice("AEIOURSTLN") for _ in range(rng.randint(4, size)))
+                 for _ in range(12)]
+        greedy = _generate(cli, words, size, seed, max_backtracks=0)
+        search = _generate(cli, words, size, seed)
+        _check_board(greedy, words)
+        _check_board(search, words)
+        assert len(search["placements"]) >= len(greedy["placements"]), (seed, words)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Pruebas del reparto de partidas del ahorcado entre workers, con servidores falsos
+"""
+
+import sys
+import os
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-ahorcado", "frontend"))
+
+from hangman_gateway import HashRing, HangmanGateway
+
+
+class FakeServer:
+    """Registra los comandos recibidos; cada partida vive en el servidor que la atiende."""
+
+    def __init__(self):
+        self.commands = []
+        self.games = set()
+        self.closed = False
+        # Cantidad de release que responden bien antes de empezar a fallar
+        self.releases_ok = None
+
+    def request(self, args):
+        if args[0] == "release" and self.releases_ok is not None:
+            if self.releases_ok == 0:
+                raise RuntimeError("Hangman error: release")
+            self.releases_ok -= 1
+        self.commands.append(list(args))
+        if args[0] == "start":
+            self.games.add(args[1])
+        elif args[0] == "release":
+            self.games.discard(args[1])
+        return {"v": 2, "status": "playing"}
+
+    def close(self):
+        self.closed = True
+
+
+def _gateway(workers):
+    servers = []
+
+    def factory():
+        servers.append(FakeServer())
+        return servers[-1]
+
+    return HangmanGateway(workers=workers, server_factory=factory), servers
+
+
+def test_anillo_estable_y_repartido():
+    """Cada clave tiene un solo dueno y agregar un nodo solo mueve parte de las claves"""
+    ring = HashRing(["w1", "w2", "w3"])
+    keys = [f"g{i}" for i in range(600)]
+    before = {k: ring.owner(k) for k in keys}
+    assert before == {k: HashRing(["w3", "w1", "w2"]).owner(k) for k in keys}
+    assert set(before.values()) == {"w1", "w2", "w3"}
+
+    ring.add("w4")
+    after = {k: ring.owner(k) for k in keys}
+    moved = [k for k in keys if before[k] != after[k]]
+    assert all(after[k] == "w4" for k in moved)
+    assert 0 < len(moved) < len(keys) / 2
+
+    ring.remove("w4")
+    assert {k: ring.owner(k) for k in keys} == before
+    assert len(ring) == 3
+
+
+def test_cada_partida_va_siempre_al_mismo_worker():
+    gateway, servers = _gateway(3)
+    for i in range(30):
+        gateway.request(["start", f"g{i}"])
+        gateway.request(["guess", f"g{i}", "A"])
+    for server in servers:
+        ids = {args[1] for args in server.commands}
+        assert ids == server.games
+    assert sum(len(s.games) for s in servers) == 30
+    assert sum(w["requests"] for w in gateway.stats()) == 60
+    gateway.close()
+    assert all(s.closed for s in servers)
+
+
+def test_agregar_y_quitar_workers_mueve_partidas():
+    """Las partidas que cambian de dueno se liberan en el worker anterior"""
+    gateway, servers = _gateway(2)
+    games = [f"g{i}" for i in range(40)]
+    for game in games:
+        gateway.request(["start", game])
+
+    name = gateway.add_worker()
+    released = [args[1] for s in servers[:2] for args in s.commands if args[0] == "release"]
+    assert released and all(gateway._ring.owner(g) == name for g in released)
+    assert {w["worker"]: w["sessions"] for w in gateway.stats()}[name] == len(released)
+
+    # Los comandos siguientes de esas partidas llegan al worker nuevo
+    for game in released:
+        gateway.request(["guess", game, "E"])
+    assert {args[1] for args in servers[2].commands} == set(released)
+
+    moved = gateway.remove_worker(name)
+    assert moved == len(released)
+    assert servers[2].closed
+    assert sum(w["sessions"] for w in gateway.stats()) == len(games)
+    gateway.close()
+
+
+def _owners(gateway):
+    return {game: w.name for w in gateway._workers.values() for game in w.sessions}
+
+
+def test_release_fallido_deja_el_anillo_como_estaba():
+    """Si una partida no se puede liberar, ninguna cambia de dueno"""
+    gateway, servers = _gateway(2)
+    games = [f"g{i}" for i in range(40)]
+    for game in games:
+        gateway.request(["start", game])
+    before = _owners(gateway)
+    for server in servers:
+        server.releases_ok = 2
+
+    try:
+        gateway.add_worker()
+        assert False, "deberia fallar"
+    except RuntimeError:
+        pass
+    assert gateway.workers == ["w1", "w2"] and servers[2].closed
+    assert _owners(gateway) == before
+    assert all(gateway._ring.owner(g) == before[g] for g in games)
+
+    # Quitar un worker tampoco mueve nada si falla a mitad de camino
+    servers[0].releases_ok = 1
+    try:
+        gateway.remove_worker("w1")
+        assert False, "deberia fallar"
+    except RuntimeError:
+        pass
+    assert sorted(gateway.workers) == ["w1", "w2"] and not servers[0].closed
+    assert _owners(gateway) == before
+    assert all(gateway._ring.owner(g) == before[g] for g in games)
+    gateway.close()
+
+
+def test_no_se_quita_el_ultimo_worker():
+    gateway, _ = _gateway(1)
+    try:
+        gateway.remove_worker(gateway.workers[0])
+        assert False, "deberia fallar"
+    except ValueError:
+        pass
+    gateway.close()
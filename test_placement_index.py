@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas del indice de colocaciones de la sopa de letras
+"""
+
+import sys
+import os
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from services.placement_index import PlacementIndex
+
+
+def _path(*cells):
+    return [{"r": r, "c": c} for r, c in cells]
+
+
+def test_seleccion_en_ambos_sentidos():
+    """Una colocacion se reconoce seleccionada desde cualquiera de sus extremos"""
+    gato = _path((0, 0), (0, 1), (0, 2), (0, 3))
+    index = PlacementIndex([{"word": "GATO", "path": gato}])
+    assert len(index) == 1
+    assert index.lookup({"r": 0, "c": 0}, {"r": 0, "c": 3}) == [("GATO", gato)]
+    assert index.lookup({"r": 0, "c": 3}, {"r": 0, "c": 0}) == [("GATO", gato)]
+
+
+def test_seleccion_desconocida():
+    """Extremos que no coinciden con ninguna colocacion devuelven una lista vacia"""
+    index = PlacementIndex()
+    index.add("SOL", _path((2, 2), (3, 3), (4, 4)))
+    assert index.lookup({"r": 2, "c": 2}, {"r": 3, "c": 3}) == []
+    assert index.lookup({"r": 0, "c": 0}, {"r": 4, "c": 4}) == []
+    assert index.lookup({"r": 4, "c": 4}, {"r": 2, "c": 2})[0][0] == "SOL"
+
+
+def test_camino_de_una_celda_y_palabra_repetida():
+    """Una celda sola cuenta una vez y una palabra colocada dos veces queda dos veces"""
+    index = PlacementIndex([
+        {"word": "A", "path": _path((1, 1))},
+        {"word": "SOL", "path": _path((0, 0), (0, 1), (0, 2))},
+        {"word": "SOL", "path": _path((3, 0), (3, 1), (3, 2))},
+    ])
+    assert len(index) == 3
+    assert index.lookup({"r": 1, "c": 1}, {"r": 1, "c": 1}) == [("A", _path((1, 1)))]
+    assert index.lookup({"r": 0, "c": 2}, {"r": 0, "c": 0})[0][0] == "SOL"
+    assert index.lookup({"r": 3, "c": 0}, {"r": 3, "c": 2})[0][0] == "SOL"
+
+
+def test_colocaciones_con_los_mismos_extremos():
+    """ROMA y AMOR sobre las mismas celdas: primero la que se lee en el sentido de la seleccion"""
+    roma = _path((0, 0), (0, 1), (0, 2), (0, 3))
+    index = PlacementIndex([{"word": "ROMA", "path": roma},
+                            {"word": "AMOR", "path": roma[::-1]}])
+    assert len(index) == 2
+    assert [w for w, _ in index.lookup({"r": 0, "c": 0}, {"r": 0, "c": 3})] == ["ROMA", "AMOR"]
+    assert [w for w, _ in index.lookup({"r": 0, "c": 3}, {"r": 0, "c": 0})] == ["AMOR", "ROMA"]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Forma de las respuestas de Sopa.Cli: los campos option vacios se escriben como null
+
+Se saltan si el backend no se puede compilar en esta maquina.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from compartido import launcher
+from services import wire
+from services.backend import CliServer
+
+GRID = ["GATOX", "XXXXX", "XXXXX"]
+
+
+@pytest.fixture(scope="module")
+def cli():
+    try:
+        launcher.command(launcher.SOPA, "serve")
+    except RuntimeError as e:
+        pytest.skip(f"backend F# no disponible: {e}")
+    server = CliServer(lambda op: launcher.command(launcher.SOPA, op))
+    yield server
+    server.close()
+
+
+def _raw(cli, op, payload, encoding):
+    """Resultado tal como viene en la linea, sin decodificar."""
+    def build(enc):
+        grid = wire.encode_grid(GRID) if enc == wire.COMPACT_V1 else GRID
+        return dict(payload, grid=grid) if "grid" in payload else payload
+    _, raw, _ = cli.call_raw(op, build, encoding=encoding)
+    return json.loads(raw)["result"]
+
+
+@pytest.mark.parametrize("encoding", [wire.JSON, wire.COMPACT_V1])
+def test_validate_sin_palabra_escribe_null(cli, encoding):
+    payload = {"grid": None, "wordsRemaining": ["GATO"],
+               "selection": {"start": {"r": 1, "c": 0}, "end": {"r": 1, "c": 3}}}
+    assert _raw(cli, "validate", payload, encoding) == {"found": False, "word": None, "path": None}
+
+
+@pytest.mark.parametrize("encoding", [wire.JSON, wire.COMPACT_V1])
+def test_validate_con_palabra(cli, encoding):
+    payload = {"grid": None, "wordsRemaining": ["GATO"],
+               "selection": {"start": {"r": 0, "c": 0}, "end": {"r": 0, "c": 3}}}
+    result = _raw(cli, "validate", payload, encoding)
+    assert set(result) == {"found", "word", "path"}
+    assert result["found"] and result["word"] == "GATO"
+
+
+@pytest.mark.parametrize("encoding", [wire.JSON, wire.COMPACT_V1])
+def test_solve_batch_escribe_error_null(cli, encoding):
+    # Las peticiones pueden omitir los campos option (firstOnly, workers)
+    board = {"grid": wire.encode_grid(GRID) if encoding == wire.COMPACT_V1 else GRID,
+             "wordsRemaining": ["GATO"]}
+    result = _raw(cli, "solve-batch", {"boards": [board]}, encoding)
+    item = result["results"][0]
+    assert set(item) == {"solutions", "error", "elapsedMs"}
+    assert item["error"] is None and item["solutions"][0]["word"] == "GATO"
+
+
+@pytest.mark.parametrize("encoding", [wire.JSON, wire.COMPACT_V1])
+def test_generate_solo_compacta_el_tablero(cli, encoding):
+    # unplaced es una lista de strings como las filas del tablero: nunca se compacta
+    result = _raw(cli, "generate", {"words": ["GATO", "PERRO"], "size": 4, "seed": 1}, encoding)
+    assert result["unplaced"] == ["PERRO"]
+    if encoding == wire.COMPACT_V1:
+        assert set(result["grid"]) == {"letters", "width"} and result["grid"]["width"] == 4
+    else:
+        assert isinstance(result["grid"], list) and len(result["grid"]) == 4
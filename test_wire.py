@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Pruebas de las codificaciones de mensajes entre la sopa de letras y Sopa.Cli
+"""
+
+import sys
+import os
+
+project_root = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(project_root, "juego-sopa-letras", "frontend"))
+
+from services import wire
+
+
+def test_json_se_devuelve_igual():
+    """Con "json" el resultado ya tiene la forma final"""
+    result = {"grid": ["AB", "CD"], "solutions": []}
+    assert wire.decode_result(result, wire.JSON) is result
+
+
+def test_compact_grid_y_caminos():
+    """"compact/1" se lleva a las formas de "json": filas y caminos de {"r", "c"}"""
+    grid = ["GATO", "XXXX", "XXXX"]
+    result = {
+        "grid": wire.encode_grid(grid),
+        # GATO hacia la derecha (direccion 4) y una diagonal hacia abajo a la izquierda (5)
+        "placements": [{"word": "GATO", "path": [0, 0, 4, 4]},
+                       {"word": "TX", "path": [0, 2, 5, 2]}],
+        "unplaced": [],
+    }
+    decoded = wire.decode_result(result, wire.COMPACT_V1)
+    assert decoded["grid"] == grid
+    assert decoded["placements"][0]["path"] == [{"r": 0, "c": c} for c in range(4)]
+    assert decoded["placements"][1]["path"] == [{"r": 0, "c": 2}, {"r": 1, "c": 1}]
+    assert decoded["unplaced"] == []
+
+
+def test_compact_validate_y_listas():
+    """Un camino nulo se conserva y las listas se decodifican elemento por elemento"""
+    assert wire.decode_result({"found": False, "word": None, "path": None}, wire.COMPACT_V1) == \
+        {"found": False, "word": None, "path": None}
+    decoded = wire.decode_result([{"grid": {"letters": "", "width": 0}}, {"error": "x"}], wire.COMPACT_V1)
+    assert decoded == [{"grid": []}, {"error": "x"}]